@@ -2,15 +2,32 @@
 
 ##############################################################################
 # Python imports.
+import sys
 from argparse import ArgumentParser, Namespace
 from inspect import cleandoc
+from json import dumps
 from operator import attrgetter
+from os import O_WRONLY, devnull, dup2
+from os import open as os_open
 from pathlib import Path
 
+##############################################################################
+# NGDB imports.
+from ngdb import PlainText
+
 ##############################################################################
 # Local imports.
 from . import __doc__, __version__
-from .aging import AgiNG
+from .data import is_guide, load_guides
+from .search import (
+    FuzzyNeedle,
+    InvalidNeedle,
+    Matcher,
+    MultiNeedle,
+    Needle,
+    Query,
+    stream_search,
+)
 
 
 ##############################################################################
@@ -72,6 +89,191 @@ def get_args() -> Namespace:
     return parser.parse_args()
 
 
+##############################################################################
+def get_search_args(arguments: list[str]) -> Namespace:
+    """Get the command line arguments for a search.
+
+    Args:
+        arguments: The arguments that follow the `search` command.
+
+    Returns:
+        The arguments.
+    """
+
+    # Build the parser.
+    parser = ArgumentParser(
+        prog="aging search",
+        description="Search Norton Guides without starting the application.",
+        epilog=f"v{__version__}",
+    )
+
+    # Add --ignore-case
+    parser.add_argument(
+        "-i",
+        "--ignore-case",
+        help="Ignore case when searching",
+        action="store_true",
+    )
+
+    # Add --regex
+    parser.add_argument(
+        "-r",
+        "--regex",
+        help="Treat the needle as a regular expression",
+        action="store_true",
+    )
+
+    # The kinds of search that can't be combined.
+    kind = parser.add_mutually_exclusive_group()
+
+    # Add --boolean
+    kind.add_argument(
+        "-b",
+        "--boolean",
+        help="Treat the needle as a boolean query",
+        action="store_true",
+    )
+
+    # Add --list
+    kind.add_argument(
+        "-l",
+        "--list",
+        help="Treat the needle as a comma-separated list of needles",
+        action="store_true",
+    )
+
+    # Add --fuzzy
+    kind.add_argument(
+        "-f",
+        "--fuzzy",
+        help="Find words that are close to the words of the needle",
+        action="store_true",
+    )
+
+    # Add --json
+    parser.add_argument(
+        "--json",
+        help="Show each hit as a line of JSON",
+        action="store_true",
+    )
+
+    # Add --recursive
+    parser.add_argument(
+        "-R",
+        "--recursive",
+        help="Search the guides within any directories within the directories given",
+        action="store_true",
+    )
+
+    # Add --jobs
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes to search with (0 for one per CPU)",
+        type=int,
+        default=1,
+    )
+
+    # The needle to search for.
+    parser.add_argument("needle", help="What to search for")
+
+    # The guides to search.
+    parser.add_argument(
+        "guides",
+        nargs="*",
+        type=Path,
+        help="The guides, or directories of guides, to search (defaults to the guide directory)",
+    )
+
+    # Finally, parse the command line.
+    if (args := parser.parse_args(arguments)).jobs < 0:
+        parser.error("the number of jobs can't be negative")
+    try:
+        kind_of_needle: type[Matcher] = (
+            MultiNeedle
+            if args.list
+            else Query
+            if args.boolean
+            else FuzzyNeedle
+            if args.fuzzy
+            else Needle
+        )
+        args.needle = kind_of_needle(args.needle, args.ignore_case, args.regex)
+    except InvalidNeedle as error:
+        parser.error(str(error))
+    return args
+
+
+##############################################################################
+def guides_to_search(paths: list[Path], recursive: bool = False) -> list[Path]:
+    """Get the guides to search.
+
+    Args:
+        paths: The paths given on the command line.
+        recursive: Should directories within directories be looked in?
+
+    Returns:
+        The locations of the guides to search.
+
+    Note:
+        Any path that isn't a directory is searched as a guide, so that a
+        guide that can't be read is reported. Only those files within a
+        directory that really are guides are searched.
+    """
+    if not paths:
+        return [guide.location for guide in sorted(load_guides())]
+    return [
+        guide
+        for path in paths
+        for guide in (
+            sorted(
+                candidate
+                for candidate in (path.rglob("*") if recursive else path.iterdir())
+                if candidate.is_file() and is_guide(candidate)
+            )
+            if path.is_dir()
+            else [path]
+        )
+    ]
+
+
+##############################################################################
+def search(args: Namespace) -> int:
+    """Search the guides, showing the hits as they are found.
+
+    Args:
+        args: The arguments for the search.
+
+    Returns:
+        The exit code; `0` if there were hits, `1` if not.
+    """
+    hits = 0
+    for found in stream_search(
+        guides_to_search(args.guides, args.recursive),
+        args.needle,
+        args.jobs or None,
+        lambda guide, error: print(f"aging: {guide}: {error}", file=sys.stderr),
+    ):
+        for hit in found:
+            text = str(PlainText(hit.line_source))
+            print(
+                dumps(
+                    {
+                        "guide": str(hit.guide),
+                        "entry": hit.entry_offset,
+                        "line": hit.entry_line,
+                        "text": text,
+                        "found": hit.needle,
+                    }
+                )
+                if args.json
+                else f"{hit.guide}:{hit.entry_offset}:{hit.entry_line}:{text}"
+            )
+        hits += len(found)
+        sys.stdout.flush()
+    return 0 if hits else 1
+
+
 ##############################################################################
 def show_bindable_commands() -> None:
     """Show the commands that can have bindings applied."""
@@ -94,6 +296,8 @@ def show_bindable_commands() -> None:
 ##############################################################################
 def show_themes() -> None:
     """Show the available themes."""
+    from .aging import AgiNG
+
     for theme in sorted(AgiNG(Namespace(theme=None)).available_themes):
         if theme != "textual-ansi":
             print(theme)
@@ -102,6 +306,17 @@ def show_themes() -> None:
 ##############################################################################
 def main() -> None:
     """Main entry function."""
+    if sys.argv[1:2] == ["search"]:
+        try:
+            sys.exit(search(get_search_args(sys.argv[2:])))
+        except BrokenPipeError:
+            # Whatever we were writing to has gone away (most likely we're
+            # being piped into something like `head`), so quietly stop.
+            dup2(os_open(devnull, O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+
+    from .aging import AgiNG
+
     if (args := get_args()).license:
         print(cleandoc(AgiNG.HELP_LICENSE))
     elif args.bindings:
@@ -8,22 +8,40 @@ from .config import (
     save_configuration,
     update_configuration,
 )
+from .discovery import DiscoveryProgress, discover_guides
+from .fingerprints import Fingerprint, Fingerprints
 from .guides import Guide, Guides, load_guides, save_guides
+from .header import GuideHeader, is_guide, probe_guide
+from .last_search import LastSearch, load_last_search, save_last_search
+from .scan_cache import ScanCache
 from .search_hits import SearchHit, SearchHits
+from .watcher import watch_guides
 
 ##############################################################################
 # Exports.
 __all__ = [
     "Configuration",
+    "DiscoveryProgress",
+    "Fingerprint",
+    "Fingerprints",
     "Guide",
+    "GuideHeader",
     "Guides",
+    "LastSearch",
+    "ScanCache",
     "SearchHit",
     "SearchHits",
+    "discover_guides",
+    "is_guide",
     "load_configuration",
     "load_guides",
+    "load_last_search",
+    "probe_guide",
     "save_configuration",
     "save_guides",
+    "save_last_search",
     "update_configuration",
+    "watch_guides",
 ]
 
 ### __init__.py ends here
@@ -46,12 +46,84 @@ class Configuration:
     global_search_text: str = ""
     """The text that was last searched for in global search."""
 
+    global_search_limit: int = 0
+    """The most hits to find in global search; `0` for no limit."""
+
     global_search_all_guides: bool = True
     """The last state of the all guides checkbox in global search."""
 
     global_search_ignore_case: bool = True
     """The last state of the ignore case setting."""
 
+    global_search_regex: bool = False
+    """The last state of the regular expression setting."""
+
+    global_search_boolean: bool = False
+    """The last state of the boolean query setting."""
+
+    global_search_list: bool = False
+    """The last state of the list of needles setting."""
+
+    global_search_list_from: str = "."
+    """The location the user last loaded a list of needles from."""
+
+    global_search_fuzzy: bool = False
+    """The last state of the fuzzy search setting."""
+
+    global_search_live: bool = False
+    """The last state of the live search setting."""
+
+    global_search_ranked: bool = False
+    """Should the results of global search be ranked by relevance?"""
+
+    global_search_jobs: int = 1
+    """The number of processes to use when scanning guides in global search.
+
+    If `1` the guides are scanned within the application itself. If `0`
+    one process per CPU is used.
+    """
+
+    global_search_read_ahead: int = 8
+    """The number of chunks of guides to read ahead of scanning them.
+
+    When scanning guides within the application, the guides are read by
+    threads of their own; this is the most chunks each of those threads
+    will read ahead of the scan. If `0` the guides are read as they are
+    scanned.
+    """
+
+    global_search_cache_size: int = 32
+    """The number of global searches to keep the results of.
+
+    If `0` the results of global searches aren't cached.
+    """
+
+    global_search_cache_on_disk: bool = False
+    """Should the cached results of global searches be kept on disk?"""
+
+    global_search_spill_threshold: int = 100_000
+    """The number of hits beyond which kept search results are spilled to disk.
+
+    If `0` the results of global searches are always kept in memory.
+    """
+
+    watched_directories: list[str] = field(default_factory=list)
+    """The directories to keep watch on for guides coming and going.
+
+    Guides that appear within any of these directories are added to the
+    guide directory, and guides that go away are removed from it, while
+    the application is running.
+    """
+
+    watch_interval: int = 60
+    """The time, in seconds, between checks of the watched directories.
+
+    Where the operating system can report changes as they happen, guides
+    are normally noticed sooner than this; the checks still catch changes
+    that aren't reported, such as those made on a network share by
+    another machine.
+    """
+
     bindings: dict[str, str] = field(default_factory=dict)
     """Command keyboard binding overrides."""
 
@@ -0,0 +1,287 @@
+"""Provides a method of finding the guides within a directory."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from os import scandir
+from pathlib import Path
+from time import monotonic
+from typing import Final
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide, make_dos_like
+
+##############################################################################
+# Local imports.
+from .guides import Guide, Guides
+from .header import probe_guide
+from .scan_cache import ScanCache, ScannedDirectory, ScannedFile
+
+##############################################################################
+DISCOVERY_JOBS: Final[int] = 8
+"""The number of threads that look at the candidate files."""
+
+##############################################################################
+PENDING_PER_JOB: Final[int] = 4
+"""The number of batches of candidate files to have waiting for each thread."""
+
+##############################################################################
+EXAMINE_BATCH: Final[int] = 32
+"""The most candidate files from a directory to hand to a thread at once."""
+
+##############################################################################
+BATCH_INTERVAL: Final[float] = 1.0
+"""The longest time, in seconds, to hold on to found guides before reporting them."""
+
+
+##############################################################################
+class DiscoveryProgress:
+    """The progress of looking for guides within a directory.
+
+    Note:
+        Only the discovery ever changes the progress, and anything showing
+        it only ever looks at it; so all that's needed to keep things safe
+        is that each value is set in one go.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the progress."""
+        self.directories = 0
+        """The number of directories that have been looked in."""
+        self.files = 0
+        """The number of files that might be guides that have been looked at."""
+        self.guides = 0
+        """The number of guides that have been found."""
+        self.current: Path | None = None
+        """The directory most recently looked in, if there is one."""
+
+
+##############################################################################
+def _examine(candidate: Path, known: ScannedFile | None) -> ScannedFile | None:
+    """Examine a file to see if it is a guide.
+
+    Args:
+        candidate: The file to examine.
+        known: What was found about the file last time, if anything.
+
+    Returns:
+        What was found about the file, or [`None`][None] if it couldn't be
+        looked at.
+
+    Note:
+        If the file hasn't changed since last time, what was found then is
+        used; otherwise only the header of the file is read.
+    """
+    try:
+        status = candidate.stat()
+    except OSError:
+        return None
+    if known is not None and known.matches(status):
+        return known
+    return ScannedFile(
+        status.st_size,
+        status.st_mtime_ns,
+        None if (header := probe_guide(candidate)) is None else header.title,
+    )
+
+
+##############################################################################
+def _examine_all(
+    directory: Path, names: list[str], known: ScannedDirectory | None
+) -> list[tuple[str, ScannedFile | None]]:
+    """Examine some files in a directory to see if they are guides.
+
+    Args:
+        directory: The directory that holds the files.
+        names: The names of the files to examine.
+        known: What was found in the directory last time, if anything.
+
+    Returns:
+        The name of each file and what was found about it.
+    """
+    return [
+        (
+            name,
+            _examine(
+                directory / name, None if known is None else known.files.get(name)
+            ),
+        )
+        for name in names
+    ]
+
+
+##############################################################################
+def _look_in(directory: Path) -> tuple[tuple[str, ...], list[str]]:
+    """Look in a directory for directories and files that might be guides.
+
+    Args:
+        directory: The directory to look in.
+
+    Returns:
+        The names of the directories within the directory, and the names of
+        the files that might be guides.
+
+    Raises:
+        OSError: If the directory couldn't be looked in.
+
+    Note:
+        Directories that are symbolic links aren't included.
+    """
+    directories: list[str] = []
+    candidates: list[str] = []
+    with scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.name)
+                elif NortonGuide.maybe(entry.name) and entry.is_file():
+                    candidates.append(entry.name)
+            except OSError:
+                pass
+    return tuple(directories), candidates
+
+
+##############################################################################
+def discover_guides(
+    directory: Path,
+    found: Callable[[Guides], object],
+    progress: DiscoveryProgress | None = None,
+    cancelled: Callable[[], bool] = lambda: False,
+    jobs: int = DISCOVERY_JOBS,
+    cache: ScanCache | None = None,
+) -> bool:
+    """Find the guides within a directory and its subdirectories.
+
+    Args:
+        directory: The directory to look in.
+        found: The function to call with each batch of guides found.
+        progress: Optional progress to keep up to date.
+        cancelled: A function that reports if the discovery was cancelled.
+        jobs: The number of threads to look at the candidate files with.
+        cache: Optional cache of what was found last time.
+
+    Returns:
+        [`True`][True] if the whole of the directory was looked in,
+        [`False`][False] if the discovery was cancelled.
+
+    Note:
+        While the directory is walked, each file that might be a guide is
+        handed to a pool of threads to have its header checked. Guides are
+        reported in batches, as they're found, rather than all at the end;
+        any guides that were found before the discovery was cancelled are
+        still reported.
+
+        If there is a cache, any directory that hasn't changed since it was
+        last looked in isn't listed again, and any file that hasn't changed
+        isn't read again; the cache is updated with what is found, but is
+        left to the caller to save.
+    """
+    progress = progress or DiscoveryProgress()
+    batch: Guides = []
+    last_report = monotonic()
+    looks: dict[Future[list[tuple[str, ScannedFile | None]]], Path] = {}
+    scanning: dict[Path, tuple[ScannedDirectory, int]] = {}
+    visited: set[Path] = set()
+
+    def scanned(location: Path, remaining: int) -> None:
+        """Record how many files in a directory remain to be looked at.
+
+        Args:
+            location: The location of the directory.
+            remaining: The number of batches of files still to be looked at.
+
+        Note:
+            Once every file in a directory has been looked at, what was
+            found in it is added to the cache.
+        """
+        if remaining:
+            scanning[location] = (scanning[location][0], remaining)
+        elif cache is not None:
+            cache.put(location, scanning.pop(location)[0])
+        else:
+            del scanning[location]
+
+    def collect(done: set[Future[list[tuple[str, ScannedFile | None]]]]) -> None:
+        """Collect the results of looking at some candidate files.
+
+        Args:
+            done: The looks that have finished.
+        """
+        nonlocal batch, last_report
+        for look in done:
+            location = looks.pop(look)
+            directory_found, remaining = scanning[location]
+            for name, file in look.result():
+                progress.files += 1
+                if file is not None:
+                    directory_found.files[name] = file
+                    if file.title is not None:
+                        progress.guides += 1
+                        batch.append(Guide(make_dos_like(file.title), location / name))
+            scanned(location, remaining - 1)
+        if batch and monotonic() - last_report >= BATCH_INTERVAL:
+            found(sorted(batch, key=lambda guide: guide.location))
+            batch = []
+            last_report = monotonic()
+
+    with ThreadPoolExecutor(jobs, thread_name_prefix="GuideDiscovery") as pool:
+        directories = [directory]
+        while directories and not cancelled():
+            progress.current = looking_in = directories.pop()
+            try:
+                status = looking_in.stat()
+                if (
+                    known := None if cache is None else cache.get(looking_in, status)
+                ) is not None:
+                    subdirectories, candidates = known.directories, list(known.files)
+                else:
+                    subdirectories, candidates = _look_in(looking_in)
+                    known = None if cache is None else cache.known(looking_in)
+            except OSError:
+                progress.directories += 1
+                continue
+            visited.add(looking_in)
+            directories.extend(looking_in / name for name in subdirectories)
+            batches = [
+                candidates[start : start + EXAMINE_BATCH]
+                for start in range(0, len(candidates), EXAMINE_BATCH)
+            ]
+            scanning[looking_in] = (
+                ScannedDirectory(status.st_mtime_ns, subdirectories),
+                len(batches),
+            )
+            if not batches:
+                scanned(looking_in, 0)
+            for names in batches:
+                looks[pool.submit(_examine_all, looking_in, names, known)] = looking_in
+                # Only wait for a look to finish if there's plenty waiting
+                # already; otherwise just take whatever has finished.
+                done, _ = wait(
+                    looks,
+                    None if len(looks) >= jobs * PENDING_PER_JOB else 0,
+                    FIRST_COMPLETED,
+                )
+                collect(done)
+            progress.directories += 1
+        while looks and not cancelled():
+            done, _ = wait(looks, timeout=0.1, return_when=FIRST_COMPLETED)
+            collect(done)
+        for look in looks:
+            look.cancel()
+    progress.current = None
+    if batch:
+        found(sorted(batch, key=lambda guide: guide.location))
+    if cancelled():
+        return False
+    if cache is not None:
+        cache.prune(directory, visited)
+    return True
+
+
+### discovery.py ends here
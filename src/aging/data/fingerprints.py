@@ -0,0 +1,228 @@
+"""Provides a method of spotting when a guide has changed."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from dataclasses import dataclass
+from hashlib import blake2b
+from json import dumps, loads
+from os import stat_result
+from pathlib import Path
+from threading import Lock
+from typing import Any, Final
+
+##############################################################################
+# Local imports.
+from .guides import Guides
+from .header import HEADER_SIZE
+from .locations import data_dir
+from .storage import write_text_safely
+
+
+##############################################################################
+@dataclass(frozen=True)
+class Fingerprint:
+    """The fingerprint of a Norton Guide."""
+
+    location: Path
+    """The location of the guide."""
+
+    size: int
+    """The size of the guide in bytes."""
+
+    modified: int
+    """The modification time of the guide, in nanoseconds."""
+
+    header_hash: str
+    """A hash of the header of the guide."""
+
+    @classmethod
+    def of(cls, location: Path, status: stat_result | None = None) -> Fingerprint:
+        """Take the fingerprint of a guide.
+
+        Args:
+            location: The location of the guide.
+            status: Optional already-acquired status of the guide's file.
+
+        Returns:
+            The fingerprint of the guide.
+
+        Raises:
+            OSError: If the guide could not be read.
+        """
+        status = status or location.stat()
+        with location.open("rb") as guide:
+            header = guide.read(HEADER_SIZE)
+        return cls(
+            location.absolute(),
+            status.st_size,
+            status.st_mtime_ns,
+            blake2b(header, digest_size=16).hexdigest(),
+        )
+
+    def matches(self, status: stat_result) -> bool:
+        """Does the fingerprint still match the given file status?
+
+        Args:
+            status: The status of the guide's file.
+
+        Returns:
+            [`True`][True] if the guide looks unchanged, [`False`][False]
+            if not.
+        """
+        return self.size == status.st_size and self.modified == status.st_mtime_ns
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Fingerprint:
+        """Load a fingerprint from some JSON data.
+
+        Args:
+            data: The data to load from.
+
+        Returns:
+            A fresh instance of a fingerprint.
+        """
+        return cls(
+            Path(data.get("location", "")),
+            data.get("size", -1),
+            data.get("modified", -1),
+            data.get("header_hash", ""),
+        )
+
+    @property
+    def as_json(self) -> dict[str, Any]:
+        """The fingerprint in a JSON-friendly format."""
+        return {
+            "location": str(self.location),
+            "size": self.size,
+            "modified": self.modified,
+            "header_hash": self.header_hash,
+        }
+
+
+##############################################################################
+def fingerprints_file() -> Path:
+    """The path to the fingerprints file.
+
+    Returns:
+        The path where the fingerprints of the guides are held.
+    """
+    return data_dir() / "fingerprints.json"
+
+
+##############################################################################
+_SAVING: Final = Lock()
+"""Ensures only one set of fingerprints is saved at a time."""
+
+
+##############################################################################
+def _load_fingerprints() -> dict[Path, Fingerprint]:
+    """Load the fingerprints from storage.
+
+    Returns:
+        The fingerprints, keyed by guide location; if they couldn't be
+        loaded there are none.
+    """
+    try:
+        if fingerprints_file().exists():
+            return {
+                (fingerprint := Fingerprint.from_json(data)).location: fingerprint
+                for data in loads(fingerprints_file().read_text(encoding="utf-8"))
+            }
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+##############################################################################
+class Fingerprints:
+    """Holds the last-known fingerprints of the guides.
+
+    Note:
+        The fingerprints are kept so that checking if a guide has changed
+        only costs a `stat` of its file; the header of a guide is only read
+        again when its size or modification time has changed.
+
+        More than one part of the application may be working with the
+        fingerprints at once, so only the changes made here are saved;
+        they're merged with whatever has been saved since the fingerprints
+        were loaded.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the fingerprints, loading them from storage."""
+        self._fingerprints = _load_fingerprints()
+        """The known fingerprints, keyed by guide location."""
+        self._updated: set[Path] = set()
+        """The locations of the guides whose fingerprints have been updated."""
+        self._forgotten: set[Path] = set()
+        """The locations of the guides whose fingerprints have been forgotten."""
+
+    def current(self, location: Path) -> Fingerprint | None:
+        """Get the current fingerprint for a guide.
+
+        Args:
+            location: The location of the guide.
+
+        Returns:
+            The fingerprint for the guide, or [`None`][None] if the guide
+            couldn't be read.
+        """
+        try:
+            status = location.stat()
+            if (
+                known := self._fingerprints.get(location := location.absolute())
+            ) is not None and known.matches(status):
+                return known
+            self._fingerprints[location] = Fingerprint.of(location, status)
+        except OSError:
+            return None
+        self._updated.add(location)
+        self._forgotten.discard(location)
+        return self._fingerprints[location]
+
+    def prune(self, guides: Guides) -> None:
+        """Forget the fingerprints of any guides not in the given guides.
+
+        Args:
+            guides: The guides whose fingerprints should be kept.
+        """
+        keep = {guide.location.absolute() for guide in guides}
+        for location in [
+            location for location in self._fingerprints if location not in keep
+        ]:
+            del self._fingerprints[location]
+            self._forgotten.add(location)
+            self._updated.discard(location)
+
+    def save(self) -> None:
+        """Save the fingerprints to storage, if they've changed.
+
+        Raises:
+            OSError: If the fingerprints couldn't be saved.
+        """
+        if not (self._updated or self._forgotten):
+            return
+        with _SAVING:
+            fingerprints = _load_fingerprints()
+            fingerprints.update(
+                (location, self._fingerprints[location]) for location in self._updated
+            )
+            for location in self._forgotten:
+                fingerprints.pop(location, None)
+            write_text_safely(
+                fingerprints_file(),
+                dumps(
+                    [fingerprint.as_json for fingerprint in fingerprints.values()],
+                    indent=4,
+                ),
+            )
+        self._fingerprints = fingerprints
+        self._updated.clear()
+        self._forgotten.clear()
+
+
+### fingerprints.py ends here
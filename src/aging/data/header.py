@@ -0,0 +1,117 @@
+"""Provides a method of looking at the header of a guide without opening it."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from pathlib import Path
+from struct import Struct
+from typing import Final, NamedTuple
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide
+
+##############################################################################
+HEADER: Final = Struct("<2s4xH40s" + "66s" * 5)
+"""The layout of the fixed header block at the start of a Norton Guide.
+
+This is the magic bytes, four unknown bytes, the number of menus, the
+title, and the five lines of the credits.
+"""
+
+##############################################################################
+HEADER_SIZE: Final[int] = HEADER.size
+"""The size of the fixed header block at the start of a Norton Guide."""
+
+
+##############################################################################
+def _text(data: bytes) -> str:
+    """Get the text from a fixed-length string in the header.
+
+    Args:
+        data: The bytes of the string.
+
+    Returns:
+        The text, up to but not including the first nul.
+    """
+    return data.split(b"\0", 1)[0].decode("latin-1")
+
+
+##############################################################################
+class GuideHeader(NamedTuple):
+    """The details held in the header of a guide."""
+
+    magic: str
+    """The magic value of the guide."""
+    menu_count: int
+    """The number of menus in the guide."""
+    title: str
+    """The title of the guide."""
+    credits: tuple[str, ...]
+    """The lines of the credits of the guide."""
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> GuideHeader | None:
+        """Get the details of a guide from its header.
+
+        Args:
+            data: The data from the start of the guide.
+
+        Returns:
+            The details of the guide, or [`None`][None] if the data isn't
+            the header of a guide.
+        """
+        if len(data) < HEADER_SIZE:
+            return None
+        magic, menu_count, title, *credits = HEADER.unpack_from(data)
+        if (magic := _text(magic)) not in NortonGuide.MAGIC:
+            return None
+        return cls(magic, menu_count, _text(title), tuple(map(_text, credits)))
+
+
+##############################################################################
+def probe_guide(candidate: Path) -> GuideHeader | None:
+    """Probe a file to see if it's a guide.
+
+    Args:
+        candidate: The file to probe.
+
+    Returns:
+        The details from the header of the guide, or [`None`][None] if the
+        file isn't a guide or can't be read.
+
+    Note:
+        Only the header of the file is read; this is all that's needed to
+        know if the file is a guide, and to know its title, and is much
+        cheaper than opening the guide with
+        [`NortonGuide`][ngdb.NortonGuide], which reads all of its menus
+        too.
+    """
+    try:
+        with candidate.open("rb") as guide:
+            return GuideHeader.from_bytes(guide.read(HEADER_SIZE))
+    except OSError:
+        return None
+
+
+##############################################################################
+def is_guide(candidate: Path) -> bool:
+    """Is the given file a guide?
+
+    Args:
+        candidate: The file to check.
+
+    Returns:
+        [`True`][True] if the file is a guide, [`False`][False] if not.
+
+    Note:
+        The name of the file is checked first, so only those files that
+        could be guides are read.
+    """
+    return NortonGuide.maybe(candidate) and probe_guide(candidate) is not None
+
+
+### header.py ends here
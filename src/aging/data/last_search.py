@@ -0,0 +1,158 @@
+"""Provides a method of keeping the results of the last search between sessions."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from json import dumps, loads
+from pathlib import Path
+from struct import Struct
+from struct import error as StructError
+from typing import Final, NamedTuple
+
+##############################################################################
+# Local imports.
+from .fingerprints import Fingerprint, Fingerprints
+from .locations import data_dir
+from .search_hits import SearchHit, SearchHits
+
+##############################################################################
+MAGIC: Final[bytes] = b"AgiNGhit"
+"""The bytes that identify a file of saved search results."""
+
+##############################################################################
+VERSION: Final[int] = 1
+"""The version of the layout of the file of saved search results."""
+
+##############################################################################
+HEADER: Final = Struct("<8sII")
+"""The layout of the header of the file of saved search results.
+
+This holds the magic bytes, the version of the layout, and the length of
+the description of the results that follows the header.
+"""
+
+
+##############################################################################
+class LastSearch(NamedTuple):
+    """The results of the last search."""
+
+    hits: SearchHits
+    """The hits that were found."""
+    visited: SearchHit | None = None
+    """The hit that was last visited, if there was one."""
+    visited_at: int | None = None
+    """The position of the hit that was last visited within the hits."""
+
+
+##############################################################################
+def last_search_file() -> Path:
+    """The path to the file that holds the results of the last search.
+
+    Returns:
+        The path to the last search file.
+    """
+    return data_dir() / "last-search.bin"
+
+
+##############################################################################
+def save_last_search(search: LastSearch) -> None:
+    """Save the results of the last search.
+
+    Args:
+        search: The results of the last search.
+
+    Note:
+        The fingerprint of each guide with hits is saved with the results,
+        so that hits for guides that have changed can be dropped when the
+        results are loaded again.
+    """
+    fingerprints = Fingerprints()
+    guides = search.hits.guides
+    description = dumps(
+        {
+            "fingerprints": [
+                None if fingerprint is None else fingerprint.as_json
+                for fingerprint in (fingerprints.current(guide) for guide in guides)
+            ],
+            "guides": [str(guide) for guide in guides],
+            "visited": None
+            if search.visited is None
+            else [
+                str(search.visited.guide),
+                search.visited.entry_offset,
+                search.visited.entry_line,
+                search.visited.line_source,
+                search.visited.needle,
+            ],
+            "visited_at": search.visited_at,
+        }
+    ).encode("utf-8")
+    fingerprints.save()
+    last_search_file().write_bytes(
+        HEADER.pack(MAGIC, VERSION, len(description))
+        + description
+        + search.hits.to_bytes()
+    )
+
+
+##############################################################################
+def load_last_search() -> LastSearch:
+    """Load the results of the last search.
+
+    Returns:
+        The results of the last search.
+
+    Note:
+        Any hits for guides that have changed since the results were saved
+        are dropped. If the results can't be loaded, there are no results.
+    """
+    try:
+        data = last_search_file().read_bytes()
+        magic, version, length = HEADER.unpack_from(data)
+        if (magic, version) != (MAGIC, VERSION):
+            return LastSearch(SearchHits())
+        description = loads(data[HEADER.size : HEADER.size + length])
+        hits = SearchHits.from_bytes(data[HEADER.size + length :])
+        saved = {
+            Path(guide): None
+            if fingerprint is None
+            else Fingerprint.from_json(fingerprint)
+            for guide, fingerprint in zip(
+                description["guides"], description["fingerprints"], strict=True
+            )
+        }
+        visited = (
+            None
+            if description["visited"] is None
+            else SearchHit(Path(description["visited"][0]), *description["visited"][1:])
+        )
+        visited_at: int | None = description.get("visited_at")
+    except (OSError, ValueError, StructError, KeyError, TypeError, IndexError):
+        return LastSearch(SearchHits())
+    fingerprints = Fingerprints()
+    unchanged = {
+        guide
+        for guide, fingerprint in saved.items()
+        if fingerprint is not None and fingerprints.current(guide) == fingerprint
+    }
+    try:
+        fingerprints.save()
+    except OSError:
+        pass
+    if len(unchanged) < len(saved):
+        kept = SearchHits()
+        for position, hit in enumerate(hits):
+            if position == visited_at:
+                visited_at = len(kept)
+            if hit.guide in unchanged:
+                kept.append(hit)
+        hits = kept
+    if visited is None or visited.guide not in unchanged:
+        return LastSearch(hits)
+    return LastSearch(hits, visited, visited_at)
+
+
+### last_search.py ends here
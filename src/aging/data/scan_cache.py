@@ -0,0 +1,274 @@
+"""Provides a cache of what was found when looking for guides in directories."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from dataclasses import dataclass, field
+from json import dumps, loads
+from os import stat_result
+from pathlib import Path
+from threading import Lock
+from typing import Any, Final
+
+##############################################################################
+# Local imports.
+from .locations import data_dir
+from .storage import write_text_safely
+
+
+##############################################################################
+@dataclass(frozen=True)
+class ScannedFile:
+    """What was found about a file that might be a guide."""
+
+    size: int
+    """The size of the file in bytes."""
+
+    modified: int
+    """The modification time of the file, in nanoseconds."""
+
+    title: str | None
+    """The title of the guide, or [`None`][None] if the file isn't a guide."""
+
+    def matches(self, status: stat_result) -> bool:
+        """Does what was found still match the given file status?
+
+        Args:
+            status: The status of the file.
+
+        Returns:
+            [`True`][True] if the file looks unchanged, [`False`][False]
+            if not.
+        """
+        return self.size == status.st_size and self.modified == status.st_mtime_ns
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> ScannedFile:
+        """Load what was found about a file from some JSON data.
+
+        Args:
+            data: The data to load from.
+
+        Returns:
+            A fresh instance of what was found about the file.
+        """
+        return cls(data.get("size", -1), data.get("modified", -1), data.get("title"))
+
+    @property
+    def as_json(self) -> dict[str, Any]:
+        """What was found about the file in a JSON-friendly format."""
+        return {"size": self.size, "modified": self.modified, "title": self.title}
+
+
+##############################################################################
+@dataclass
+class ScannedDirectory:
+    """What was found when looking in a directory."""
+
+    modified: int
+    """The modification time of the directory, in nanoseconds."""
+
+    directories: tuple[str, ...] = ()
+    """The names of the directories within the directory."""
+
+    files: dict[str, ScannedFile] = field(default_factory=dict)
+    """What was found about the files that might be guides, keyed by name."""
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> ScannedDirectory:
+        """Load what was found in a directory from some JSON data.
+
+        Args:
+            data: The data to load from.
+
+        Returns:
+            A fresh instance of what was found in the directory.
+        """
+        return cls(
+            data.get("modified", -1),
+            tuple(data.get("directories", ())),
+            {
+                name: ScannedFile.from_json(file)
+                for name, file in data.get("files", {}).items()
+            },
+        )
+
+    @property
+    def as_json(self) -> dict[str, Any]:
+        """What was found in the directory in a JSON-friendly format."""
+        return {
+            "modified": self.modified,
+            "directories": list(self.directories),
+            "files": {name: file.as_json for name, file in self.files.items()},
+        }
+
+
+##############################################################################
+def scan_cache_file() -> Path:
+    """The path to the scan cache file.
+
+    Returns:
+        The path where what was found in scanned directories is held.
+    """
+    return data_dir() / "scan-cache.json"
+
+
+##############################################################################
+_SAVING: Final = Lock()
+"""Ensures only one scan cache is saved at a time."""
+
+
+##############################################################################
+def _load_directories() -> dict[Path, ScannedDirectory]:
+    """Load what was found in each directory from storage.
+
+    Returns:
+        What was found in each directory, keyed by location; if the cache
+        couldn't be loaded nothing is known.
+    """
+    try:
+        if scan_cache_file().exists():
+            return {
+                Path(location): ScannedDirectory.from_json(data)
+                for location, data in loads(
+                    scan_cache_file().read_text(encoding="utf-8")
+                ).items()
+            }
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+##############################################################################
+class ScanCache:
+    """Holds what was found the last time directories were scanned for guides.
+
+    Note:
+        A directory's modification time only changes when files are added
+        to it, removed from it, or renamed within it; so a directory whose
+        modification time hasn't changed doesn't need to be looked in again,
+        and only the files that might be guides, and the directories within
+        it, need to be checked.
+
+        More than one part of the application may be scanning at once, so
+        only the changes made here are saved; they're merged with whatever
+        has been saved since the cache was loaded.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the cache, loading it from storage."""
+        self._directories = _load_directories()
+        """What was found in each directory, keyed by location."""
+        self._updated: set[Path] = set()
+        """The locations of the directories that have been scanned again."""
+        self._forgotten: set[Path] = set()
+        """The locations of the directories that have been forgotten."""
+
+    def get(self, directory: Path, status: stat_result) -> ScannedDirectory | None:
+        """Get what was found in a directory, if it's unchanged.
+
+        Args:
+            directory: The location of the directory.
+            status: The current status of the directory.
+
+        Returns:
+            What was found in the directory, or [`None`][None] if the
+            directory hasn't been scanned or has changed since.
+        """
+        if (
+            known := self._directories.get(directory.absolute())
+        ) is not None and known.modified == status.st_mtime_ns:
+            return known
+        return None
+
+    def known(self, directory: Path) -> ScannedDirectory | None:
+        """Get what was last found in a directory, even if it's changed.
+
+        Args:
+            directory: The location of the directory.
+
+        Returns:
+            What was last found in the directory, or [`None`][None] if the
+            directory hasn't been scanned.
+        """
+        return self._directories.get(directory.absolute())
+
+    def put(self, directory: Path, scanned: ScannedDirectory) -> None:
+        """Record what was found in a directory.
+
+        Args:
+            directory: The location of the directory.
+            scanned: What was found in the directory.
+        """
+        self._directories[directory := directory.absolute()] = scanned
+        self._updated.add(directory)
+        self._forgotten.discard(directory)
+
+    def prune(self, directory: Path, keep: set[Path]) -> None:
+        """Forget any directories within a directory that weren't found.
+
+        Args:
+            directory: The directory that was scanned.
+            keep: The locations of the directories that were found.
+        """
+        directory = directory.absolute()
+        keep = {location.absolute() for location in keep}
+        for location in [
+            location
+            for location in self._directories
+            if location.is_relative_to(directory) and location not in keep
+        ]:
+            del self._directories[location]
+            self._forgotten.add(location)
+            self._updated.discard(location)
+
+    def directories_within(self, directory: Path) -> list[Path]:
+        """Get the directories known to be within a directory.
+
+        Args:
+            directory: The directory to get the directories within.
+
+        Returns:
+            The locations of the directory, and of every directory within
+            it, that have been scanned.
+        """
+        directory = directory.absolute()
+        return [
+            location
+            for location in self._directories
+            if location.is_relative_to(directory)
+        ]
+
+    def save(self) -> None:
+        """Save the cache to storage, if it's changed.
+
+        Raises:
+            OSError: If the cache couldn't be saved.
+        """
+        if not (self._updated or self._forgotten):
+            return
+        with _SAVING:
+            directories = _load_directories()
+            directories.update(
+                (location, self._directories[location]) for location in self._updated
+            )
+            for location in self._forgotten:
+                directories.pop(location, None)
+            write_text_safely(
+                scan_cache_file(),
+                dumps(
+                    {
+                        str(location): scanned.as_json
+                        for location, scanned in directories.items()
+                    }
+                ),
+            )
+        self._directories = directories
+        self._updated.clear()
+        self._forgotten.clear()
+
+
+### scan_cache.py ends here
@@ -1,9 +1,40 @@
 """Provides a method of holding results of a search."""
 
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
 ##############################################################################
 # Python imports.
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, MutableSequence, Sequence
+from json import dumps as json_dumps
+from json import loads as json_loads
 from pathlib import Path
-from typing import NamedTuple, TypeAlias
+from pickle import dumps, loads
+from struct import Struct
+from struct import error as StructError
+from sys import byteorder
+from tempfile import TemporaryFile
+from threading import Lock
+from typing import IO, Any, Final, NamedTuple, overload
+
+##############################################################################
+# Local imports.
+from .locations import data_dir
+
+##############################################################################
+SPILL_PAGE_SIZE: Final[int] = 4096
+"""The number of hits held in each page of spilled hits."""
+
+##############################################################################
+SPILL_PAGES_HELD: Final[int] = 8
+"""The number of pages of spilled hits kept in memory at once."""
+
+##############################################################################
+DESCRIPTION: Final = Struct("<I")
+"""The layout of the length of the description that starts packed hits."""
 
 
 ##############################################################################
@@ -18,15 +49,687 @@ class SearchHit(NamedTuple):
     """The number of the line in which the hit was found."""
     line_source: str
     """The guide source for the line in which the hit was found."""
+    needle: str | None = None
+    """The needle that was found, if there were many being searched for."""
 
     @property
     def identity(self) -> str:
         """The unique identity for the search hit."""
-        return f"{self.guide}-{self.entry_offset}-{self.entry_line}"
+        return f"{self.guide}-{self.entry_offset}-{self.entry_line}" + (
+            "" if self.needle is None else f"-{self.needle}"
+        )
 
 
 ##############################################################################
-SearchHits: TypeAlias = list[SearchHit]
-"""The type of a collection of search hits."""
+class SpilledHits:
+    """Search hits that have been moved out of memory into a file.
+
+    The hits are written to the file in pages, and each page is read back
+    in when a hit within it is wanted; only the most recently used pages
+    are kept in memory.
+    """
+
+    def __init__(self, hits: SearchHits, location: Path) -> None:
+        """Initialise the spilled hits.
+
+        Args:
+            hits: The hits to spill.
+            location: The directory to create the file in.
+
+        Raises:
+            OSError: If there was a problem writing the hits to the file.
+        """
+        # The file needs to stay open for as long as the hits are spilled;
+        # it goes away as soon as it's closed.
+        self._file: IO[bytes] = TemporaryFile(dir=location)  # noqa: SIM115
+        """The file that holds the hits."""
+        self._pages: list[tuple[int, int]] = []
+        """The position and size of each page within the file."""
+        for start in range(0, len(hits), SPILL_PAGE_SIZE):
+            page = dumps(hits[start : start + SPILL_PAGE_SIZE])
+            self._pages.append((self._file.tell(), len(page)))
+            self._file.write(page)
+        self._file.flush()
+        self._count = len(hits)
+        """The number of hits that were spilled."""
+        self._held: OrderedDict[int, SearchHits] = OrderedDict()
+        """The pages currently held in memory."""
+        self._lock = Lock()
+        """Lock for reading pages, which could happen in different threads."""
+
+    def __len__(self) -> int:
+        """The number of hits that were spilled."""
+        return self._count
+
+    def _page(self, page: int) -> SearchHits:
+        """Get a page of hits.
+
+        Args:
+            page: The number of the page.
+
+        Returns:
+            The hits in the page.
+        """
+        with self._lock:
+            if (hits := self._held.get(page)) is None:
+                position, size = self._pages[page]
+                self._file.seek(position)
+                hits = self._held[page] = loads(self._file.read(size))
+                if len(self._held) > SPILL_PAGES_HELD:
+                    self._held.popitem(last=False)
+            else:
+                self._held.move_to_end(page)
+            return hits
+
+    def hit(self, index: int) -> SearchHit:
+        """Get a hit.
+
+        Args:
+            index: The position of the hit.
+
+        Returns:
+            The hit.
+        """
+        return self._page(index // SPILL_PAGE_SIZE)[index % SPILL_PAGE_SIZE]
+
+    def __iter__(self) -> Iterator[SearchHit]:
+        """Iterate over the hits."""
+        for page in range(len(self._pages)):
+            yield from self._page(page)
+
+    def close(self) -> None:
+        """Close the spilled hits, removing the file."""
+        self._file.close()
+
+
+##############################################################################
+class SearchHits(MutableSequence[SearchHit]):
+    """A collection of search hits.
+
+    This behaves like a list of [`SearchHit`][aging.data.SearchHit], but
+    the hits are held in columns: each guide and each needle is only held
+    once, the offsets and line numbers are held in arrays, and the source
+    of every line is held in one shared buffer. A
+    [`SearchHit`][aging.data.SearchHit] is only made when a hit is asked
+    for. This means that very large numbers of hits take up a lot less
+    memory than they would as a list.
+
+    The hits can also be spilled out of memory into a temporary file, from
+    where they are read back in as they are needed.
+    """
+
+    def __init__(self, hits: Iterable[SearchHit] = ()) -> None:
+        """Initialise the collection of hits.
+
+        Args:
+            hits: The hits to start with.
+        """
+        self._guides: list[Path] = []
+        """The guides the hits were found in."""
+        self._guide_ids: dict[Path, int] = {}
+        """The index of each guide within the guides."""
+        self._needles: list[str | None] = [None]
+        """The needles that were found."""
+        self._needle_ids: dict[str | None, int] = {None: 0}
+        """The index of each needle within the needles."""
+        self._guide = array("L")
+        """The guide of each hit."""
+        self._entry_offset = array("q")
+        """The entry offset of each hit."""
+        self._entry_line = array("q")
+        """The line number of each hit."""
+        self._needle = array("L")
+        """The needle of each hit."""
+        self._source_start = array("q")
+        """Where the source of the line of each hit starts in the buffer."""
+        self._source_end = array("q")
+        """Where the source of the line of each hit ends in the buffer."""
+        self._sources = bytearray()
+        """The buffer that holds the source of the line of every hit."""
+        self._spilled: SpilledHits | None = None
+        """The hits, if they have been spilled out of memory."""
+        self.extend(hits)
+
+    def spill(self, location: Path | None = None) -> None:
+        """Spill the hits out of memory into a temporary file.
+
+        Args:
+            location: Optional directory to create the file in.
+
+        Raises:
+            OSError: If there was a problem writing the hits to the file.
+
+        Note:
+            The hits are read back in from the file as they are needed;
+            changing the hits in any way brings them all back into memory.
+        """
+        if self._spilled is None and self:
+            spilled = SpilledHits(self, location or data_dir())
+            self.clear()
+            self._spilled = spilled
+
+    @property
+    def guides(self) -> list[Path]:
+        """The guides that the hits were found in."""
+        if self._spilled is not None:
+            return list(dict.fromkeys(hit.guide for hit in self._spilled))
+        return self._guides.copy()
+
+    @property
+    def spilled(self) -> bool:
+        """Have the hits been spilled out of memory?"""
+        return self._spilled is not None
+
+    def _unspill(self) -> None:
+        """Bring any spilled hits back into memory."""
+        if (spilled := self._spilled) is not None:
+            self._spilled = None
+            self.extend(spilled)
+            spilled.close()
+
+    def _guide_id(self, guide: Path) -> int:
+        """Get the ID of a guide, adding it if it's new.
+
+        Args:
+            guide: The guide to get the ID for.
+
+        Returns:
+            The ID of the guide.
+        """
+        if (guide_id := self._guide_ids.get(guide)) is None:
+            guide_id = self._guide_ids[guide] = len(self._guides)
+            self._guides.append(guide)
+        return guide_id
+
+    def _needle_id(self, needle: str | None) -> int:
+        """Get the ID of a needle, adding it if it's new.
+
+        Args:
+            needle: The needle to get the ID for.
+
+        Returns:
+            The ID of the needle.
+        """
+        if (needle_id := self._needle_ids.get(needle)) is None:
+            needle_id = self._needle_ids[needle] = len(self._needles)
+            self._needles.append(needle)
+        return needle_id
+
+    def _source(self, source: str) -> tuple[int, int]:
+        """Add the source of a line to the buffer.
+
+        Args:
+            source: The source to add.
+
+        Returns:
+            Where the source starts and ends in the buffer.
+        """
+        start = len(self._sources)
+        self._sources += source.encode("utf-8", "surrogatepass")
+        return start, len(self._sources)
+
+    def _position(self, index: int) -> int:
+        """Get the position of a hit from its index.
+
+        Args:
+            index: The index of the hit, which may be negative.
+
+        Returns:
+            The position of the hit.
+
+        Raises:
+            IndexError: If there is no hit at that index.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("search hit index out of range")
+        return index % len(self)
+
+    def _hit(self, index: int) -> SearchHit:
+        """Make the search hit for a given position.
+
+        Args:
+            index: The position of the hit.
+
+        Returns:
+            The search hit.
+        """
+        if self._spilled is not None:
+            return self._spilled.hit(index)
+        return SearchHit(
+            self._guides[self._guide[index]],
+            self._entry_offset[index],
+            self._entry_line[index],
+            self._sources[self._source_start[index] : self._source_end[index]].decode(
+                "utf-8", "surrogatepass"
+            ),
+            self._needles[self._needle[index]],
+        )
+
+    def __len__(self) -> int:
+        """The number of hits."""
+        return len(self._guide if self._spilled is None else self._spilled)
+
+    @overload
+    def __getitem__(self, index: int) -> SearchHit: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SearchHits: ...
+
+    def __getitem__(self, index: int | slice) -> SearchHit | SearchHits:
+        """Get a hit, or a slice of the hits.
+
+        Args:
+            index: The index of the hit, or the slice of hits.
+
+        Returns:
+            The hit, or the hits.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1 and self._spilled is None:
+                return self._slice(start, stop)
+            return SearchHits(
+                self._hit(position) for position in range(start, stop, step)
+            )
+        return self._hit(self._position(index))
+
+    def _slice(self, start: int, stop: int) -> SearchHits:
+        """Get a run of the hits.
+
+        Args:
+            start: The position of the first hit.
+            stop: The position after the last hit.
+
+        Returns:
+            The hits.
+
+        Note:
+            This works a column at a time, rather than a hit at a time.
+        """
+        sliced = SearchHits()
+        if stop <= start:
+            return sliced
+        sliced._guides = self._guides.copy()
+        sliced._guide_ids = self._guide_ids.copy()
+        sliced._needles = self._needles.copy()
+        sliced._needle_ids = self._needle_ids.copy()
+        sliced._guide = self._guide[start:stop]
+        sliced._entry_offset = self._entry_offset[start:stop]
+        sliced._entry_line = self._entry_line[start:stop]
+        sliced._needle = self._needle[start:stop]
+        low = min(starts := self._source_start[start:stop])
+        high = max(ends := self._source_end[start:stop])
+        sliced._source_start = array("q", (offset - low for offset in starts))
+        sliced._source_end = array("q", (offset - low for offset in ends))
+        sliced._sources = self._sources[low:high]
+        return sliced
+
+    def _adopt(self, hits: SearchHits) -> None:
+        """Take over the content of another collection of hits.
+
+        Args:
+            hits: The hits to take over; they shouldn't be used afterwards.
+        """
+        self.clear()
+        self._guides = hits._guides
+        self._guide_ids = hits._guide_ids
+        self._needles = hits._needles
+        self._needle_ids = hits._needle_ids
+        self._guide = hits._guide
+        self._entry_offset = hits._entry_offset
+        self._entry_line = hits._entry_line
+        self._needle = hits._needle
+        self._source_start = hits._source_start
+        self._source_end = hits._source_end
+        self._sources = hits._sources
+        self._spilled = hits._spilled
+
+    def reordered(self, order: Iterable[int]) -> SearchHits:
+        """Get the hits in a different order.
+
+        Args:
+            order: The position of each hit to take, in the order wanted.
+
+        Returns:
+            The hits, in the given order.
+
+        Note:
+            This works a column at a time, rather than a hit at a time;
+            the source of every line is shared with the new collection as
+            it stands, so `order` is expected to take most of the hits.
+        """
+        if self._spilled is not None:
+            return self.copy().reordered(order)
+        order = array("q", order)
+        reordered = SearchHits()
+        reordered._guides = self._guides.copy()
+        reordered._guide_ids = self._guide_ids.copy()
+        reordered._needles = self._needles.copy()
+        reordered._needle_ids = self._needle_ids.copy()
+        for source, target in zip(self._columns, reordered._columns, strict=True):
+            target.extend(source[position] for position in order)
+        reordered._sources = self._sources.copy()
+        return reordered
+
+    @overload
+    def __setitem__(self, index: int, hit: SearchHit) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, hit: Iterable[SearchHit]) -> None: ...
+
+    def __setitem__(self, index: int | slice, hit: Any) -> None:
+        """Replace a hit, or a slice of the hits.
+
+        Args:
+            index: The index of the hit, or the slice of hits.
+            hit: The hit, or hits, to put in place.
+        """
+        if isinstance(index, slice):
+            replacement = (
+                hit
+                if isinstance(hit, SearchHits) and hit is not self
+                else SearchHits(hit)
+            )
+            start, stop, step = index.indices(len(self))
+            if step == 1 and start == 0 and stop >= len(self):
+                # Replacing everything, so there's no need to bring any
+                # spilled hits back into memory first.
+                self.clear()
+                self.extend(replacement)
+                return
+            self._unspill()
+            if step == 1:
+                # Put the replacement in place a column at a time.
+                replaced = self._slice(0, start)
+                replaced.extend(replacement)
+                replaced.extend(self._slice(max(start, stop), len(self)))
+                self._adopt(replaced)
+                return
+            hits = list(self)
+            hits[index] = replacement
+            self.clear()
+            self.extend(hits)
+            return
+        self._unspill()
+        index = self._position(index)
+        self._guide[index] = self._guide_id(hit.guide)
+        self._entry_offset[index] = hit.entry_offset
+        self._entry_line[index] = hit.entry_line
+        self._needle[index] = self._needle_id(hit.needle)
+        self._source_start[index], self._source_end[index] = self._source(
+            hit.line_source
+        )
+
+    def __delitem__(self, index: int | slice) -> None:
+        """Remove a hit, or a slice of the hits.
+
+        Args:
+            index: The index of the hit, or the slice of hits.
+        """
+        self._unspill()
+        for column in self._columns:
+            del column[index]
+
+    @property
+    def _columns(self) -> tuple[array[int], ...]:
+        """The columns that hold the hits."""
+        return (
+            self._guide,
+            self._entry_offset,
+            self._entry_line,
+            self._needle,
+            self._source_start,
+            self._source_end,
+        )
+
+    def insert(self, index: int, hit: SearchHit) -> None:
+        """Insert a hit.
+
+        Args:
+            index: The position to insert the hit at.
+            hit: The hit to insert.
+        """
+        self._unspill()
+        start, end = self._source(hit.line_source)
+        for column, value in zip(
+            self._columns,
+            (
+                self._guide_id(hit.guide),
+                hit.entry_offset,
+                hit.entry_line,
+                self._needle_id(hit.needle),
+                start,
+                end,
+            ),
+            strict=True,
+        ):
+            column.insert(index, value)
+
+    def append(self, hit: SearchHit) -> None:
+        """Add a hit to the end of the collection.
+
+        Args:
+            hit: The hit to add.
+        """
+        self._unspill()
+        start, end = self._source(hit.line_source)
+        self._guide.append(self._guide_id(hit.guide))
+        self._entry_offset.append(hit.entry_offset)
+        self._entry_line.append(hit.entry_line)
+        self._needle.append(self._needle_id(hit.needle))
+        self._source_start.append(start)
+        self._source_end.append(end)
+
+    def extend(self, hits: Iterable[SearchHit]) -> None:
+        """Add some hits to the end of the collection.
+
+        Args:
+            hits: The hits to add.
+        """
+        self._unspill()
+        if not isinstance(hits, SearchHits) or hits.spilled:
+            for hit in hits:
+                self.append(hit)
+            return
+        if hits is self:
+            hits = self.copy()
+        # Another collection of hits can be added a column at a time, only
+        # needing its guides and needles mapping to ours.
+        guides = [self._guide_id(guide) for guide in hits._guides]
+        needles = [self._needle_id(needle) for needle in hits._needles]
+        shift = len(self._sources)
+        self._guide.extend(guides[guide] for guide in hits._guide)
+        self._entry_offset.extend(hits._entry_offset)
+        self._entry_line.extend(hits._entry_line)
+        self._needle.extend(needles[needle] for needle in hits._needle)
+        self._source_start.extend(start + shift for start in hits._source_start)
+        self._source_end.extend(end + shift for end in hits._source_end)
+        self._sources += hits._sources
+
+    def clear(self) -> None:
+        """Remove all of the hits."""
+        if self._spilled is not None:
+            self._spilled.close()
+            self._spilled = None
+        for column in self._columns:
+            del column[:]
+        self._sources.clear()
+        self._guides.clear()
+        self._guide_ids.clear()
+        del self._needles[1:]
+        self._needle_ids = {None: 0}
+
+    def sort(
+        self, *, key: Callable[[SearchHit], Any] | None = None, reverse: bool = False
+    ) -> None:
+        """Sort the hits in place.
+
+        Args:
+            key: Optional function to get the key to sort each hit by.
+            reverse: Should the sort be reversed?
+        """
+        self._unspill()
+        self._adopt(
+            self.reordered(
+                sorted(
+                    range(len(self)),
+                    key=self._sort_key
+                    if key is None
+                    else lambda position: key(self._hit(position)),
+                    reverse=reverse,
+                )
+            )
+        )
+
+    def _sort_key(self, position: int) -> tuple[Any, ...]:
+        """Get the key that sorts a hit in the same order as the hit itself.
+
+        Args:
+            position: The position of the hit.
+
+        Returns:
+            The key for the hit.
+
+        Note:
+            The source of the line is compared as its UTF-8 encoding, which
+            sorts in the same order as the text itself.
+        """
+        return (
+            self._guides[self._guide[position]],
+            self._entry_offset[position],
+            self._entry_line[position],
+            self._sources[self._source_start[position] : self._source_end[position]],
+            self._needles[self._needle[position]],
+        )
+
+    def to_bytes(self) -> bytes:
+        """Pack the hits into a compact run of bytes.
+
+        Returns:
+            The packed hits.
+
+        Note:
+            The packed hits start with a description of the guides and
+            the needles, followed by each column of the hits as 64 bit
+            little-endian integers, and then the source of every line.
+        """
+        if self._spilled is not None:
+            return self.copy().to_bytes()
+        description = json_dumps(
+            {
+                "guides": [str(guide) for guide in self._guides],
+                "needles": self._needles,
+                "hits": len(self),
+            }
+        ).encode("utf-8")
+        columns: list[bytes] = []
+        for column in self._columns:
+            packed = array("q", column)
+            if byteorder == "big":
+                packed.byteswap()
+            columns.append(packed.tobytes())
+        return b"".join(
+            (
+                DESCRIPTION.pack(len(description)),
+                description,
+                *columns,
+                bytes(self._sources),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SearchHits:
+        """Unpack some hits that were packed into bytes.
+
+        Args:
+            data: The packed hits.
+
+        Returns:
+            The hits.
+
+        Raises:
+            ValueError: If the data doesn't hold valid packed hits.
+        """
+        try:
+            (length,) = DESCRIPTION.unpack_from(data)
+            description = json_loads(
+                data[DESCRIPTION.size : (position := DESCRIPTION.size + length)]
+            )
+            count = int(description["hits"])
+            guides = [Path(guide) for guide in description["guides"]]
+            needles: list[str | None] = list(description["needles"])
+        except (StructError, KeyError, TypeError) as error:
+            raise ValueError(f"Invalid packed search hits: {error}") from None
+        if not needles or needles[0] is not None:
+            raise ValueError("Invalid packed search hits: bad needles")
+        hits = cls()
+        columns: list[array[int]] = []
+        for column in hits._columns:
+            unpacked = array("q", data[position : (position := position + count * 8)])
+            if byteorder == "big":
+                unpacked.byteswap()
+            try:
+                columns.append(array(column.typecode, unpacked))
+            except OverflowError as error:
+                raise ValueError(f"Invalid packed search hits: {error}") from None
+        guide, entry_offset, entry_line, needle, source_start, source_end = columns
+        sources = bytearray(data[position:])
+        if (
+            len(source_end) != count
+            or (count and not max(guide) < len(guides))
+            or (count and not max(needle) < len(needles))
+            or (count and not max(source_end) <= len(sources))
+        ):
+            raise ValueError("Invalid packed search hits: bad columns")
+        hits._guides = guides
+        hits._guide_ids = {guide: index for index, guide in enumerate(guides)}
+        hits._needles = needles
+        hits._needle_ids = {needle: index for index, needle in enumerate(needles)}
+        hits._guide = guide
+        hits._entry_offset = entry_offset
+        hits._entry_line = entry_line
+        hits._needle = needle
+        hits._source_start = source_start
+        hits._source_end = source_end
+        hits._sources = sources
+        return hits
+
+    def copy(self) -> SearchHits:
+        """Get a copy of the hits.
+
+        Returns:
+            A copy of the hits.
+        """
+        return SearchHits(self)
+
+    def __iter__(self) -> Iterator[SearchHit]:
+        """Iterate over the hits."""
+        if self._spilled is not None:
+            yield from self._spilled
+            return
+        for index in range(len(self)):
+            yield self._hit(index)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the hits with another sequence of hits.
+
+        Args:
+            other: The other sequence.
+
+        Returns:
+            [`True`][True] if both hold the same hits in the same order.
+        """
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """The representation of the hits."""
+        return f"SearchHits({list(self)!r})"
+
 
 ### search_hits.py ends here
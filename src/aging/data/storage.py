@@ -0,0 +1,46 @@
+"""Provides a safe way of writing the files that hold the app's data."""
+
+##############################################################################
+# Python imports.
+from os import replace
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+
+##############################################################################
+def write_text_safely(location: Path, text: str) -> None:
+    """Write text to a file, so anything reading it sees all or none of it.
+
+    Args:
+        location: The location of the file to write.
+        text: The text to write to the file.
+
+    Raises:
+        OSError: If the file couldn't be written.
+
+    Note:
+        The text is written to a temporary file alongside the file, which
+        then replaces the file in one go.
+    """
+    with NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=location.parent,
+        prefix=f".{location.name}.",
+        delete=False,
+    ) as temporary:
+        written = Path(temporary.name)
+        try:
+            temporary.write(text)
+        except OSError:
+            temporary.close()
+            written.unlink(missing_ok=True)
+            raise
+    try:
+        replace(written, location)
+    except OSError:
+        written.unlink(missing_ok=True)
+        raise
+
+
+### storage.py ends here
@@ -0,0 +1,254 @@
+"""Provides a method of keeping watch on directories for guides coming and going."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+import sys
+from collections.abc import Callable, Iterable
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import close, fsencode, read, strerror
+from pathlib import Path
+from select import select
+from struct import Struct
+from time import monotonic, sleep
+from typing import Final
+
+##############################################################################
+# Local imports.
+from .discovery import discover_guides
+from .guides import Guides
+from .scan_cache import ScanCache
+
+##############################################################################
+WATCH_INTERVAL: Final[float] = 60.0
+"""The default time, in seconds, between checks of the watched directories."""
+
+##############################################################################
+SETTLE_TIME: Final[float] = 2.0
+"""The time, in seconds, to let a flurry of changes settle before looking."""
+
+##############################################################################
+CANCEL_CHECK: Final[float] = 0.5
+"""The longest time, in seconds, to go without checking for cancellation."""
+
+##############################################################################
+_IN_NONBLOCK: Final[int] = 0o4000
+_IN_CLOEXEC: Final[int] = 0o2000000
+_IN_CLOSE_WRITE: Final[int] = 0x00000008
+_IN_MOVED_FROM: Final[int] = 0x00000040
+_IN_MOVED_TO: Final[int] = 0x00000080
+_IN_CREATE: Final[int] = 0x00000100
+_IN_DELETE: Final[int] = 0x00000200
+_IN_DELETE_SELF: Final[int] = 0x00000400
+_IN_MOVE_SELF: Final[int] = 0x00000800
+_IN_ONLYDIR: Final[int] = 0x01000000
+_IN_Q_OVERFLOW: Final[int] = 0x00004000
+
+##############################################################################
+_WATCH_MASK: Final[int] = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+"""The inotify events that could mean a guide has come or gone."""
+
+##############################################################################
+_EVENT: Final = Struct("iIII")
+"""The layout of the fixed part of an inotify event."""
+
+
+##############################################################################
+class _Notifier:
+    """A minimal wrapper around Linux's inotify."""
+
+    def __init__(self, libc: CDLL, handle: int) -> None:
+        """Initialise the notifier.
+
+        Args:
+            libc: The C library that provides inotify.
+            handle: The inotify file descriptor.
+        """
+        self._libc = libc
+        """The C library that provides inotify."""
+        self._handle = handle
+        """The inotify file descriptor."""
+        self._watching: dict[int, Path] = {}
+        """The directories being watched, keyed by watch descriptor."""
+
+    @classmethod
+    def create(cls) -> _Notifier | None:
+        """Create a notifier, if inotify is available.
+
+        Returns:
+            A fresh notifier, or [`None`][None] if inotify isn't available.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = CDLL(find_library("c") or "libc.so.6", use_errno=True)
+            if (handle := libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)) < 0:
+                return None
+        except (OSError, AttributeError):
+            return None
+        return cls(libc, handle)
+
+    def watch(self, directory: Path) -> None:
+        """Watch a directory for changes.
+
+        Args:
+            directory: The directory to watch.
+
+        Raises:
+            OSError: If the directory couldn't be watched.
+
+        Note:
+            Watching a directory that is already being watched is harmless.
+        """
+        if (
+            descriptor := self._libc.inotify_add_watch(
+                self._handle, fsencode(directory), _WATCH_MASK
+            )
+        ) < 0:
+            raise OSError(errno := get_errno(), strerror(errno), str(directory))
+        self._watching[descriptor] = directory
+
+    def changes(self, timeout: float) -> set[Path] | None:
+        """Wait for changes in the watched directories.
+
+        Args:
+            timeout: The longest time, in seconds, to wait.
+
+        Returns:
+            The directories that changed, or [`None`][None] if changes were
+            missed and so anything could have changed.
+        """
+        if not select([self._handle], [], [], timeout)[0]:
+            return set()
+        try:
+            events = read(self._handle, 65536)
+        except BlockingIOError:
+            return set()
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(events):
+            descriptor, mask, _, length = _EVENT.unpack_from(events, offset)
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if (directory := self._watching.get(descriptor)) is not None:
+                changed.add(directory)
+        return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+        close(self._handle)
+
+
+##############################################################################
+def watch_guides(
+    directories: Iterable[Path],
+    changed: Callable[[Path, Guides], object],
+    cancelled: Callable[[], bool],
+    interval: float = WATCH_INTERVAL,
+) -> None:
+    """Keep watch on some directories for guides coming and going.
+
+    Args:
+        directories: The directories to watch.
+        changed: The function to call with a watched directory and all of
+            the guides now within it, whenever they change.
+        cancelled: A function that reports if the watch was cancelled.
+        interval: The time, in seconds, between checks of the directories.
+
+    Note:
+        This keeps going until the watch is cancelled. Each directory is
+        looked in straight away, then again every `interval` seconds; each
+        look uses a [`ScanCache`][aging.data.ScanCache] so only those
+        directories and files that have changed are looked at again.
+
+        Where inotify is available the directories are also watched, and
+        a directory is looked in again shortly after anything within it
+        changes, rather than waiting for the next check. The checks still
+        take place, as inotify doesn't hear of changes made to network
+        file systems by other machines.
+
+        A directory that can't be found is left alone, rather than being
+        reported as having no guides, so a network share going away for a
+        while doesn't empty the directory of guides.
+    """
+    roots = sorted({directory.absolute() for directory in directories})
+    cache = ScanCache()
+    notifier = _Notifier.create()
+    reported: dict[Path, set[Path]] = {}
+    looking = set(roots)
+    next_check = monotonic() + interval
+    try:
+        while not cancelled():
+            for root in sorted(looking):
+                if not root.is_dir():
+                    continue
+                guides: Guides = []
+                if not discover_guides(
+                    root, guides.extend, cancelled=cancelled, cache=cache
+                ):
+                    return
+                if (found := {guide.location for guide in guides}) != reported.get(
+                    root
+                ):
+                    reported[root] = found
+                    changed(root, guides)
+                if notifier is not None:
+                    try:
+                        for directory in cache.directories_within(root):
+                            notifier.watch(directory)
+                    except OSError:
+                        # Most likely we've run out of watches; so fall back
+                        # to just checking every so often.
+                        notifier.close()
+                        notifier = None
+            try:
+                cache.save()
+            except OSError:
+                pass
+            looking = set()
+            settle_until: float | None = None
+            while not cancelled():
+                if (now := monotonic()) >= next_check:
+                    looking = set(roots)
+                    next_check = now + interval
+                    break
+                if settle_until is not None and now >= settle_until:
+                    break
+                timeout = min(
+                    CANCEL_CHECK,
+                    (next_check if settle_until is None else settle_until) - now,
+                )
+                if notifier is None:
+                    sleep(timeout)
+                    continue
+                if (directories_changed := notifier.changes(timeout)) is None:
+                    looking = set(roots)
+                else:
+                    looking |= {
+                        root
+                        for root in roots
+                        for directory in directories_changed
+                        if directory.is_relative_to(root)
+                    }
+                if looking and settle_until is None:
+                    settle_until = monotonic() + SETTLE_TIME
+    finally:
+        if notifier is not None:
+            notifier.close()
+
+
+### watcher.py ends here
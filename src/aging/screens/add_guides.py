@@ -0,0 +1,150 @@
+"""Provides a dialog for adding the guides found within a directory."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Textual imports.
+from textual import on, work
+from textual.app import ComposeResult
+from textual.containers import HorizontalGroup, VerticalGroup
+from textual.screen import ModalScreen
+from textual.widgets import Button, Label
+from textual.worker import get_current_worker
+
+##############################################################################
+# Local imports.
+from ..data import DiscoveryProgress, Guides, ScanCache, discover_guides
+from ..widgets import PROGRESS_INTERVAL, Counter
+
+
+##############################################################################
+class AddGuides(ModalScreen[int]):
+    """A dialog that finds and adds the guides within a directory.
+
+    The guides are added to the guide directory, in batches, as they are
+    found. The result of the dialog is the number of guides that were
+    added.
+    """
+
+    DEFAULT_CSS = """
+    AddGuides {
+        align: center middle;
+
+        &> VerticalGroup {
+            width: 80%;
+            height: auto;
+            background: $panel;
+            border: solid $border;
+
+            &> Label {
+                height: 1;
+                padding: 0 1;
+                width: 1fr;
+                text-align: center;
+                text-overflow: ellipsis;
+            }
+
+            &> HorizontalGroup {
+                margin: 1 0;
+            }
+
+            #buttons {
+                align: center middle;
+                border-top: solid $border;
+                margin: 0;
+            }
+        }
+    }
+    """
+
+    BINDINGS = [("escape", "stop")]
+
+    def __init__(self, directory: Path, add: Callable[[Guides], Guides]) -> None:
+        """Initialise the dialog.
+
+        Args:
+            directory: The directory to find the guides within.
+            add: The function to call to add a batch of guides; it returns
+                the guides that were actually added.
+        """
+        self._directory = directory
+        """The directory to find the guides within."""
+        self._add = add
+        """The function to call to add a batch of guides."""
+        self._progress = DiscoveryProgress()
+        """The progress of finding the guides."""
+        self._added = 0
+        """The number of guides that have been added."""
+        super().__init__()
+
+    def compose(self) -> ComposeResult:
+        """Compose the content of the dialog."""
+        with VerticalGroup() as dialog:
+            dialog.border_title = "Adding Guides"
+            yield Label(f"Looking in {self._directory}", markup=False)
+            with HorizontalGroup():
+                yield Counter(id="directories")
+                yield Counter(id="files")
+                yield Counter(id="guides")
+                yield Counter(id="added")
+            yield Label(id="current_directory", markup=False)
+            with HorizontalGroup(id="buttons"):
+                yield Button("Stop", variant="error", id="stop")
+
+    def on_mount(self) -> None:
+        """Configure the dialog once the DOM is mounted."""
+        self.set_interval(PROGRESS_INTERVAL, self._show_progress)
+        self._find_guides()
+
+    def _show_progress(self) -> None:
+        """Show the progress of finding the guides."""
+        self.query_one("#directories", Counter).count = self._progress.directories
+        self.query_one("#files", Counter).count = self._progress.files
+        self.query_one("#guides", Counter).count = self._progress.guides
+        self.query_one("#added", Counter).count = self._added
+        current = "" if self._progress.current is None else str(self._progress.current)
+        if (label := self.query_one("#current_directory", Label)).content != current:
+            label.update(current)
+
+    def _found(self, guides: Guides) -> None:
+        """Add a batch of guides that were found.
+
+        Args:
+            guides: The guides that were found.
+        """
+        self._added += len(self._add(guides))
+
+    @work(thread=True, exclusive=True, group="discovery")
+    def _find_guides(self) -> None:
+        """Find the guides within the directory."""
+        worker = get_current_worker()
+        discover_guides(
+            self._directory,
+            lambda guides: self.app.call_from_thread(self._found, guides),
+            self._progress,
+            lambda: worker.is_cancelled,
+            cache=(cache := ScanCache()),
+        )
+        try:
+            cache.save()
+        except OSError as error:
+            self.notify(
+                str(error), title="Unable to save the scan cache", severity="warning"
+            )
+        self.app.call_from_thread(self._finished)
+
+    def _finished(self) -> None:
+        """Handle finding the guides coming to an end."""
+        self._show_progress()
+        self.dismiss(self._added)
+
+    @on(Button.Pressed, "#stop")
+    def action_stop(self) -> None:
+        """Stop finding the guides."""
+        self.app.workers.cancel_group(self, "discovery")
+
+
+### add_guides.py ends here
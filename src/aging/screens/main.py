@@ -5,6 +5,7 @@
 from argparse import Namespace
 from collections.abc import Iterator
 from pathlib import Path
+from threading import Lock
 
 ##############################################################################
 # NGDB imports.
@@ -55,19 +56,26 @@ from ..commands import (
     ToggleGuides,
 )
 from ..data import (
-    Guide,
+    Fingerprints,
     Guides,
+    LastSearch,
     SearchHit,
     SearchHits,
+    is_guide,
     load_configuration,
     load_guides,
+    load_last_search,
     save_guides,
+    save_last_search,
     update_configuration,
+    watch_guides,
 )
 from ..messages import CopyToClipboard, GuidesUpdated, OpenEntry, OpenGuide
 from ..providers import GuidesCommands, MainCommands
+from ..search import GuideFilters, SearchIndex, SearchIndexError
 from ..widgets import EntryViewer, GuideDirectory, GuideMenu
 from .about import About
+from .add_guides import AddGuides
 from .search import Search
 
 
@@ -176,6 +184,14 @@ class Main(EnhancedScreen[None]):
         """Keeps track of the last search hits."""
         self._last_search_hit_visited: SearchHit | None = None
         """The last search hit that was visited."""
+        self._last_search_hit_visited_at: int | None = None
+        """The position of the last search hit visited within the hits."""
+        self._last_search_known = False
+        """Have the results of the last search been loaded, or replaced?"""
+        self._resolved: dict[Path, Path] = {}
+        """The resolved form of each location of a guide that has been seen."""
+        self._indexing = Lock()
+        """Ensures only one update of the search index happens at a time."""
         super().__init__()
 
     def compose(self) -> ComposeResult:
@@ -273,7 +289,10 @@ class Main(EnhancedScreen[None]):
     def on_mount(self) -> None:
         """Configure the screen once the DOM is mounted."""
         self.guides = load_guides()
+        self._update_search_index()
         config = load_configuration()
+        if config.watched_directories:
+            self._watch_directories()
         self.guides_visible = config.guides_directory_visible
         self.guides_on_right = config.guides_directory_on_right
         self.classic_view = config.classic_view
@@ -284,24 +303,176 @@ class Main(EnhancedScreen[None]):
                 OpenGuide(Path(config.current_guide), config.current_entry)
             )
 
-    def _new_guides(self, guides: Guides) -> None:
+    def on_unmount(self) -> None:
+        """Tidy up when the screen is unmounted."""
+        # Only save the results of the last search if we know what they
+        # are; if they were never loaded we'd be throwing them away.
+        if self._last_search_known:
+            try:
+                save_last_search(
+                    LastSearch(
+                        self._search_hits,
+                        self._last_search_hit_visited,
+                        self._last_search_hit_visited_at,
+                    )
+                )
+            except OSError:
+                pass
+
+    def _resolve(self, location: Path) -> Path:
+        """Resolve the location of a guide.
+
+        Args:
+            location: The location to resolve.
+
+        Returns:
+            The resolved location.
+
+        Note:
+            Resolving a location means going to the file system, so each
+            location is only resolved the once; after that the resolved
+            location is remembered.
+        """
+        if (resolved := self._resolved.get(location)) is None:
+            resolved = self._resolved[location] = location.resolve()
+        return resolved
+
+    def _new_guides(self, guides: Guides, gone: set[Path] | None = None) -> Guides:
         """Add a list of new guides to the guide directory.
 
         Args:
             guides: The new guides to add.
+            gone: Optional resolved locations of guides to remove.
+
+        Returns:
+            The guides that were added.
+
+        Note:
+            However many guides are added or removed, the guide directory
+            is only saved the once.
         """
         # Try and ensure we don't get duplicates based on location;
         # duplicates based on title are fine and it's up to the user to
         # decide if they want to remove them or not.
-        if guides := [guide for guide in guides if guide.location not in self.guides]:
-            self.guides = self.guides + guides
+        gone = gone or set()
+        kept: Guides = []
+        known: set[Path] = set()
+        for guide in self.guides:
+            if (location := self._resolve(guide.location)) not in gone:
+                kept.append(guide)
+                known.add(location)
+        added: Guides = []
+        for guide in guides:
+            if (location := self._resolve(guide.location)) not in known:
+                known.add(location)
+                added.append(guide)
+        if added or len(kept) != len(self.guides):
+            self.guides = kept + added
             save_guides(self.guides)
-            self.notify(f"New guides scanned and added: {len(guides)}")
-        else:
-            self.notify("No new guides found", severity="warning")
+        return added
+
+    def _watched_directory_changed(self, directory: Path, guides: Guides) -> None:
+        """Bring the guide directory up to date with a watched directory.
+
+        Args:
+            directory: The watched directory.
+            guides: All of the guides now within the watched directory.
+        """
+        # Only those guides that really have gone are removed; a guide that
+        # wasn't found this time, but is still there, will be looked at
+        # again the next time the directory changes.
+        directory = self._resolve(directory)
+        found = {self._resolve(guide.location) for guide in guides}
+        gone = {
+            location
+            for guide in self.guides
+            if (location := self._resolve(guide.location)).is_relative_to(directory)
+            and location not in found
+            and not location.exists()
+        }
+        added = self._new_guides(guides, gone)
+        if added or gone:
+            self.notify(
+                f"Guides added: {len(added)}; guides removed: {len(gone)}",
+                title=str(directory),
+            )
+            self._update_search_index()
+
+    @work(thread=True, exclusive=True, group="watch")
+    def _watch_directories(self) -> None:
+        """Keep watch on the watched directories for guides coming and going."""
+        worker = get_current_worker()
+        config = load_configuration()
+        watch_guides(
+            [Path(directory).expanduser() for directory in config.watched_directories],
+            lambda directory, guides: (
+                None
+                if worker.is_cancelled
+                else self.app.call_from_thread(
+                    self._watched_directory_changed, directory, guides
+                )
+            ),
+            lambda: worker.is_cancelled,
+            max(config.watch_interval, 1),
+        )
+
+    @work(thread=True, exclusive=True, group="index")
+    def _update_search_index(self) -> None:
+        """Bring the search index up to date with the guide directory.
+
+        Note:
+            Only those guides that have been added, changed or removed since
+            the index was last updated will be (re)indexed. The filters
+            used to rule out guides during a search are brought up to date
+            too.
+        """
+        # A fresh update cancels any update already underway, but that
+        # update's thread carries on until it notices; so wait for it to
+        # stop before starting on the index.
+        with self._indexing:
+            self._update_search_index_now()
+
+    def _update_search_index_now(self) -> None:
+        """Bring the search index up to date with the guide directory."""
+        worker = get_current_worker()
+        if worker.is_cancelled:
+            return
+        guides = self.guides
+        fingerprints = Fingerprints()
+        fingerprints.prune(guides)
+        try:
+            with SearchIndex() as index:
+                index.prune(guides)
+                for fingerprint in index.out_of_date(guides, fingerprints):
+                    if worker.is_cancelled:
+                        break
+                    try:
+                        index.add(fingerprint)
+                    except SearchIndexError as error:
+                        self.notify(
+                            str(error),
+                            title=f"Unable to index {fingerprint.location}",
+                            severity="warning",
+                        )
+        except SearchIndexError as error:
+            self.notify(
+                str(error), title="Unable to update the search index", severity="error"
+            )
+        try:
+            GuideFilters().update(guides, lambda: worker.is_cancelled)
+        except OSError as error:
+            self.notify(
+                str(error),
+                title="Unable to update the guide filters",
+                severity="warning",
+            )
+        try:
+            fingerprints.save()
+        except OSError:
+            pass
 
-    @work(thread=True)
-    def _add_guides_from(self, directory: Path) -> None:
+    @work
+    async def _add_guides_from(self, directory: Path) -> None:
         """Add guides in a directory to the directory of guides.
 
         Args:
@@ -309,17 +480,13 @@ class Main(EnhancedScreen[None]):
         """
         with update_configuration() as config:
             config.last_added_guides_from = str(directory.resolve())
-        worker = get_current_worker()
-        guides: list[Guide] = []
-        for candidate in directory.glob("**/*.*"):
-            if worker.is_cancelled:
-                return
-            if NortonGuide.maybe(candidate):
-                with NortonGuide(candidate) as guide:
-                    if guide.is_a:
-                        guides.append(Guide(make_dos_like(guide.title), guide.path))
-        if guides:
-            self.app.call_from_thread(self._new_guides, guides)
+        if added := await self.app.push_screen_wait(
+            AddGuides(directory, self._new_guides)
+        ):
+            self.notify(f"New guides scanned and added: {added}")
+            self._update_search_index()
+        else:
+            self.notify("No new guides found", severity="warning")
 
     def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
         """Check if an action is possible to perform right now.
@@ -372,6 +539,7 @@ class Main(EnhancedScreen[None]):
     def _reload_guides(self) -> None:
         """Reaload the guide directory from storage."""
         self.guides = load_guides()
+        self._update_search_index()
 
     @on(AddGuidesToDirectory)
     @work
@@ -623,7 +791,7 @@ class Main(EnhancedScreen[None]):
             guide := await self.app.push_screen_wait(
                 FileOpen(
                     Path(load_configuration().last_opened_guide_from),
-                    filters=Filters(("Norton Guides", NortonGuide.maybe)),
+                    filters=Filters(("Norton Guides", is_guide)),
                 )
             )
         ) is not None:
@@ -664,20 +832,73 @@ class Main(EnhancedScreen[None]):
             return
         self.query_one(EntryViewer).search_next()
 
+    def _remember_search(self, search: LastSearch) -> None:
+        """Remember the results of the last search.
+
+        Args:
+            search: The results of the last search.
+        """
+        self._search_hits = search.hits
+        self._last_search_hit_visited = search.visited
+        self._last_search_hit_visited_at = search.visited_at
+        self._last_search_known = True
+        if (
+            (threshold := load_configuration().global_search_spill_threshold)
+            and len(self._search_hits) > threshold
+            and not self._search_hits.spilled
+        ):
+            # The results are kept for as long as the application runs, so
+            # if there are a lot of them move them out of memory. Writing
+            # them out can take a while, so a copy is written out in the
+            # background and swapped in once it's done.
+            self._spill_search_hits(self._search_hits, self._search_hits.copy())
+
+    @work(thread=True, exclusive=True, group="spill")
+    def _spill_search_hits(self, hits: SearchHits, copy: SearchHits) -> None:
+        """Move a copy of the results of the last search out of memory.
+
+        Args:
+            hits: The results of the last search.
+            copy: A copy of the results, to move out of memory.
+        """
+        try:
+            copy.spill()
+        except OSError:
+            return
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._spilled_search_hits, hits, copy)
+
+    def _spilled_search_hits(self, hits: SearchHits, spilled: SearchHits) -> None:
+        """Swap in the results of the last search, once moved out of memory.
+
+        Args:
+            hits: The results of the last search that were copied.
+            spilled: The copy of the results that was moved out of memory.
+
+        Note:
+            The copy is only swapped in if the results haven't been
+            replaced since, and aren't in use by a search, as either could
+            mean the copy is out of date.
+        """
+        if self._search_hits is hits and self.is_active:
+            self._search_hits = spilled
+
     @on(GlobalSearch)
     @work
     async def action_global_search_command(self) -> None:
         """Perform a global search."""
+        if not self._last_search_known:
+            self._remember_search(load_last_search())
         result = await self.app.push_screen_wait(
             Search(
                 self.guides,
                 self.guide,
                 self._search_hits,
                 self._last_search_hit_visited,
+                self._last_search_hit_visited_at,
             )
         )
-        self._search_hits = result.hits
-        self._last_search_hit_visited = result.goto
+        self._remember_search(LastSearch(result.hits, result.goto, result.goto_at))
         if result.goto is not None:
             self.post_message(
                 OpenGuide(
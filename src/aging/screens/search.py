@@ -1,14 +1,18 @@
 """Provides the search screen."""
 
 ##############################################################################
-# Python imports.
-from collections.abc import Iterator
-from dataclasses import dataclass
-from typing import NamedTuple
+# Backward compatibility.
+from __future__ import annotations
 
 ##############################################################################
-# Humanize imports.
-from humanize import intcomma
+# Python imports.
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Final, NamedTuple
 
 ##############################################################################
 # NGDB imports
@@ -21,32 +25,33 @@ from rich.text import Text
 ##############################################################################
 # Textual imports.
 from textual import on, work
-from textual.app import ComposeResult, RenderResult
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.cache import LRUCache
 from textual.containers import HorizontalGroup, VerticalGroup
+from textual.events import Click
+from textual.geometry import Region, Size
 from textual.message import Message
 from textual.reactive import reactive, var
 from textual.screen import ModalScreen
-from textual.widget import Widget
-from textual.widgets import (
-    Button,
-    Checkbox,
-    Input,
-    Label,
-    OptionList,
-    ProgressBar,
-    Rule,
-)
-from textual.widgets.option_list import Option, OptionDoesNotExist
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.timer import Timer
+from textual.widgets import Button, Checkbox, Input, Label, ProgressBar, Rule
 from textual.worker import Worker, get_current_worker
 
 ##############################################################################
 # Textual enhanced imports.
 from textual_enhanced.dialogs import Confirm
-from textual_enhanced.widgets import EnhancedOptionList
+
+##############################################################################
+# Textual fspicker imports.
+from textual_fspicker import FileOpen
 
 ##############################################################################
 # Local imports.
 from ..data import (
+    Fingerprints,
     Guide,
     Guides,
     SearchHit,
@@ -54,62 +59,121 @@ from ..data import (
     load_configuration,
     update_configuration,
 )
+from ..search import (
+    FuzzyNeedle,
+    GuideFilters,
+    GuideReader,
+    GuideStatistics,
+    InvalidNeedle,
+    Matcher,
+    MultiNeedle,
+    Needle,
+    ParallelSearch,
+    Query,
+    SearchIndex,
+    SearchIndexError,
+    closest_first,
+    might_match,
+    rank,
+    raw_entries,
+    raw_entries_in,
+    scanned_statistics,
+    search_cache,
+    search_entry,
+)
+from ..widgets import PROGRESS_INTERVAL, Counter
 from ..widgets.entry_viewer.entry_content import TextualText
 
-
 ##############################################################################
-class ResultView(Option):
-    """Class for viewing a particular result."""
+LIVE_SEARCH_DELAY: Final[float] = 0.4
+"""How long to wait after the search text changes before a live search."""
 
-    def __init__(self, result: SearchHit) -> None:
-        """Initialise the object.
-
-        Args:
-            result: The result to view.
-        """
-        self._result = result
-        """The result we're viewing."""
-        super().__init__(
-            prompt := Text.from_markup(f"[dim italic]{result.guide.name:<12}[/] ")
-            + TextualText(result.line_source).as_rich_text,
-            id=result.identity,
-        )
-        prompt.no_wrap = True
-
-    @property
-    def result(self) -> SearchHit:
-        """The search result."""
-        return self._result
+##############################################################################
+RENDERED_RESULTS: Final[int] = 1_024
+"""The number of rendered results to keep around."""
 
 
 ##############################################################################
-class SearchResults(EnhancedOptionList):
-    """A widget that shows the search results."""
+class SearchResults(ScrollView, can_focus=True):
+    """A widget that shows the search results.
+
+    The results are held as a plain list of search hits; a result is only
+    turned into something that can be shown when it comes into view, and
+    only the most recently shown results are kept in their rendered form.
+    This means that the display copes with very large numbers of results.
+    """
 
     DEFAULT_CSS = """
     SearchResults {
         height: 1fr;
-        &, &:focus {
-            background: transparent;
-            border: none;
+        overflow-x: hidden;
+        background: transparent;
+        & > .search-results--highlighted {
+            color: $block-cursor-blurred-foreground;
+            background: $block-cursor-blurred-background;
+            text-style: $block-cursor-blurred-text-style;
+        }
+        &:focus > .search-results--highlighted {
+            color: $block-cursor-foreground;
+            background: $block-cursor-background;
+            text-style: $block-cursor-text-style;
         }
     }
     """
 
-    def clear_results(self) -> None:
-        """Clear all the results."""
-        self.clear_options()
-        self.disabled = True
+    COMPONENT_CLASSES = {"search-results--highlighted"}
+
+    BINDINGS = [
+        Binding("down, j, right", "cursor_down", show=False),
+        Binding("up, k, left", "cursor_up", show=False),
+        Binding("home, <", "first", show=False),
+        Binding("end, >", "last", show=False),
+        Binding("pagedown, space", "page_down", show=False),
+        Binding("pageup", "page_up", show=False),
+        Binding("enter", "select", show=False),
+    ]
 
-    def add_result(self, result: SearchHit) -> None:
-        """Add a result to the display.
+    highlighted: reactive[int | None] = reactive(None)
+    """The index of the highlighted result, if there is one."""
+
+    def __init__(
+        self,
+        results: SearchHits | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+        disabled: bool = False,
+    ) -> None:
+        """Initialise the widget.
 
         Args:
-            result: The result to add.
+            results: The results to show.
+            id: The ID of the widget in the DOM.
+            classes: The CSS classes of the widget.
+            disabled: Whether the widget is disabled or not.
         """
-        self.disabled = False
-        with self.preserved_highlight:
-            self.add_option(ResultView(result))
+        super().__init__(id=id, classes=classes, disabled=disabled)
+        self._results = SearchHits()
+        """The results being shown."""
+        self._rendered: LRUCache[int, Text] = LRUCache(RENDERED_RESULTS)
+        """The most recently rendered results."""
+        self.show_results(results or SearchHits())
+
+    def show_results(self, results: SearchHits) -> None:
+        """Show a collection of results.
+
+        Args:
+            results: The results to show.
+
+        Note:
+            The widget keeps hold of `results` rather than a copy of it;
+            any results added with
+            [`add_results`][aging.screens.search.SearchResults.add_results]
+            will be added to `results`.
+        """
+        self._results = results
+        self._rendered.clear()
+        self.highlighted = None
+        self._results_changed()
 
     def add_results(self, results: SearchHits) -> None:
         """Add a collection of results to the display.
@@ -117,9 +181,130 @@ class SearchResults(EnhancedOptionList):
         Args:
             results: The results to add.
         """
-        with self.preserved_highlight:
-            self.add_options(ResultView(result) for result in results)
-        self.disabled = not bool(self.option_count)
+        self._results.extend(results)
+        self._results_changed()
+
+    def _results_changed(self) -> None:
+        """Update the display after the results have changed."""
+        self.virtual_size = Size(
+            self.scrollable_content_region.width, len(self._results)
+        )
+        if self.highlighted is None and self._results:
+            self.highlighted = 0
+        self.disabled = not self._results
+        self.refresh()
+
+    def result_at(self, index: int) -> SearchHit | None:
+        """Get the result at a given position.
+
+        Args:
+            index: The position of the result.
+
+        Returns:
+            The result, or [`None`][None] if there's no result there.
+        """
+        return self._results[index] if 0 <= index < len(self._results) else None
+
+    @staticmethod
+    def _prompt(result: SearchHit) -> Text:
+        """Build the prompt to show for a result.
+
+        Args:
+            result: The result to build the prompt for.
+
+        Returns:
+            The prompt for the result.
+        """
+        prompt = Text.from_markup(f"[dim italic]{result.guide.name:<12}[/] ")
+        if result.needle is not None:
+            prompt.append(result.needle, style="bold").append(" ")
+        prompt += TextualText(result.line_source).as_rich_text
+        prompt.no_wrap = True
+        prompt.end = ""
+        return prompt
+
+    def render_line(self, y: int) -> Strip:
+        """Render a line of the display.
+
+        Args:
+            y: The line to render.
+
+        Returns:
+            The strip for the line.
+        """
+        width = self.scrollable_content_region.width
+        if (index := self.scroll_offset.y + y) >= len(self._results):
+            return Strip.blank(width, self.rich_style)
+        if (prompt := self._rendered.get(index)) is None:
+            prompt = self._rendered[index] = self._prompt(self._results[index])
+        line = Strip(prompt.render(self.app.console)).crop_extend(0, width, None)
+        return line.apply_style(
+            self.get_component_rich_style("search-results--highlighted")
+            if index == self.highlighted
+            else self.rich_style
+        )
+
+    def validate_highlighted(self, highlighted: int | None) -> int | None:
+        """Validate the highlighted result.
+
+        Args:
+            highlighted: The proposed highlighted result.
+
+        Returns:
+            The validated highlighted result.
+        """
+        if highlighted is None or not self._results:
+            return None
+        return min(max(highlighted, 0), len(self._results) - 1)
+
+    def watch_highlighted(self, highlighted: int | None) -> None:
+        """React to the highlighted result changing.
+
+        Args:
+            highlighted: The newly-highlighted result.
+        """
+        if highlighted is not None and self.is_mounted:
+            self.scroll_to_region(
+                Region(0, highlighted, self.scrollable_content_region.width, 1),
+                force=True,
+                animate=False,
+                immediate=True,
+            )
+        self.refresh()
+
+    def on_resize(self) -> None:
+        """Keep the size of the display in step with the widget."""
+        self.virtual_size = Size(
+            self.scrollable_content_region.width, len(self._results)
+        )
+
+    def action_cursor_down(self) -> None:
+        """Move the highlight down."""
+        self.highlighted = 0 if self.highlighted is None else self.highlighted + 1
+
+    def action_cursor_up(self) -> None:
+        """Move the highlight up."""
+        self.highlighted = 0 if self.highlighted is None else self.highlighted - 1
+
+    def action_first(self) -> None:
+        """Move the highlight to the first result."""
+        self.highlighted = 0
+
+    def action_last(self) -> None:
+        """Move the highlight to the last result."""
+        self.highlighted = len(self._results) - 1
+
+    def action_page_down(self) -> None:
+        """Move the highlight down a page."""
+        self.highlighted = (
+            self.highlighted or 0
+        ) + self.scrollable_content_region.height
+
+    def action_page_up(self) -> None:
+        """Move the highlight up a page."""
+        self.highlighted = (
+            self.highlighted or 0
+        ) - self.scrollable_content_region.height
 
     @dataclass
     class JumpToResult(Message):
@@ -127,16 +312,58 @@ class SearchResults(EnhancedOptionList):
 
         hit: SearchHit
         """The hit to jump to."""
+        index: int
+        """The position of the hit within the results."""
+
+    def action_select(self) -> None:
+        """Process a request to jump to the highlighted result."""
+        if self.highlighted is not None:
+            self.post_message(
+                self.JumpToResult(self._results[self.highlighted], self.highlighted)
+            )
+
+    async def _on_click(self, event: Click) -> None:
+        """Jump to a result that has been clicked on.
+
+        Args:
+            event: The click event.
+        """
+        if (offset := event.get_content_offset(self)) is not None and (
+            index := self.scroll_offset.y + offset.y
+        ) < len(self._results):
+            self.highlighted = index
+            self.action_select()
+
+
+##############################################################################
+class SearchedFor(NamedTuple):
+    """The details of a search that has been made."""
+
+    needle: Matcher
+    """What was searched for."""
+    guides: tuple[Path, ...]
+    """The locations of the guides that were searched."""
 
-    @on(OptionList.OptionSelected)
-    def _jump_to_result(self, message: OptionList.OptionSelected) -> None:
-        """Process a request to jump to a result.
+    def narrowed_by(self, search: SearchedFor) -> bool:
+        """Is the given search a narrowing of this search?
 
         Args:
-            message: The message requesting we jump to a result.
+            search: The search to check.
+
+        Returns:
+            [`True`][True] if every hit for the given search must also be a
+            hit for this search, [`False`][False] if not.
         """
-        assert isinstance(message.option, ResultView)
-        self.post_message(self.JumpToResult(message.option.result))
+        # Regular expressions and boolean queries can't be reasoned about
+        # in the same way, so only plain text searches can be narrowed down.
+        return (
+            isinstance(self.needle, Needle)
+            and isinstance(search.needle, Needle)
+            and not (self.needle.regex or search.needle.regex)
+            and self.needle.ignore_case == search.needle.ignore_case
+            and self.guides == search.guides
+            and self.needle.literal in search.needle.literal
+        )
 
 
 ##############################################################################
@@ -147,41 +374,167 @@ class SearchResult(NamedTuple):
     """The results that the result comes from."""
     goto: SearchHit | None = None
     """The search hit that the user wants to go to."""
+    goto_at: int | None = None
+    """The position of the search hit to go to within the results."""
 
 
 ##############################################################################
-class Counter(Widget):
-    """A counter widget."""
+REPORT_INTERVAL: Final[float] = 1 / 20
+"""The longest time, in seconds, to hold on to hits before reporting them."""
 
-    DEFAULT_CSS = """
-    Counter {
-        width: 1fr;
-        height: 1;
-        margin-right: 1;
-        content-align: center middle;
-    }
+##############################################################################
+REPORT_HITS: Final[int] = 1_000
+"""The most hits to hold on to before reporting them."""
+
+
+##############################################################################
+class SearchProgress:
+    """The progress of a search.
+
+    The search keeps this up to date as it goes, which costs next to
+    nothing; the screen looks at it at a fixed rate to show the progress,
+    so the display is only ever updated so often, however quickly the
+    search is going.
+
+    Note:
+        Only the search ever changes the progress, and the screen only
+        ever looks at it; so all that's needed to keep things safe is that
+        each value is set in one go.
     """
 
-    count: reactive[int] = reactive(0)
-    """The count."""
+    def __init__(self, searching: int) -> None:
+        """Initialise the progress.
 
-    def __init__(self, id: str) -> None:
-        """Initialise the widget.
+        Args:
+            searching: The number of guides that will be searched.
+        """
+        self.searching = searching
+        """The number of guides that will be searched."""
+        self.guides = 0
+        """The number of guides that have been, or are being, searched."""
+        self.entries = 0
+        """The number of entries that have been searched."""
+        self.lines = 0
+        """The number of lines that have been searched."""
+        self.hits = 0
+        """The number of hits that have been found."""
+        self.guide: Guide | None = None
+        """The guide being searched, if there is one."""
+        self.guide_size: int | None = None
+        """The size of the guide being searched, if known."""
+        self.position = 0
+        """How far through the guide being searched the search is."""
+        self.current: tuple[NortonGuide, Short | Long] | None = None
+        """The guide and entry most recently searched, if known."""
+        self.finished = False
+        """Has the search of the current guide finished?"""
+
+    def new_guide(self, guide: Guide) -> None:
+        """Record that a new guide is being searched.
 
         Args:
-            id: The ID for the widget.
+            guide: The guide being searched.
         """
-        super().__init__(id=id)
-        self._title = id.title()
-        """The title to show for the counter."""
+        try:
+            self.guide_size = guide.location.stat().st_size
+        except OSError:
+            self.guide_size = None
+        self.position = 0
+        self.current = None
+        self.finished = False
+        self.guide = guide
+        self.guides += 1
 
-    def render(self) -> RenderResult:
-        """Render the content of the counter.
+    def finished_guide(self) -> None:
+        """Record that the search of the current guide has finished."""
+        self.position = self.guide_size or 0
+        self.finished = True
 
-        Returns:
-            A renderable value.
+
+##############################################################################
+class SearchReporter:
+    """Gathers up the hits of a search so they can be reported in batches.
+
+    Posting a message for every hit quickly swamps the application when
+    searching large guides; instead the hits are gathered up here and only
+    reported when enough time has passed, or enough hits have been found.
+    The rest of the progress of the search is recorded as it happens.
+
+    The reporter also keeps track of the number of hits found, so that a
+    search can be limited to the first so-many hits.
+    """
+
+    def __init__(
+        self,
+        matches: Callable[[SearchHits], object],
+        progress: SearchProgress,
+        limit: int = 0,
+    ) -> None:
+        """Initialise the reporter.
+
+        Args:
+            matches: The function to call to report a batch of hits.
+            progress: The progress of the search.
+            limit: The most hits to report; `0` for no limit.
         """
-        return f"[$accent]{self._title}:[/] [dim]{intcomma(self.count)}[/]"
+        self._matches = matches
+        """The function to call to report a batch of hits."""
+        self.progress = progress
+        """The progress of the search."""
+        self._limit = limit
+        """The most hits to report; `0` for no limit."""
+        self._found = 0
+        """The number of hits found so far."""
+        self._hits = SearchHits()
+        """The hits waiting to be reported."""
+        self._last_report = monotonic()
+        """The time of the last report."""
+
+    def searched(
+        self,
+        hits: SearchHits,
+        entries: int = 0,
+        lines: int = 0,
+        current: tuple[NortonGuide, Short | Long] | None = None,
+    ) -> None:
+        """Record some progress in the search.
+
+        Args:
+            hits: The hits that were found.
+            entries: The number of entries that were searched.
+            lines: The number of lines that were searched.
+            current: The guide and entry that were most recently searched.
+
+        Note:
+            Any hits beyond the limit for the search are thrown away.
+        """
+        if self._limit:
+            hits = hits[: max(self._limit - self._found, 0)]
+        self._found += len(hits)
+        self._hits.extend(hits)
+        self.progress.entries += entries
+        self.progress.lines += lines
+        if current is not None:
+            self.progress.current = current
+            self.progress.position = current[1].offset
+        if (
+            len(self._hits) >= REPORT_HITS
+            or monotonic() - self._last_report >= REPORT_INTERVAL
+        ):
+            self.flush()
+
+    @property
+    def full(self) -> bool:
+        """Has the limit on the number of hits been reached?"""
+        return bool(self._limit) and self._found >= self._limit
+
+    def flush(self) -> None:
+        """Report any hits that have yet to be reported."""
+        if self._hits:
+            self._matches(self._hits)
+            self.progress.hits += len(self._hits)
+            self._hits = SearchHits()
+        self._last_report = monotonic()
 
 
 ##############################################################################
@@ -211,6 +564,22 @@ class Search(ModalScreen[SearchResult]):
                     width: 1fr;
                 }
             }
+
+            &> #options, &> #view {
+                padding: 0 1;
+                &> Checkbox {
+                    height: 1;
+                    border: none;
+                    padding: 0;
+                    margin-right: 1;
+                }
+                &> Input {
+                    height: 1;
+                    width: 8;
+                    border: none;
+                    padding: 0 1;
+                }
+            }
         }
 
         Rule {
@@ -255,12 +624,17 @@ class Search(ModalScreen[SearchResult]):
         guide: NortonGuide | None,
         search_hits: SearchHits | None = None,
         last_visited: SearchHit | None = None,
+        last_visited_at: int | None = None,
     ) -> None:
         """Initialise the search screen.
 
         Args:
             guides: All the guides known to the application.
             guide: The current guide.
+            search_hits: The hits of the last search.
+            last_visited: The search hit that was last visited.
+            last_visited_at: The position of the last-visited hit within
+                the hits.
         """
         self._guides = guides
         """All the guides known to the application."""
@@ -270,6 +644,24 @@ class Search(ModalScreen[SearchResult]):
         """The search hits."""
         self._last_visited = last_visited
         """The search hit that was last visited."""
+        self._last_visited_at = last_visited_at
+        """The position of the search hit that was last visited."""
+        self._searching: SearchedFor | None = None
+        """The details of the search that is running, if there is one."""
+        self._last_search: SearchedFor | None = None
+        """The details of the last search to run to completion, if any."""
+        self._live_search: Timer | None = None
+        """The timer for the pending live search, if there is one."""
+        self._results_for: Matcher | None = None
+        """What the results being shown were found for, if known."""
+        self._unranked: SearchHits | None = None
+        """The results in the order they were found, if they've been ranked."""
+        self._progress: SearchProgress | None = None
+        """The progress of the current or most recent search, if there is one."""
+        self._showing_progress: Timer | None = None
+        """The timer that shows the progress of the search."""
+        self._described: tuple[NortonGuide, Short | Long] | None = None
+        """The guide and entry that the current entry label describes."""
         super().__init__()
 
     def compose(self) -> ComposeResult:
@@ -278,16 +670,32 @@ class Search(ModalScreen[SearchResult]):
         with VerticalGroup() as dialog:
             dialog.border_title = "Global Search"
             with HorizontalGroup():
-                yield Input(config.global_search_text, placeholder="Search...")
+                yield Input(
+                    config.global_search_text, placeholder="Search...", id="search_text"
+                )
+                yield Checkbox("Live", config.global_search_live, id="live")
+                yield Button("Load", id="load", classes="--when-stopped")
+                yield Button("Go", variant="primary", id="go", classes="--when-stopped")
+                yield Button(
+                    "Stop", variant="error", id="stop", classes="--when-running"
+                )
+            with HorizontalGroup(id="options"):
                 yield Checkbox(
                     "All Guides", config.global_search_all_guides, id="all_guides"
                 )
                 yield Checkbox(
                     "Ignore Case", config.global_search_ignore_case, id="ignore_case"
                 )
-                yield Button("Go", variant="primary", id="go", classes="--when-stopped")
-                yield Button(
-                    "Stop", variant="error", id="stop", classes="--when-running"
+                yield Checkbox("Regex", config.global_search_regex, id="regex")
+                yield Checkbox("Boolean", config.global_search_boolean, id="boolean")
+                yield Checkbox("List", config.global_search_list, id="list")
+                yield Checkbox("Fuzzy", config.global_search_fuzzy, id="fuzzy")
+                yield Label("First:")
+                yield Input(
+                    str(config.global_search_limit or ""),
+                    placeholder="All",
+                    type="integer",
+                    id="limit",
                 )
             yield Rule(classes="--when-running")
             with HorizontalGroup(classes="--when-running"):
@@ -305,18 +713,28 @@ class Search(ModalScreen[SearchResult]):
             yield Label(id="current_entry", classes="--when-running", markup=False)
             yield ProgressBar(id="guide_progress", classes="--when-running")
             yield Rule()
-            yield SearchResults(disabled=True)
+            with HorizontalGroup(id="view"):
+                yield Checkbox(
+                    "Rank by relevance", config.global_search_ranked, id="ranked"
+                )
+            yield SearchResults(self._search_hits)
 
     def on_mount(self) -> None:
         """Configure the screen once the DOM is mounted."""
-        (results := self.query_one(SearchResults)).add_results(self._search_hits)
-        if self._last_visited is not None:
-            try:
-                results.highlighted = results.get_option_index(
-                    self._last_visited.identity
-                )
-            except OptionDoesNotExist:
-                return
+        self._showing_progress = self.set_interval(
+            PROGRESS_INTERVAL, self._show_progress, pause=not self._search_running
+        )
+        # The position of the last-visited hit is remembered along with the
+        # hit, so there's no need to go looking for it in the results.
+        if (
+            self._last_visited is not None
+            and self._last_visited_at is not None
+            and (results := self.query_one(SearchResults)).result_at(
+                self._last_visited_at
+            )
+            == self._last_visited
+        ):
+            results.highlighted = self._last_visited_at
             results.focus()
 
     def _watch__search_running(self) -> None:
@@ -324,90 +742,77 @@ class Search(ModalScreen[SearchResult]):
         self.set_class(self._search_running, "--running")
         for widget in self.query("Input, Checkbox"):
             widget.disabled = self._search_running
+        if self.query_one("#live", Checkbox).value:
+            # When searching live we need to keep on typing.
+            self.query_one("#search_text", Input).disabled = False
+        if self._showing_progress is not None:
+            if self._search_running:
+                self._showing_progress.resume()
+            else:
+                self._showing_progress.pause()
+                # Make sure that how the search ended up is shown.
+                self._show_progress()
 
-    @dataclass
     class Started(Message):
         """Message sent when a search has started."""
 
-        searching: int
-        """The number of guides we'll be searching."""
-
+    @dataclass
     class Ended(Message):
         """Message sent when the search has ended."""
 
+        truncated: bool = False
+        """Was the search stopped early because it found enough hits?"""
+
     class Cancelled(Message):
         """Message sent when the search has been cancelled."""
 
     @dataclass
-    class NewGuide(Message):
-        """Message sent when a new guide is being searched."""
-
-        guide: Guide
-        """The information about the guide being searched."""
-
-    @dataclass
-    class NewEntry(Message):
-        """Message sent when a new entry is being searched."""
-
-        guide: NortonGuide
-        """The guide being searched."""
-        entry: Short | Long
-        """The entry being searched."""
-
-    @dataclass
-    class FinishedEntry(Message):
-        """Message sent when an entry has been searched."""
+    class MatchesFound(Message):
+        """Message sent when a batch of matches has been found."""
 
-        entry: Short | Long
-        """The entry that was searched."""
+        hits: SearchHits
+        """The details of the matches."""
 
     @dataclass
-    class NewMatch(Message):
-        """Message sent when a new match is found in a guide entry."""
+    class Ranked(Message):
+        """Message sent when the results have been ranked."""
 
-        guide: NortonGuide
-        """The guide being searched."""
-        entry: Short | Long
-        """The entry being searched."""
-        line_number: int
-        """The number of the line where the match was found."""
-        found_line: str
-        """The text of the line that the match was found in."""
-
-    class FinishedGuide(Message):
-        """Message sent when we've finished searching a guide."""
+        results: SearchHits
+        """The results that were ranked."""
+        ranked: SearchHits
+        """The results, ranked by relevance."""
 
     @on(Started)
-    def _search_started(self, starting: Started) -> None:
-        """Handle a search starting.
-
-        Args:
-            starting: The message that signals that a search has started.
-        """
+    def _search_started(self) -> None:
+        """Handle a search starting."""
         self._search_running = True
-        self.query_one("#guides_progress", ProgressBar).total = starting.searching
 
     @on(Ended)
     @on(Cancelled)
-    def _search_ended(self) -> None:
-        """Handle the search ending."""
-        self._search_running = False
-
-    @on(NewGuide)
-    def _update_current_guide(self, current: NewGuide) -> None:
-        """Handle the a new guide being searched.
+    def _search_ended(self, ended: Ended | Cancelled) -> None:
+        """Handle the search ending.
 
         Args:
-            current: The message that signals that a new guide is being searched.
+            ended: The message that signals that the search has ended.
         """
-        self.query_one("#guides", Counter).count += 1
-        self.query_one("#current_guide", Label).update(
-            f"Searching {current.guide.title}"
+        # A search that stopped early can't be narrowed down later, as it
+        # won't have found every hit.
+        self._last_search = (
+            self._searching
+            if isinstance(ended, self.Ended) and not ended.truncated
+            else None
         )
-        self.query_one("#guides_progress", ProgressBar).progress += 1
-        self.query_one(
-            "#guide_progress", ProgressBar
-        ).total = current.guide.location.stat().st_size
+        self._searching = None
+        self._search_running = False
+        if not isinstance(ended, self.Ended):
+            return
+        # The hits of a fuzzy search are found in the order of the guides,
+        # but are shown with the closest matches first.
+        if isinstance(self._results_for, FuzzyNeedle) and self._search_hits:
+            self._search_hits[:] = closest_first(self._search_hits, self._results_for)
+            self.query_one(SearchResults).show_results(self._search_hits)
+        if self.query_one("#ranked", Checkbox).value:
+            self._rank()
 
     def _entry_description(
         self, guide: NortonGuide, entry: Short | Long
@@ -434,140 +839,493 @@ class Search(ModalScreen[SearchResult]):
         ):
             yield make_dos_like(str(PlainText(first_non_empty_line)))
 
-    @on(NewEntry)
-    def _update_current_entry(self, current: NewEntry) -> None:
-        """Handle a new entry being searched.
+    def _show_text(self, label: str, text: str) -> None:
+        """Show some text in a label, unless it's already showing it.
 
         Args:
-            current: The message that signals a new entry is being searched.
+            label: The ID of the label.
+            text: The text to show.
         """
-        self.query_one("#entries", Counter).count += 1
-        self.query_one("#current_entry", Label).update(
-            " » ".join(self._entry_description(current.guide, current.entry))
+        if (widget := self.query_one(label, Label)).content != text:
+            widget.update(text)
+
+    def _show_progress(self) -> None:
+        """Show the progress of the search."""
+        if (progress := self._progress) is None:
+            return
+        self.query_one("#guides", Counter).count = progress.guides
+        self.query_one("#entries", Counter).count = progress.entries
+        self.query_one("#lines", Counter).count = progress.lines
+        self.query_one("#hits", Counter).count = progress.hits
+        self.query_one("#guides_progress", ProgressBar).update(
+            total=progress.searching, progress=progress.guides
+        )
+        if (guide := progress.guide) is not None:
+            self._show_text("#current_guide", f"Searching {guide.title}")
+        if progress.finished:
+            self._show_text("#current_entry", "Finished")
+            self._described = None
+        elif (
+            current := progress.current
+        ) is not None and current is not self._described:
+            self._show_text(
+                "#current_entry", " » ".join(self._entry_description(*current))
+            )
+            self._described = current
+        self.query_one("#guide_progress", ProgressBar).update(
+            total=progress.guide_size, progress=progress.position
         )
-        self.query_one("#guide_progress", ProgressBar).progress = current.entry.offset
 
-    @on(FinishedEntry)
-    def _update_after_entry_searched(self, finished: FinishedEntry) -> None:
-        """Handle the search of an entry finishing.
+    @on(MatchesFound)
+    def _matches_found(self, found: MatchesFound) -> None:
+        """Handle a batch of matches being found.
 
         Args:
-            finished: The message that signals an entry has been searched.
+            found: The message that signals matches were found.
         """
-        self.query_one("#lines", Counter).count += len(finished.entry)
+        # Note that the results widget shares our list of hits, so this
+        # adds to it too.
+        self.query_one(SearchResults).add_results(found.hits)
 
-    @on(NewMatch)
-    def _new_match_found(self, match: NewMatch) -> None:
-        """Handle a new match being found.
+    def _search_guide(
+        self,
+        guide: Guide,
+        worker: Worker[None],
+        reporter: SearchReporter,
+        needle: Matcher,
+        reader: GuideReader | None = None,
+    ) -> bool:
+        """Search within the given guide.
 
         Args:
-            match: The message that signals a match was found.
+            guide: The guide being searched.
+            worker: The worker that we're working within.
+            reporter: The reporter for the progress of the search.
+            needle: What to search for.
+            reader: Optional reader that is reading the guide ahead.
+
+        Returns:
+            [`True`][True] if the guide was searched, [`False`][False] if
+            not.
         """
-        self.query_one("#hits", Counter).count += 1
-        self._search_hits.append(
-            SearchHit(
-                match.guide.path,
-                match.entry.offset,
-                match.line_number,
-                match.found_line,
+        try:
+            with NortonGuide(guide.location) as search:
+                for raw in (
+                    raw_entries_in(
+                        reader.chunks(guide.location, lambda: worker.is_cancelled)
+                    )
+                    if reader is not None and guide.location in reader
+                    else raw_entries(search)
+                ):
+                    if worker.is_cancelled:
+                        return False
+                    if reporter.full:
+                        break
+                    if might_match(raw, needle):
+                        entry = search.goto(raw.offset).load()
+                        reporter.searched(
+                            search_entry(guide.location, entry, needle),
+                            1,
+                            raw.lines,
+                            (search, entry),
+                        )
+                    else:
+                        reporter.searched(SearchHits(), 1, raw.lines)
+            reporter.flush()
+            reporter.progress.finished_guide()
+        except (OSError, NGDBError) as error:
+            self.notify(
+                str(error), title=f"Failed to search {guide.location}", severity="error"
             )
-        )
-        self.query_one(SearchResults).add_result(self._search_hits[-1])
-
-    @on(FinishedGuide)
-    def _finished_guide(self) -> None:
-        """Handle a guide search finishing."""
-        self.query_one("#current_entry", Label).update("Finished")
-        if (total := self.query_one("#guide_progress", ProgressBar).total) is not None:
-            self.query_one("#guide_progress", ProgressBar).progress = total
+            return False
+        return not worker.is_cancelled
 
-    def _search_entry(
+    def _search_in_parallel(
         self,
-        guide: NortonGuide,
-        entry: Long | Short,
+        search: ParallelSearch,
+        guide: Guide,
         worker: Worker[None],
-        needle: str,
-        ignore_case: bool,
-    ) -> None:
-        """Search within an entry.
+        reporter: SearchReporter,
+    ) -> bool:
+        """Collect the results of searching a guide in parallel.
 
         Args:
-            entry: The entry to search.
+            search: The parallel search the guide was submitted to.
+            guide: The guide being searched.
             worker: The worker that we're working within.
-            needle: The text to search for.
-            ignore_case: Should case be ignored?
+            reporter: The reporter for the progress of the search.
+
+        Returns:
+            [`True`][True] if the whole guide was searched, [`False`][False]
+            if not.
         """
-        self.post_message(self.NewEntry(guide, entry))
-        for line_number, line in enumerate(entry):
-            if worker.is_cancelled:
-                return
-            haystack = str(PlainText(str(line)))
-            if ignore_case:
-                haystack = haystack.casefold()
-            if needle in haystack:
-                self.post_message(self.NewMatch(guide, entry, line_number, str(line)))
-        self.post_message(self.FinishedEntry(entry))
+        try:
+            for result in search.results(guide.location, lambda: worker.is_cancelled):
+                reporter.searched(result.hits, result.entries, result.lines)
+                if reporter.full:
+                    break
+            reporter.flush()
+            reporter.progress.finished_guide()
+        except (OSError, NGDBError, BrokenProcessPool) as error:
+            self.notify(
+                str(error), title=f"Failed to search {guide.location}", severity="error"
+            )
+            return False
+        return not worker.is_cancelled
 
-    def _search_guide(
-        self, guide: Guide, worker: Worker[None], needle: str, ignore_case: bool
-    ) -> None:
-        """Search within the given guide.
+    def _search_index(
+        self,
+        index: SearchIndex,
+        guide: Guide,
+        reporter: SearchReporter,
+        needle: Matcher,
+    ) -> bool:
+        """Search for a guide within the search index.
 
         Args:
+            index: The search index.
             guide: The guide being searched.
-            worker: The worker that we're working within.
-            needle: The text to search for.
-            ignore_case: Should case be ignored?
+            reporter: The reporter for the progress of the search.
+            needle: What to search for.
+
+        Returns:
+            [`True`][True] if the guide was searched, [`False`][False] if
+            the index couldn't be used and the guide needs to be searched
+            some other way.
         """
         try:
-            with NortonGuide(guide.location) as search:
-                for entry in search:
-                    if worker.is_cancelled:
-                        return
-                    self._search_entry(search, entry, worker, needle, ignore_case)
-            self.post_message(self.FinishedGuide())
-        except (OSError, NGDBError) as error:
-            self.notify(
-                str(error), title=f"Failed to search {guide.location}", severity="error"
+            hits = SearchHits(index.search(guide.location, needle))
+        except SearchIndexError:
+            return False
+        reporter.searched(hits)
+        reporter.flush()
+        reporter.progress.finished_guide()
+        return True
+
+    def _refine(
+        self,
+        hits: SearchHits,
+        worker: Worker[None],
+        reporter: SearchReporter,
+        needle: Needle,
+    ) -> bool:
+        """Refine the hits of an earlier search.
+
+        Args:
+            hits: The hits to refine.
+            worker: The worker that we're working within.
+            reporter: The reporter for the progress of the search.
+            needle: What to search for.
+
+        Returns:
+            [`True`][True] if all of the hits were refined, [`False`][False]
+            if not.
+        """
+        for hit in hits:
+            if worker.is_cancelled:
+                return False
+            if reporter.full:
+                break
+            reporter.searched(
+                SearchHits(
+                    [hit] if needle.found_in(str(PlainText(hit.line_source))) else ()
+                ),
+                lines=1,
             )
+        reporter.flush()
+        return True
+
+    @staticmethod
+    def _ruled_out(guides: Guides, needle: Matcher) -> set[Path]:
+        """Find the guides that can't hold a hit.
+
+        Args:
+            guides: The guides to check.
+            needle: What is being searched for.
+
+        Returns:
+            The locations of the guides whose filters show that they can't
+            hold a hit.
+        """
+        filters = GuideFilters()
+        return {
+            guide.location
+            for guide in guides
+            if (guide_filter := filters.get(guide.location)) is not None
+            and not needle.might_be_found(guide_filter.might_contain)
+        }
+
+    @staticmethod
+    def _likely_first(guides: Guides, needle: Matcher, ruled_out: set[Path]) -> Guides:
+        """Sort the guides so those most likely to hold hits come first.
+
+        Args:
+            guides: The guides to sort.
+            needle: What is being searched for.
+            ruled_out: The locations of the guides that can't hold a hit.
+
+        Returns:
+            The guides, with those whose titles match first, then those
+            whose credits match, then the rest, and finally those that
+            can't hold a hit.
+
+        Note:
+            None of the guides are read to decide how likely they are to
+            hold hits; the title each guide was added with is checked, and
+            the title and credits the search index holds for it, if it's
+            been indexed.
+        """
+        try:
+            with SearchIndex(read_only=True) as index:
+                described = index.titles_and_credits()
+        except SearchIndexError:
+            described = {}
+
+        def likelihood(guide: Guide) -> int:
+            """Get how likely it is that a guide holds hits.
+
+            Args:
+                guide: The guide to check.
+
+            Returns:
+                A value that sorts the most likely guides first.
+            """
+            if guide.location in ruled_out:
+                return 3
+            if needle.might_be_in(guide.title):
+                return 0
+            if (indexed := described.get(guide.location.absolute())) is None:
+                return 2
+            title, credits = indexed
+            if needle.might_be_in(title):
+                return 0
+            if needle.might_be_in(credits):
+                return 1
+            return 2
+
+        return sorted(guides, key=lambda guide: (likelihood(guide), guide))
 
     @work(thread=True, exclusive=True, group="search")
-    def _search(self, guides: Guides, needle: str, ignore_case: bool) -> None:
+    def _search(
+        self,
+        guides: Guides,
+        needle: Matcher,
+        refine: SearchHits | None = None,
+        limit: int = 0,
+    ) -> None:
         """Start a new search.
 
         Args:
             guides: The guides to search.
-            needle: The text to search for.
-            ignore_case: Should case be ignored?
+            needle: What to search for.
+            refine: Optional hits of an earlier search to refine.
+            limit: The most hits to find; `0` for no limit.
+
+        Note:
+            If `refine` is provided, the search must be a narrowing of the
+            search that produced those hits; rather than searching the
+            guides again the hits will be filtered.
+
+            If there is a limit, the guides most likely to hold hits are
+            searched first, and the search stops as soon as enough hits
+            have been found.
         """
         worker = get_current_worker()
-        needle = needle.casefold() if ignore_case else needle
-        self.query_one("#guides_progress", ProgressBar).progress = 0
-        for counter in self.query(Counter):
-            counter.count = 0
-        self.post_message(self.Started(len(guides)))
-        for guide in sorted(guides):
-            if worker.is_cancelled:
+        self._progress = progress = SearchProgress(len(guides))
+        self.post_message(self.Started())
+        # If there's a limit, the guides that can't hold a hit need to be
+        # known now, so that the most likely guides can be searched first.
+        ruled_out = self._ruled_out(guides, needle) if limit else None
+        guides = (
+            self._likely_first(guides, needle, ruled_out)
+            if ruled_out is not None
+            else sorted(guides)
+        )
+        if worker.is_cancelled:
+            self.post_message(self.Cancelled())
+            return
+        order = {guide.location: position for position, guide in enumerate(guides)}
+        found = SearchHits()
+
+        def matches_found(hits: SearchHits) -> None:
+            """Keep track of, and report, hits that have been found.
+
+            Args:
+                hits: The hits that were found.
+            """
+            found.extend(hits)
+            self.post_message(self.MatchesFound(hits))
+
+        reporter = SearchReporter(matches_found, progress, limit)
+
+        # If we've done this exact search before, and none of the guides
+        # have changed since, we can just use the results from last time.
+        fingerprints = Fingerprints()
+        current = {
+            guide.location: fingerprints.current(guide.location) for guide in guides
+        }
+        try:
+            fingerprints.save()
+        except OSError:
+            pass
+        cacheable = [
+            fingerprint for fingerprint in current.values() if fingerprint is not None
+        ]
+        if (
+            len(cacheable) == len(guides)
+            and (cached := search_cache().get(needle, cacheable)) is not None
+        ):
+            progress.guides = len(guides)
+            reporter.searched(
+                SearchHits(sorted(cached, key=lambda hit: order[hit.guide]))
+            )
+            reporter.flush()
+            self.post_message(self.Ended(reporter.full))
+            return
+        complete = len(cacheable) == len(guides)
+
+        # If this search narrows down the last one, every hit we're looking
+        # for has already been found; so we just need to filter them.
+        if refine is not None and isinstance(needle, Needle):
+            progress.guides = len(guides)
+            if self._refine(
+                SearchHits(
+                    sorted(
+                        refine,
+                        key=lambda hit: (
+                            order[hit.guide],
+                            hit.entry_offset,
+                            hit.entry_line,
+                        ),
+                    )
+                ),
+                worker,
+                reporter,
+                needle,
+            ):
+                if complete and not reporter.full:
+                    search_cache().put(needle, cacheable, found)
+                self.post_message(self.Ended(reporter.full))
+            else:
                 self.post_message(self.Cancelled())
-                return
-            self.post_message(self.NewGuide(guide))
-            self._search_guide(guide, worker, needle, ignore_case)
-        self.post_message(self.Ended())
+            return
+
+        with ExitStack() as resources:
+            # Work out which guides can be answered from the search index.
+            try:
+                index: SearchIndex | None = resources.enter_context(
+                    SearchIndex(read_only=True)
+                )
+                indexed = {
+                    location
+                    for location, fingerprint in current.items()
+                    if fingerprint is not None
+                    and index is not None
+                    and index.is_current(fingerprint)
+                }
+            except SearchIndexError:
+                index, indexed = None, set()
+
+            # Any guide whose filter shows that it can't hold a hit can be
+            # skipped without even being opened.
+            if ruled_out is None:
+                ruled_out = self._ruled_out(guides, needle)
+
+            # If we're searching in parallel, let the processes know which
+            # of the guides need scanning; otherwise get the guides that
+            # need scanning read ahead of scanning them.
+            parallel: ParallelSearch | None = None
+            reader: GuideReader | None = None
+            configuration = load_configuration()
+            if (jobs := configuration.global_search_jobs) == 1:
+                if configuration.global_search_read_ahead > 0:
+                    reader = resources.enter_context(
+                        GuideReader(
+                            [
+                                guide.location
+                                for guide in guides
+                                if guide.location not in indexed | ruled_out
+                            ],
+                            configuration.global_search_read_ahead,
+                        )
+                    )
+            else:
+                parallel = resources.enter_context(ParallelSearch(needle, jobs or None))
+                for guide in guides:
+                    if guide.location not in indexed | ruled_out:
+                        parallel.submit(guide.location)
+
+            # Now collect the results, in guide order.
+            for guide in guides:
+                if worker.is_cancelled:
+                    reporter.flush()
+                    self.post_message(self.Cancelled())
+                    return
+                if reporter.full:
+                    break
+                progress.new_guide(guide)
+                if guide.location in ruled_out:
+                    progress.finished_guide()
+                    continue
+                if (
+                    index is not None
+                    and guide.location in indexed
+                    and self._search_index(index, guide, reporter, needle)
+                ):
+                    continue
+                if parallel is not None and guide.location not in indexed:
+                    searched = self._search_in_parallel(
+                        parallel, guide, worker, reporter
+                    )
+                else:
+                    searched = self._search_guide(
+                        guide, worker, reporter, needle, reader
+                    )
+                complete = complete and searched
+        reporter.flush()
+        if worker.is_cancelled:
+            self.post_message(self.Cancelled())
+            return
+        if complete and not reporter.full:
+            search_cache().put(needle, cacheable, found)
+        self.post_message(self.Ended(reporter.full))
 
     @on(Input.Submitted)
     @on(Button.Pressed, "#go")
     def search(self) -> None:
         """React to a request to start a search."""
+        if self._search_running:
+            # There's a search still running, most likely because we're
+            # searching live; stop it and try again once it has stopped.
+            self.stop_search()
+            self._queue_live_search()
+            return
+        try:
+            limit = max(int(self.query_one("#limit", Input).value or 0), 0)
+        except ValueError:
+            limit = 0
         with update_configuration() as config:
             search_text = config.global_search_text = self.query_one(
-                Input
+                "#search_text", Input
             ).value.strip()
+            config.global_search_limit = limit
             all_guides = config.global_search_all_guides = self.query_one(
                 "#all_guides", Checkbox
             ).value
             ignore_case = config.global_search_ignore_case = self.query_one(
                 "#ignore_case", Checkbox
             ).value
+            regex = config.global_search_regex = self.query_one(
+                "#regex", Checkbox
+            ).value
+            boolean = config.global_search_boolean = self.query_one(
+                "#boolean", Checkbox
+            ).value
+            listed = config.global_search_list = self.query_one("#list", Checkbox).value
+            fuzzy = config.global_search_fuzzy = self.query_one(
+                "#fuzzy", Checkbox
+            ).value
+            config.global_search_live = self.query_one("#live", Checkbox).value
         if not search_text:
             self.notify(
                 "Please provide something to search for",
@@ -575,6 +1333,26 @@ class Search(ModalScreen[SearchResult]):
                 severity="error",
             )
             return
+        try:
+            if boolean and listed:
+                raise InvalidNeedle("A boolean query can't also be a list of needles")
+            if fuzzy and (boolean or listed):
+                raise InvalidNeedle(
+                    "A fuzzy search can't also be a boolean query or a list of needles"
+                )
+            kind: type[Matcher] = (
+                MultiNeedle
+                if listed
+                else Query
+                if boolean
+                else FuzzyNeedle
+                if fuzzy
+                else Needle
+            )
+            needle = kind(search_text, ignore_case, regex)
+        except InvalidNeedle as error:
+            self.notify(str(error), title="Invalid search", severity="error")
+            return
         guides = self._guides
         if not all_guides:
             if self._guide is None:
@@ -585,14 +1363,147 @@ class Search(ModalScreen[SearchResult]):
                 )
                 return
             guides = [Guide(self._guide.title, self._guide.path)]
-        self._search_hits = []
-        self.query_one(SearchResults).clear_results()
+        searching = SearchedFor(
+            needle, tuple(sorted(guide.location for guide in guides))
+        )
+        refine = (
+            self._search_hits
+            if self._last_search is not None
+            and self._last_search.narrowed_by(searching)
+            else None
+        )
+        self._searching = searching
+        self._last_search = None
+        self._results_for = needle
+        self._unranked = None
+        self._search_hits = SearchHits()
+        self.query_one(SearchResults).show_results(self._search_hits)
         self.set_class(len(guides) == 1, "--running-locally")
-        self._search(
-            guides,
-            search_text,
-            ignore_case,
+        # Mark the search as running now, rather than when the worker gets
+        # going, so that another search can't be started in the meantime.
+        self._search_running = True
+        self._search(guides, needle, refine, limit)
+
+    @work(thread=True, exclusive=True, group="rank")
+    def _rank(self) -> None:
+        """Rank the results by relevance."""
+        if (needle := self._results_for) is None or not self._search_hits:
+            return
+        results = self._search_hits
+        fingerprints = Fingerprints()
+        with ExitStack() as resources:
+            try:
+                index: SearchIndex | None = resources.enter_context(
+                    SearchIndex(read_only=True)
+                )
+            except SearchIndexError:
+                index = None
+
+            def statistics(guide: Path, entries: Collection[int]) -> GuideStatistics:
+                """Get the statistics for a guide.
+
+                Args:
+                    guide: The location of the guide.
+                    entries: The offsets of the entries to describe.
+
+                Returns:
+                    The statistics for the guide.
+                """
+                # The index already knows all about the guide, if it's up to
+                # date; only if it isn't do we need to go and look.
+                if (
+                    index is not None
+                    and (fingerprint := fingerprints.current(guide)) is not None
+                    and index.is_current(fingerprint)
+                    and (known := index.statistics(guide, entries)) is not None
+                ):
+                    return known
+                return scanned_statistics(guide, entries)
+
+            try:
+                ranked = rank(results.copy(), needle, statistics)
+            except (OSError, NGDBError, SearchIndexError) as error:
+                self.notify(
+                    str(error), title="Failed to rank the results", severity="error"
+                )
+                return
+        self.post_message(self.Ranked(results, ranked))
+
+    @on(Ranked)
+    def _show_ranked(self, ranked: Ranked) -> None:
+        """Show the results once they have been ranked.
+
+        Args:
+            ranked: The message that carries the ranked results.
+        """
+        # Only show the ranking if the results haven't changed in the
+        # meantime, and it's still wanted.
+        if (
+            ranked.results is self._search_hits
+            and not self._search_running
+            and self.query_one("#ranked", Checkbox).value
+        ):
+            if self._unranked is None:
+                self._unranked = self._search_hits.copy()
+            self._search_hits[:] = ranked.ranked
+            self.query_one(SearchResults).show_results(self._search_hits)
+
+    @on(Checkbox.Changed, "#ranked")
+    def _ranking_changed(self) -> None:
+        """React to the ranking of the results being turned on or off."""
+        with update_configuration() as config:
+            config.global_search_ranked = self.query_one("#ranked", Checkbox).value
+        if self._search_running:
+            return
+        if config.global_search_ranked:
+            self._rank()
+        elif self._unranked is not None:
+            self._search_hits[:] = self._unranked
+            self._unranked = None
+            self.query_one(SearchResults).show_results(self._search_hits)
+
+    @on(Button.Pressed, "#load")
+    @work
+    async def load_needles(self) -> None:
+        """Load a list of needles to search for from a file."""
+        if (
+            source := await self.app.push_screen_wait(
+                FileOpen(Path(load_configuration().global_search_list_from))
+            )
+        ) is None:
+            return
+        try:
+            needles = source.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError) as error:
+            self.notify(str(error), title=f"Failed to load {source}", severity="error")
+            return
+        with update_configuration() as config:
+            config.global_search_list_from = str(source.parent)
+        self.query_one("#search_text", Input).value = ", ".join(
+            needle for needle in (needle.strip() for needle in needles) if needle
         )
+        self.query_one("#list", Checkbox).value = True
+
+    def _queue_live_search(self) -> None:
+        """Queue up a live search, replacing any that is already queued."""
+        if self._live_search is not None:
+            self._live_search.stop()
+        self._live_search = self.set_timer(LIVE_SEARCH_DELAY, self._run_live_search)
+
+    def _run_live_search(self) -> None:
+        """Run a queued live search."""
+        self._live_search = None
+        if self.query_one("#search_text", Input).value.strip():
+            self.search()
+
+    @on(Input.Changed, "#search_text")
+    def _search_text_changed(self) -> None:
+        """React to the search text changing."""
+        if (
+            self.query_one("#live", Checkbox).value
+            and self.query_one("#search_text", Input).has_focus
+        ):
+            self._queue_live_search()
 
     @on(Button.Pressed, "#stop")
     def stop_search(self) -> None:
@@ -626,7 +1537,7 @@ class Search(ModalScreen[SearchResult]):
             )
         ):
             return
-        self.dismiss(SearchResult(self._search_hits, message.hit))
+        self.dismiss(SearchResult(self._search_hits, message.hit, message.index))
 
 
 ### search.py ends here
@@ -0,0 +1,59 @@
+"""Provides the code that searches the guides."""
+
+##############################################################################
+# Local imports.
+from .cache import ResultCache, search_cache
+from .filters import GuideFilters
+from .fuzzy import FuzzyNeedle
+from .headless import stream_search
+from .index import SearchIndex, SearchIndexError
+from .matcher import Matcher
+from .multi_needle import MultiNeedle
+from .needle import InvalidNeedle, Needle
+from .parallel import ParallelSearch
+from .query import Query
+from .ranking import GuideStatistics, closest_first, rank, scanned_statistics
+from .reader import GuideReader
+from .scanner import (
+    RawEntry,
+    ScanResult,
+    entries,
+    might_match,
+    raw_entries,
+    raw_entries_in,
+    search_entry,
+    search_range,
+)
+
+##############################################################################
+# Exports.
+__all__ = [
+    "FuzzyNeedle",
+    "GuideFilters",
+    "GuideReader",
+    "GuideStatistics",
+    "InvalidNeedle",
+    "Matcher",
+    "MultiNeedle",
+    "Needle",
+    "ParallelSearch",
+    "Query",
+    "RawEntry",
+    "ResultCache",
+    "ScanResult",
+    "SearchIndex",
+    "SearchIndexError",
+    "closest_first",
+    "entries",
+    "might_match",
+    "rank",
+    "raw_entries",
+    "raw_entries_in",
+    "scanned_statistics",
+    "search_cache",
+    "search_entry",
+    "search_range",
+    "stream_search",
+]
+
+### __init__.py ends here
@@ -0,0 +1,330 @@
+"""Provides a cache of the results of global searches."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import cache
+from hashlib import blake2b
+from json import dumps, loads
+from os import utime
+from pathlib import Path
+from struct import Struct
+from struct import error as StructError
+from threading import Lock
+from typing import Final, NamedTuple, TypeAlias
+
+##############################################################################
+# Local imports.
+from ..data import Fingerprint, SearchHits, load_configuration
+from ..data.locations import data_dir
+from .fuzzy import FuzzyNeedle
+from .matcher import Matcher
+from .multi_needle import MultiNeedle
+from .needle import InvalidNeedle, Needle
+from .query import Query
+
+##############################################################################
+CacheKey: TypeAlias = tuple[str, str, bool, bool, tuple[Path, ...]]
+"""The type of the key for a cached search."""
+
+##############################################################################
+KINDS: Final[dict[str, type[Matcher]]] = {
+    kind.__name__: kind for kind in (Needle, Query, MultiNeedle, FuzzyNeedle)
+}
+"""The kinds of search that can be cached, keyed by their names."""
+
+##############################################################################
+HEADER: Final = Struct("<I")
+"""The layout of the header of the file of a cached result.
+
+This holds the length of the description of the search that follows the
+header; the hits themselves follow the description.
+"""
+
+
+##############################################################################
+class CachedResult(NamedTuple):
+    """The cached result of a search."""
+
+    fingerprints: tuple[Fingerprint, ...]
+    """The fingerprints of the guides at the time they were searched."""
+    hits: SearchHits
+    """The hits that were found."""
+
+
+##############################################################################
+def cache_dir() -> Path:
+    """The path to the directory that holds the cached search results.
+
+    Returns:
+        The path to the search cache directory.
+    """
+    (results := data_dir() / "search-cache").mkdir(parents=True, exist_ok=True)
+    return results
+
+
+##############################################################################
+def _remove(result: Path) -> None:
+    """Remove the file of a cached result, if it can be removed.
+
+    Args:
+        result: The location of the file.
+    """
+    try:
+        result.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+##############################################################################
+class ResultCache:
+    """A least-recently-used cache of the results of global searches.
+
+    A search is identified by the kind of search, the text that was
+    searched for, if case was ignored, if it was a regular expression, and
+    the guides that were searched. Alongside the hits, the
+    fingerprints of the guides are held; if any of the guides have changed
+    since they were searched the cached result is thrown away.
+
+    If the cache is persisted, each result is held in its own file, so
+    only the results that are added or removed need writing or deleting.
+    The modification time of each file records when the result was last
+    used.
+    """
+
+    def __init__(self, size: int, location: Path | None = None) -> None:
+        """Initialise the cache.
+
+        Args:
+            size: The maximum number of searches to hold in the cache.
+            location: Optional location of a directory to persist the cache to.
+        """
+        self._size = size
+        """The maximum number of searches to hold in the cache."""
+        self._location = location
+        """The location of the directory to persist the cache to, if any."""
+        self._results: OrderedDict[CacheKey, CachedResult] = OrderedDict()
+        """The cached results, from least to most recently used."""
+        self._lock = Lock()
+        """Lock to guard access to the cache."""
+        if location is not None:
+            self._load(location)
+
+    @staticmethod
+    def _key(needle: Matcher, fingerprints: Sequence[Fingerprint]) -> CacheKey:
+        """Get the key for a search.
+
+        Args:
+            needle: What was searched for.
+            fingerprints: The fingerprints of the guides that were searched.
+
+        Returns:
+            The key for the search.
+
+        Note:
+            Only a plain needle that ignores case has its text casefolded;
+            the hits of the other kinds of search can show the text of the
+            needle as it was given, so they can only be shared by searches
+            for exactly the same text.
+        """
+        return (
+            type(needle).__name__,
+            needle.text.casefold()
+            if isinstance(needle, Needle) and needle.ignore_case and not needle.regex
+            else needle.text,
+            needle.ignore_case,
+            needle.regex,
+            tuple(fingerprint.location for fingerprint in fingerprints),
+        )
+
+    def get(
+        self, needle: Matcher, fingerprints: Sequence[Fingerprint]
+    ) -> SearchHits | None:
+        """Get the cached result of a search.
+
+        Args:
+            needle: What is being searched for.
+            fingerprints: The current fingerprints of the guides being
+                searched, in the order they're searched.
+
+        Returns:
+            The hits for the search, or [`None`][None] if there is no
+            usable cached result.
+        """
+        key = self._key(needle, fingerprints)
+        with self._lock:
+            if (cached := self._results.get(key)) is None:
+                return None
+            if cached.fingerprints != tuple(fingerprints):
+                # One or more of the guides has changed since the search,
+                # so the result is no good any more.
+                del self._results[key]
+                self._forget(key)
+                return None
+            self._results.move_to_end(key)
+            self._touch(key)
+            return SearchHits(cached.hits)
+
+    def put(
+        self, needle: Matcher, fingerprints: Sequence[Fingerprint], hits: SearchHits
+    ) -> None:
+        """Add the result of a search to the cache.
+
+        Args:
+            needle: What was searched for.
+            fingerprints: The fingerprints of the guides that were searched,
+                in the order they were searched.
+            hits: The hits that were found.
+        """
+        if self._size < 1:
+            return
+        key = self._key(needle, fingerprints)
+        with self._lock:
+            self._results[key] = cached = CachedResult(
+                tuple(fingerprints), SearchHits(hits)
+            )
+            self._results.move_to_end(key)
+            self._store(key, cached)
+            while len(self._results) > self._size:
+                self._forget(self._results.popitem(last=False)[0])
+
+    def _file(self, key: CacheKey) -> Path | None:
+        """Get the file that holds a cached result.
+
+        Args:
+            key: The key for the search.
+
+        Returns:
+            The location of the result's file, or [`None`][None] if the
+            cache isn't being persisted.
+        """
+        if self._location is None:
+            return None
+        return (
+            self._location
+            / f"{blake2b(repr(key).encode(), digest_size=16).hexdigest()}.bin"
+        )
+
+    def _load(self, location: Path) -> None:
+        """Load the cache from storage.
+
+        Args:
+            location: The location of the directory to load from.
+
+        Note:
+            The results are loaded from least to most recently used; any
+            results beyond the size of the cache are removed.
+        """
+        try:
+            files = sorted(
+                location.glob("*.bin"), key=lambda result: result.stat().st_mtime_ns
+            )
+        except OSError:
+            return
+        for stale in files[: max(len(files) - self._size, 0)]:
+            _remove(stale)
+        for result in files[-self._size :] if self._size > 0 else []:
+            try:
+                data = result.read_bytes()
+                (length,) = HEADER.unpack_from(data)
+                description = loads(data[HEADER.size : HEADER.size + length])
+                fingerprints = tuple(
+                    Fingerprint.from_json(fingerprint)
+                    for fingerprint in description["fingerprints"]
+                )
+                key = self._key(
+                    KINDS[description.get("kind", Needle.__name__)](
+                        description["needle"],
+                        description["ignore_case"],
+                        description.get("regex", False),
+                    ),
+                    fingerprints,
+                )
+                self._results[key] = CachedResult(
+                    fingerprints, SearchHits.from_bytes(data[HEADER.size + length :])
+                )
+            except (
+                OSError,
+                ValueError,
+                StructError,
+                KeyError,
+                TypeError,
+                InvalidNeedle,
+            ):
+                _remove(result)
+
+    def _store(self, key: CacheKey, cached: CachedResult) -> None:
+        """Save a cached result to storage, if the cache is being persisted.
+
+        Args:
+            key: The key for the search.
+            cached: The cached result.
+        """
+        if (result := self._file(key)) is None:
+            return
+        kind, needle, ignore_case, regex, _ = key
+        description = dumps(
+            {
+                "kind": kind,
+                "needle": needle,
+                "ignore_case": ignore_case,
+                "regex": regex,
+                "fingerprints": [
+                    fingerprint.as_json for fingerprint in cached.fingerprints
+                ],
+            }
+        ).encode("utf-8")
+        try:
+            result.write_bytes(
+                HEADER.pack(len(description)) + description + cached.hits.to_bytes()
+            )
+        except OSError:
+            pass
+
+    def _touch(self, key: CacheKey) -> None:
+        """Record that a cached result has just been used.
+
+        Args:
+            key: The key for the search.
+        """
+        if (result := self._file(key)) is not None:
+            try:
+                utime(result)
+            except OSError:
+                pass
+
+    def _forget(self, key: CacheKey) -> None:
+        """Remove a cached result from storage.
+
+        Args:
+            key: The key for the search.
+        """
+        if (result := self._file(key)) is not None:
+            _remove(result)
+
+
+##############################################################################
+@cache
+def search_cache() -> ResultCache:
+    """Get the cache of search results.
+
+    Returns:
+        The cache of search results.
+
+    Note:
+        The size of the cache, and if it is persisted to storage, are taken
+        from the configuration the first time this is called.
+    """
+    configuration = load_configuration()
+    return ResultCache(
+        configuration.global_search_cache_size,
+        cache_dir() if configuration.global_search_cache_on_disk else None,
+    )
+
+
+### cache.py ends here
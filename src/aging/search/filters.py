@@ -0,0 +1,267 @@
+"""Provides filters for quickly ruling out guides that can't hold a hit."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from hashlib import blake2b
+from pathlib import Path
+from struct import Struct
+from struct import error as StructError
+from typing import Final
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError, NortonGuide
+
+##############################################################################
+# Local imports.
+from ..data import Guides
+from ..data.locations import data_dir
+from .scanner import raw_entries
+
+##############################################################################
+BITS_PER_TRIGRAM: Final[int] = 10
+"""The number of bits to allow for each trigram held in a filter."""
+
+##############################################################################
+MINIMUM_BITS: Final[int] = 1024
+"""The smallest number of bits a filter will have."""
+
+##############################################################################
+HASHES: Final[int] = 4
+"""The number of bits set in a filter for each trigram."""
+
+##############################################################################
+HEADER: Final = Struct("<QqII")
+"""The layout of the header of a filter file.
+
+This holds the size and modification time of the guide the filter was
+built from, followed by the number of bits and the number of hashes used
+by the filter.
+"""
+
+
+##############################################################################
+class TrigramFilter:
+    """A Bloom filter of the trigrams found in the text of a guide.
+
+    If any trigram of some text isn't in the filter then that text can't
+    be in the guide. The trigrams are casefolded, so the same filter works
+    whether or not case is being ignored.
+    """
+
+    def __init__(self, bits: int, hashes: int = HASHES, data: bytes = b"") -> None:
+        """Initialise the filter.
+
+        Args:
+            bits: The number of bits in the filter.
+            hashes: The number of bits set for each trigram.
+            data: Optional existing content of the filter.
+        """
+        self._bits = bits
+        """The number of bits in the filter."""
+        self._hashes = hashes
+        """The number of bits set for each trigram."""
+        self._data = bytearray(data or bytes((bits + 7) // 8))
+        """The bits of the filter."""
+
+    def _positions(self, trigram: str) -> list[int]:
+        """Get the positions of the bits for a trigram.
+
+        Args:
+            trigram: The trigram.
+
+        Returns:
+            The positions of the bits.
+        """
+        digest = int.from_bytes(
+            blake2b(trigram.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        first, second = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        return [(first + hash * second) % self._bits for hash in range(self._hashes)]
+
+    def add(self, trigram: str) -> None:
+        """Add a trigram to the filter.
+
+        Args:
+            trigram: The trigram to add.
+        """
+        for position in self._positions(trigram):
+            self._data[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, text: str) -> bool:
+        """Might the given text be in the guide?
+
+        Args:
+            text: The text to check for.
+
+        Returns:
+            [`True`][True] if the text might be in the guide,
+            [`False`][False] if it certainly isn't.
+        """
+        text = text.casefold()
+        return all(
+            self._data[position >> 3] & (1 << (position & 7))
+            for trigram in {text[start : start + 3] for start in range(len(text) - 2)}
+            for position in self._positions(trigram)
+        )
+
+    @classmethod
+    def of(cls, guide: Path) -> TrigramFilter:
+        """Build the filter for a guide.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The filter for the guide.
+
+        Raises:
+            OSError: If there was a problem reading the guide.
+            NGDBError: If there was a problem reading the guide.
+        """
+        trigrams: set[str] = set()
+        with NortonGuide(guide) as source:
+            for entry in raw_entries(source):
+                text = entry.text.casefold()
+                trigrams.update(
+                    text[start : start + 3] for start in range(len(text) - 2)
+                )
+        bits = MINIMUM_BITS
+        while bits < len(trigrams) * BITS_PER_TRIGRAM:
+            bits *= 2
+        built = cls(bits)
+        for trigram in trigrams:
+            built.add(trigram)
+        return built
+
+    @property
+    def bits(self) -> int:
+        """The number of bits in the filter."""
+        return self._bits
+
+    @property
+    def hashes(self) -> int:
+        """The number of bits set for each trigram."""
+        return self._hashes
+
+    def __bytes__(self) -> bytes:
+        """The content of the filter as bytes."""
+        return bytes(self._data)
+
+
+##############################################################################
+def filters_dir() -> Path:
+    """The path to the directory that holds the guide filters.
+
+    Returns:
+        The path to the guide filters directory.
+    """
+    (filters := data_dir() / "guide-filters").mkdir(parents=True, exist_ok=True)
+    return filters
+
+
+##############################################################################
+class GuideFilters:
+    """The persistent store of the filters for the guides.
+
+    Each filter is held in its own file, along with the size and the
+    modification time of the guide it was built from; if either of those
+    has changed the filter is ignored until it is built again.
+    """
+
+    def __init__(self, location: Path | None = None) -> None:
+        """Initialise the store.
+
+        Args:
+            location: Optional location of the directory of filters.
+        """
+        self._location = location or filters_dir()
+        """The location of the directory of filters."""
+
+    def _file(self, guide: Path) -> Path:
+        """Get the file that holds the filter for a guide.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The location of the filter's file.
+        """
+        return (
+            self._location
+            / f"{blake2b(str(guide.absolute()).encode(), digest_size=16).hexdigest()}.bin"
+        )
+
+    def get(self, guide: Path) -> TrigramFilter | None:
+        """Get the filter for a guide.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The filter for the guide, or [`None`][None] if there isn't an
+            up to date filter for it.
+        """
+        try:
+            status = guide.stat()
+            with self._file(guide).open("rb") as source:
+                size, modified, bits, hashes = HEADER.unpack(source.read(HEADER.size))
+                if (size, modified) != (status.st_size, status.st_mtime_ns):
+                    return None
+                if bits < 1 or len(data := source.read()) != (bits + 7) // 8:
+                    return None
+        except (OSError, StructError):
+            return None
+        return TrigramFilter(bits, hashes, data)
+
+    def build(self, guide: Path) -> None:
+        """Build and store the filter for a guide.
+
+        Args:
+            guide: The location of the guide.
+
+        Raises:
+            OSError: If there was a problem reading the guide or saving
+                the filter.
+            NGDBError: If there was a problem reading the guide.
+        """
+        status = guide.stat()
+        built = TrigramFilter.of(guide)
+        self._file(guide).write_bytes(
+            HEADER.pack(status.st_size, status.st_mtime_ns, built.bits, built.hashes)
+            + bytes(built)
+        )
+
+    def update(
+        self, guides: Guides, cancelled: Callable[[], bool] = lambda: False
+    ) -> None:
+        """Ensure there's an up to date filter for every guide.
+
+        Args:
+            guides: The guides that should have filters.
+            cancelled: A function that reports if the update was cancelled.
+
+        Note:
+            Any filter that doesn't belong to one of the guides is removed.
+            Any guide that can't be read is skipped.
+        """
+        keep = {self._file(guide.location) for guide in guides}
+        for stale in self._location.glob("*.bin"):
+            if stale not in keep:
+                stale.unlink(missing_ok=True)
+        for guide in guides:
+            if cancelled():
+                return
+            if self.get(guide.location) is None:
+                try:
+                    self.build(guide.location)
+                except (OSError, NGDBError):
+                    pass
+
+
+### filters.py ends here
@@ -0,0 +1,336 @@
+"""Provides a class for searching for text that is close to the needle."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from re import compile as compile_regexp
+from typing import Final
+
+##############################################################################
+# Local imports.
+from .needle import InvalidNeedle
+
+##############################################################################
+WORDS: Final = compile_regexp(r"\w+")
+"""Regular expression for splitting text into words."""
+
+##############################################################################
+MAXIMUM_EDITS: Final[int] = 3
+"""The most edits that will ever be allowed between a word and the needle."""
+
+
+##############################################################################
+def allowed_edits(word: str) -> int:
+    """Get the number of edits allowed when looking for a word.
+
+    Args:
+        word: The word being looked for.
+
+    Returns:
+        The number of edits allowed.
+
+    Note:
+        Very short words have to be found exactly, otherwise they'd be
+        close to almost everything.
+    """
+    return min(len(word) // 3, MAXIMUM_EDITS)
+
+
+##############################################################################
+def trigrams(word: str) -> set[str]:
+    """Get the trigrams of a word.
+
+    Args:
+        word: The word to get the trigrams of.
+
+    Returns:
+        The trigrams of the word.
+
+    Note:
+        The word is padded at the start and the end, so that even a short
+        word has a good number of trigrams, and so that the trigrams say
+        something about how the word starts and ends.
+    """
+    padded = f"  {word} "
+    return {padded[start : start + 3] for start in range(len(padded) - 2)}
+
+
+##############################################################################
+def fragments(text: str) -> set[str]:
+    """Get the fragments of some text.
+
+    Args:
+        text: The text to get the fragments of.
+
+    Returns:
+        Every run of three characters within the text.
+
+    Note:
+        Unlike [`trigrams`][aging.search.fuzzy.trigrams] the text isn't
+        padded, so these can be compared with the fragments of any text
+        the word might be found within.
+    """
+    return {text[start : start + 3] for start in range(len(text) - 2)}
+
+
+##############################################################################
+def pieces(word: str, count: int) -> tuple[str, ...]:
+    """Split a word into pieces.
+
+    Args:
+        word: The word to split.
+        count: The number of pieces to split it into.
+
+    Returns:
+        The pieces of the word, as close to the same length as possible.
+
+    Note:
+        If a word is split into one more piece than the number of edits
+        allowed, any word close enough to it must hold at least one of
+        the pieces unchanged; each edit can only touch one piece.
+    """
+    size, longer = divmod(len(word), count)
+    found: list[str] = []
+    start = 0
+    for piece in range(count):
+        found.append(word[start : (start := start + size + (piece < longer))])
+    return tuple(found)
+
+
+##############################################################################
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """Get the edit distance between two pieces of text.
+
+    Args:
+        first: The first piece of text.
+        second: The second piece of text.
+        limit: The largest distance that's of any interest.
+
+    Returns:
+        The number of insertions, deletions and substitutions needed to
+        turn one piece of text into the other, or `limit + 1` if more than
+        `limit` are needed.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row]
+        for column, second_char in enumerate(second, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (first_char != second_char),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+##############################################################################
+class FuzzyNeedle:
+    """The details of a search for text that is close to the needle.
+
+    Each word of the needle is allowed to be a few edits away from a word
+    in a line; a line is a hit if every word of the needle is close enough
+    to a word in that line. Each hit shows the words that were found.
+    """
+
+    def __init__(self, text: str, ignore_case: bool, regex: bool = False) -> None:
+        """Initialise the needle.
+
+        Args:
+            text: The text to search for.
+            ignore_case: Should case be ignored?
+            regex: Is the text a regular expression?
+
+        Raises:
+            InvalidNeedle: If the needle isn't valid.
+        """
+        if regex:
+            raise InvalidNeedle("A fuzzy search can't also be a regular expression")
+        self.text: Final[str] = text
+        """The text to search for."""
+        self.ignore_case: Final[bool] = ignore_case
+        """Should case be ignored?"""
+        self.regex: Final[bool] = False
+        """Is the text a regular expression?"""
+        self.words: Final[tuple[str, ...]] = tuple(
+            dict.fromkeys(WORDS.findall(self._haystack(text)))
+        )
+        """The words to search for."""
+        if not self.words:
+            raise InvalidNeedle("A fuzzy search needs at least one word to look for")
+        self._pieces: Final[tuple[tuple[str, ...], ...]] = tuple(
+            pieces(word, allowed_edits(word) + 1) for word in self.words
+        )
+        """The pieces of each word, one of which a close word must hold."""
+        self._fragments: Final[tuple[tuple[set[str], int], ...]] = tuple(
+            (found, required)
+            for word in self.words
+            if (required := len(found := fragments(word)) - 3 * allowed_edits(word)) > 0
+        )
+        """The fragments of each word, and how many of them a close word must share.
+
+        Each edit can change at most three of the fragments of a word, so
+        any word that's close enough to one of the words of the needle must
+        share all but that many of them. Words that are short enough that
+        nothing can be said about them are left out.
+        """
+        self._distances: dict[tuple[str, str], int] = {}
+        """Cache of the distances between the needle's words and found words."""
+
+    def _haystack(self, text: str) -> str:
+        """Prepare some text for looking for the needle within.
+
+        Args:
+            text: The text to prepare.
+
+        Returns:
+            The prepared text.
+        """
+        return text.casefold() if self.ignore_case else text
+
+    def distance(self, needle_word: str, word: str) -> int:
+        """Get how far a word is from one of the words of the needle.
+
+        Args:
+            needle_word: The word of the needle.
+            word: The word to compare with it.
+
+        Returns:
+            The edit distance between the words, or one more than the number
+            of edits allowed if the word is too far away.
+        """
+        if (distance := self._distances.get((needle_word, word))) is None:
+            distance = self._distances[needle_word, word] = edit_distance(
+                needle_word, word, allowed_edits(needle_word)
+            )
+        return distance
+
+    def is_close(self, needle_word: str, word: str) -> bool:
+        """Is a word close enough to one of the words of the needle?
+
+        Args:
+            needle_word: The word of the needle.
+            word: The word to compare with it.
+
+        Returns:
+            [`True`][True] if the word is close enough to be a hit,
+            [`False`][False] if not.
+        """
+        return self.distance(needle_word, word) <= allowed_edits(needle_word)
+
+    def similarity(self, found: str | None) -> float:
+        """Get how similar some found text is to the needle.
+
+        Args:
+            found: The text that was found.
+
+        Returns:
+            A value from `1.0` for an exact match down towards `0.0` for
+            the most distant match.
+        """
+        if found is None:
+            return 1.0
+        words = self._haystack(found).split()
+        return sum(
+            1 - self.distance(needle_word, word) / (allowed_edits(needle_word) + 1)
+            for needle_word, word in zip(self.words, words, strict=False)
+        ) / len(self.words)
+
+    def might_be_in(self, text: str) -> bool:
+        """Might there be a hit in the given text?
+
+        Args:
+            text: The plain text to check, which may be many lines.
+
+        Returns:
+            [`True`][True] if there might be a hit in the text,
+            [`False`][False] if there certainly isn't.
+
+        Note:
+            There can only be a hit if, for every word of the needle, the
+            text holds at least one of the pieces of that word.
+        """
+        haystack = self._haystack(text)
+        return all(
+            any(piece in haystack for piece in word_pieces)
+            for word_pieces in self._pieces
+        )
+
+    def might_be_found(self, contains: Callable[[str], bool]) -> bool:
+        """Might there be a hit, given a test for text being present?
+
+        Args:
+            contains: Function that reports if some text might be present.
+
+        Returns:
+            [`True`][True] if there might be a hit, [`False`][False] if
+            there certainly isn't.
+
+        Note:
+            There can only be a hit if, for every word of the needle, at
+            least one of the pieces of that word is present, and enough of
+            the fragments of that word are present for a close word to be
+            present.
+        """
+        return all(
+            any(contains(piece) for piece in word_pieces)
+            for word_pieces in self._pieces
+        ) and all(
+            sum(1 for fragment in found if contains(fragment)) >= required
+            for found, required in self._fragments
+        )
+
+    def found_in(self, line: str) -> str | None:
+        """Look for a hit in the given line.
+
+        Args:
+            line: The plain text of the line to check.
+
+        Returns:
+            The closest words found for each word of the needle, or
+            [`None`][None] if there isn't a hit in the line.
+        """
+        words = {self._haystack(word): word for word in WORDS.findall(line)}
+        found: list[str] = []
+        for needle_word in self.words:
+            if not (
+                close := [word for word in words if self.is_close(needle_word, word)]
+            ):
+                return None
+            found.append(
+                words[min(close, key=lambda word: self.distance(needle_word, word))]
+            )
+        return " ".join(found)
+
+    def hits_in(self, lines: list[str]) -> list[tuple[int, str | None]]:
+        """Find the hits within some lines.
+
+        Args:
+            lines: The plain text of the lines to check.
+
+        Returns:
+            The number of each line that is a hit, along with the needle
+            that was found in it if that's worth knowing.
+        """
+        return [
+            (line, found)
+            for line, text in enumerate(lines)
+            if (found := self.found_in(text)) is not None
+        ]
+
+    def __repr__(self) -> str:
+        """The representation of the needle."""
+        return f"FuzzyNeedle({self.text!r}, ignore_case={self.ignore_case})"
+
+
+### fuzzy.py ends here
@@ -0,0 +1,142 @@
+"""Provides a way of searching guides without the application."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from pathlib import Path
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError
+
+##############################################################################
+# Local imports.
+from ..data import Fingerprints, SearchHits
+from .cache import search_cache
+from .filters import GuideFilters
+from .index import SearchIndex, SearchIndexError
+from .matcher import Matcher
+from .parallel import ParallelSearch
+from .scanner import entry_ranges, search_range
+
+
+##############################################################################
+def stream_search(
+    guides: Sequence[Path],
+    needle: Matcher,
+    jobs: int | None = 1,
+    failed: Callable[[Path, Exception], object] = lambda _, __: None,
+) -> Iterator[SearchHits]:
+    """Search guides, yielding the hits as they are found.
+
+    Args:
+        guides: The locations of the guides to search.
+        needle: What to search for.
+        jobs: The number of processes to search with; [`None`][None] for
+            one per CPU.
+        failed: The function to call if a guide can't be searched.
+
+    Yields:
+        Batches of hits, in the order they appear in the guides.
+
+    Note:
+        This works the same way as a global search in the application: the
+        result cache is used if the search has been done before, guides
+        that are up to date in the search index are searched there, guides
+        whose filter shows they can't hold a hit are skipped, and any other
+        guides are scanned. The search index and the filters are only ever
+        read, never updated; the fingerprints of the guides, and the result
+        cache if it's kept on disk, are updated, but failing to save either
+        never fails the search.
+    """
+    # If we've done this exact search before, and none of the guides have
+    # changed since, we can just use the results from last time.
+    fingerprints = Fingerprints()
+    current = {guide: fingerprints.current(guide) for guide in guides}
+    try:
+        fingerprints.save()
+    except OSError:
+        pass
+    cacheable = [
+        fingerprint for fingerprint in current.values() if fingerprint is not None
+    ]
+    if (complete := len(cacheable) == len(guides)) and (
+        cached := search_cache().get(needle, cacheable)
+    ) is not None:
+        order = {guide: position for position, guide in enumerate(guides)}
+        yield SearchHits(sorted(cached, key=lambda hit: order[hit.guide]))
+        return
+
+    found = SearchHits()
+    with ExitStack() as resources:
+        # Work out which guides can be answered from the search index.
+        try:
+            index: SearchIndex | None = resources.enter_context(
+                SearchIndex(read_only=True)
+            )
+            indexed = {
+                location
+                for location, fingerprint in current.items()
+                if fingerprint is not None
+                and index is not None
+                and index.is_current(fingerprint)
+            }
+        except SearchIndexError:
+            index, indexed = None, set()
+
+        # Any guide whose filter shows that it can't hold a hit can be
+        # skipped without even being opened.
+        filters = GuideFilters()
+        ruled_out = {
+            guide
+            for guide in guides
+            if (guide_filter := filters.get(guide)) is not None
+            and not needle.might_be_found(guide_filter.might_contain)
+        }
+
+        # If we're searching in parallel, let the processes know which of
+        # the guides need scanning.
+        parallel: ParallelSearch | None = None
+        if jobs != 1:
+            parallel = resources.enter_context(ParallelSearch(needle, jobs))
+            for guide in guides:
+                if guide not in indexed | ruled_out:
+                    parallel.submit(guide)
+
+        # Now collect the results, in guide order.
+        for guide in guides:
+            if guide in ruled_out:
+                continue
+            try:
+                if index is not None and guide in indexed:
+                    try:
+                        found.extend(hits := SearchHits(index.search(guide, needle)))
+                        yield hits
+                        continue
+                    except SearchIndexError:
+                        pass
+                if parallel is not None and guide not in indexed:
+                    for result in parallel.results(guide):
+                        found.extend(result.hits)
+                        yield result.hits
+                else:
+                    for start, end in entry_ranges(guide):
+                        found.extend(
+                            hits := search_range(guide, needle, start, end).hits
+                        )
+                        yield hits
+            except (OSError, NGDBError, BrokenProcessPool) as error:
+                complete = False
+                failed(guide, error)
+
+    if complete:
+        search_cache().put(needle, cacheable, found)
+
+
+### headless.py ends here
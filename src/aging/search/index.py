@@ -0,0 +1,762 @@
+"""Provides a persistent full-text index of the guides in the directory."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+import sqlite3
+from collections.abc import Collection, Iterator
+from pathlib import Path
+from re import compile as compile_regexp
+from typing import Any, Final
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError, NortonGuide, PlainText
+
+##############################################################################
+# Typing extension imports.
+from typing_extensions import Self
+
+##############################################################################
+# Local imports.
+from ..data import Fingerprint, Fingerprints, Guides, SearchHit
+from ..data.locations import data_dir
+from .fuzzy import FuzzyNeedle, allowed_edits, edit_distance, trigrams
+from .matcher import Matcher
+from .multi_needle import MultiNeedle
+from .needle import Needle
+from .query import Query
+from .ranking import EntryStatistics, GuideStatistics
+
+##############################################################################
+SCHEMA_VERSION: Final[int] = 4
+"""The version of the index's schema.
+
+Note:
+    If the version of the schema found in an existing index doesn't match
+    this, the index will be thrown away and built again from scratch.
+"""
+
+##############################################################################
+SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS guides (
+    id          INTEGER PRIMARY KEY,
+    location    TEXT UNIQUE NOT NULL,
+    size        INTEGER NOT NULL,
+    modified    INTEGER NOT NULL,
+    header_hash TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    credits     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    guide  INTEGER NOT NULL,
+    entry  INTEGER NOT NULL,
+    line   INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    text   TEXT NOT NULL,
+    PRIMARY KEY (guide, entry, line)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tokens (
+    id    INTEGER PRIMARY KEY,
+    token TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token INTEGER NOT NULL,
+    guide INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    line  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigrams (
+    trigram TEXT NOT NULL,
+    token   INTEGER NOT NULL,
+    PRIMARY KEY (trigram, token)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_token ON postings (token, guide);
+CREATE INDEX IF NOT EXISTS postings_by_guide ON postings (guide);
+"""
+"""The schema for the index."""
+
+##############################################################################
+WORDS: Final = compile_regexp(r"\w+")
+"""Regular expression for splitting text into tokens for the index."""
+
+##############################################################################
+TEMPORARY_SCHEMA: Final[str] = """
+CREATE TEMPORARY TABLE IF NOT EXISTS containing (
+    word  INTEGER NOT NULL,
+    token INTEGER NOT NULL,
+    PRIMARY KEY (word, token)
+) WITHOUT ROWID;
+"""
+"""The schema for the working tables that only last as long as the connection."""
+
+##############################################################################
+CONTAINING_TOKENS: Final[str] = """
+INSERT INTO temp.containing SELECT ?, id FROM tokens WHERE instr(token, ?) > 0
+"""
+"""Query to record all of the tokens that contain some text."""
+
+##############################################################################
+CANDIDATE_LINES: Final[str] = """
+SELECT DISTINCT entry, line FROM postings WHERE guide = :guide
+AND token IN (SELECT token FROM temp.containing WHERE word = {word})
+"""
+"""Query to find all lines in a guide with a token containing a word."""
+
+##############################################################################
+CLOSE_TOKENS: Final[str] = """
+SELECT tokens.id, tokens.token FROM trigrams JOIN tokens ON tokens.id = trigrams.token
+WHERE trigrams.trigram IN ({trigrams}) GROUP BY tokens.id HAVING count(*) >= ?
+"""
+"""Query to find the tokens that share enough trigrams with a word."""
+
+
+##############################################################################
+def index_file() -> Path:
+    """The path to the file that holds the search index.
+
+    Returns:
+        The path to the search index file.
+    """
+    return data_dir() / "search-index.db"
+
+
+##############################################################################
+class SearchIndexError(Exception):
+    """Exception raised if there is a problem with the search index."""
+
+
+##############################################################################
+class SearchIndex:
+    """A persistent full-text index of Norton Guides.
+
+    The index holds the source and the plain text of every line of every
+    guide that has been added to it, along with posting lists that map
+    each token found in the guides to the guide, entry offset and line
+    where it can be found. The trigrams of every token are held too, so
+    that tokens close to a word can be found quickly.
+
+    Note:
+        An instance of the index should only be used within the thread
+        that created it.
+    """
+
+    def __init__(self, location: Path | None = None, read_only: bool = False) -> None:
+        """Initialise the search index.
+
+        Args:
+            location: Optional location of the index file.
+            read_only: Should the index only be opened for reading?
+
+        Raises:
+            SearchIndexError: If the index could not be opened.
+
+        Note:
+            The index is only created, or rebuilt if its schema is out of
+            date, when it's opened for writing. Opening it to read it never
+            waits on whatever might be writing to it at the time.
+        """
+        location = location or index_file()
+        try:
+            if read_only:
+                self._db = sqlite3.connect(
+                    f"{location.absolute().as_uri()}?mode=ro", uri=True
+                )
+                """The connection to the index database."""
+                if (
+                    self._db.execute("PRAGMA user_version").fetchone()[0]
+                    != SCHEMA_VERSION
+                ):
+                    self._db.close()
+                    raise SearchIndexError("The search index is out of date")
+            else:
+                self._db = sqlite3.connect(location, timeout=30)
+                if (
+                    self._db.execute("PRAGMA user_version").fetchone()[0]
+                    != SCHEMA_VERSION
+                ):
+                    self._db.execute("PRAGMA journal_mode = WAL")
+                    self._db.executescript(
+                        "DROP TABLE IF EXISTS guides;"
+                        "DROP TABLE IF EXISTS lines;"
+                        "DROP TABLE IF EXISTS tokens;"
+                        "DROP TABLE IF EXISTS postings;"
+                        "DROP TABLE IF EXISTS trigrams;"
+                        f"{SCHEMA}"
+                        f"PRAGMA user_version = {SCHEMA_VERSION};"
+                    )
+            self._db.executescript(TEMPORARY_SCHEMA)
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+        self._close_tokens: dict[tuple[str, int], list[int]] = {}
+        """Cache of the IDs of the tokens that are close to a word."""
+        self._words: dict[str, int] = {}
+        """The IDs of the words whose containing tokens have been found."""
+
+    def close(self) -> None:
+        """Close the index."""
+        self._db.close()
+
+    def __enter__(self) -> Self:
+        """Handle entry to context."""
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Handle exit from context."""
+        self.close()
+
+    @staticmethod
+    def _key(guide: Path) -> str:
+        """Get the key used to identify a guide within the index.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The key for the guide.
+        """
+        return str(guide.absolute())
+
+    def _guide_id(self, guide: Path) -> int | None:
+        """Get the ID of a guide within the index.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The ID of the guide, or [`None`][None] if it isn't indexed.
+        """
+        return (
+            None
+            if (
+                found := self._db.execute(
+                    "SELECT id FROM guides WHERE location = ?", (self._key(guide),)
+                ).fetchone()
+            )
+            is None
+            else found[0]
+        )
+
+    def is_current(self, fingerprint: Fingerprint) -> bool:
+        """Is the index up to date for the guide with the given fingerprint?
+
+        Args:
+            fingerprint: The current fingerprint of the guide.
+
+        Returns:
+            [`True`][True] if the guide is indexed and hasn't changed since,
+            [`False`][False] if not.
+
+        Raises:
+            SearchIndexError: If there was a problem reading the index.
+        """
+        try:
+            indexed: tuple[int, int, str] | None = self._db.execute(
+                "SELECT size, modified, header_hash FROM guides WHERE location = ?",
+                (self._key(fingerprint.location),),
+            ).fetchone()
+            return indexed == (
+                fingerprint.size,
+                fingerprint.modified,
+                fingerprint.header_hash,
+            )
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def out_of_date(
+        self, guides: Guides, fingerprints: Fingerprints
+    ) -> list[Fingerprint]:
+        """Get the guides that need to be added to the index.
+
+        Args:
+            guides: The guides that should be in the index.
+            fingerprints: The fingerprints of the guides.
+
+        Returns:
+            The fingerprints of the guides that are new or have changed.
+
+        Raises:
+            SearchIndexError: If there was a problem reading the index.
+
+        Note:
+            Any guide that can't be read is left out, there's no point in
+            trying to index it.
+        """
+        return [
+            fingerprint
+            for guide in guides
+            if (fingerprint := fingerprints.current(guide.location)) is not None
+            and not self.is_current(fingerprint)
+        ]
+
+    def _remove(self, guide_id: int) -> None:
+        """Remove a guide's data from the index.
+
+        Args:
+            guide_id: The ID of the guide to remove.
+        """
+        self._db.execute("DELETE FROM postings WHERE guide = ?", (guide_id,))
+        self._db.execute("DELETE FROM lines WHERE guide = ?", (guide_id,))
+        self._db.execute("DELETE FROM guides WHERE id = ?", (guide_id,))
+
+    def _forget_tokens(self) -> None:
+        """Forget what's known about which tokens match which words.
+
+        Note:
+            This needs to be done whenever the tokens in the index change.
+        """
+        self._close_tokens.clear()
+        self._words.clear()
+        self._db.execute("DELETE FROM temp.containing")
+
+    def _word_id(self, word: str) -> int:
+        """Get the ID of a word, finding the tokens that contain it if needed.
+
+        Args:
+            word: The word to get the ID of.
+
+        Returns:
+            The ID of the word within the table of containing tokens.
+
+        Raises:
+            sqlite3.Error: If there was a problem reading the index.
+
+        Note:
+            Finding the tokens that contain a word means looking at every
+            token in the index, so it's only done the once for each word,
+            rather than for every guide that's searched.
+        """
+        if (word_id := self._words.get(word)) is None:
+            word_id = self._words[word] = len(self._words)
+            self._db.execute(CONTAINING_TOKENS, (word_id, word))
+        return word_id
+
+    def _candidate_lines(self, words: list[str]) -> str:
+        """Get a query for the lines of a guide that could contain some words.
+
+        Args:
+            words: The words that must all be within a line.
+
+        Returns:
+            A query that finds the entry and line of every line that has,
+            for each of the words, a token that contains it. The guide is
+            given by the `:guide` parameter.
+
+        Raises:
+            sqlite3.Error: If there was a problem reading the index.
+        """
+        return " INTERSECT ".join(
+            CANDIDATE_LINES.format(word=self._word_id(word)) for word in words
+        )
+
+    def _token_id(self, token: str, known: dict[str, int]) -> int:
+        """Get the ID for a token, adding it to the index if necessary.
+
+        Args:
+            token: The token to get the ID for.
+            known: A cache of tokens whose IDs are already known.
+
+        Returns:
+            The ID of the token.
+        """
+        if (token_id := known.get(token)) is None:
+            added = self._db.execute(
+                "INSERT OR IGNORE INTO tokens (token) VALUES (?)", (token,)
+            ).rowcount
+            token_id = known[token] = self._db.execute(
+                "SELECT id FROM tokens WHERE token = ?", (token,)
+            ).fetchone()[0]
+            if added:
+                self._db.executemany(
+                    "INSERT INTO trigrams VALUES (?, ?)",
+                    ((trigram, token_id) for trigram in trigrams(token)),
+                )
+        return token_id
+
+    def add(self, fingerprint: Fingerprint) -> None:
+        """Add a guide to the index.
+
+        Args:
+            fingerprint: The fingerprint of the guide to add.
+
+        Raises:
+            SearchIndexError: If there was a problem indexing the guide.
+
+        Note:
+            If the guide is already in the index it will be indexed again.
+        """
+        lines: list[tuple[int, int, int, str, str]] = []
+        postings: list[tuple[int, int, int, int]] = []
+        tokens: dict[str, int] = {}
+        try:
+            with self._db, NortonGuide(fingerprint.location) as source:
+                self._forget_tokens()
+                if (guide_id := self._guide_id(fingerprint.location)) is not None:
+                    self._remove(guide_id)
+                guide_id = self._db.execute(
+                    "INSERT INTO guides VALUES (NULL, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self._key(fingerprint.location),
+                        fingerprint.size,
+                        fingerprint.modified,
+                        fingerprint.header_hash,
+                        source.title,
+                        "\n".join(source.credits),
+                    ),
+                ).lastrowid
+                assert guide_id is not None
+                for entry in source:
+                    for line_number, line in enumerate(entry):
+                        text = str(PlainText(str(line)))
+                        lines.append(
+                            (guide_id, entry.offset, line_number, str(line), text)
+                        )
+                        postings.extend(
+                            (
+                                self._token_id(token, tokens),
+                                guide_id,
+                                entry.offset,
+                                line_number,
+                            )
+                            for token in set(WORDS.findall(text.casefold()))
+                        )
+                self._db.executemany("INSERT INTO lines VALUES (?, ?, ?, ?, ?)", lines)
+                self._db.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?, ?)", postings
+                )
+        except (OSError, NGDBError, sqlite3.Error) as error:
+            raise SearchIndexError(str(error)) from error
+
+    def prune(self, guides: Guides) -> None:
+        """Remove any guides from the index that aren't in the given guides.
+
+        Args:
+            guides: The guides that should be kept in the index.
+
+        Raises:
+            SearchIndexError: If there was a problem pruning the index.
+        """
+        keep = {self._key(guide.location) for guide in guides}
+        try:
+            with self._db:
+                self._forget_tokens()
+                if removed := [
+                    guide_id
+                    for guide_id, location in self._db.execute(
+                        "SELECT id, location FROM guides"
+                    ).fetchall()
+                    if location not in keep
+                ]:
+                    for guide_id in removed:
+                        self._remove(guide_id)
+                    self._db.execute(
+                        "DELETE FROM tokens WHERE id NOT IN (SELECT token FROM postings)"
+                    )
+                    self._db.execute(
+                        "DELETE FROM trigrams WHERE token NOT IN (SELECT id FROM tokens)"
+                    )
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def titles_and_credits(self) -> dict[Path, tuple[str, str]]:
+        """Get the titles and credits of the guides in the index.
+
+        Returns:
+            The title and credits of each guide in the index, keyed by the
+            guide's location; the lines of the credits are joined with
+            newlines.
+
+        Raises:
+            SearchIndexError: If there was a problem reading the index.
+
+        Note:
+            These are the title and credits from the guide at the time it
+            was indexed, so they may be out of date if the guide has
+            changed since.
+        """
+        try:
+            return {
+                Path(location): (title, credits)
+                for location, title, credits in self._db.execute(
+                    "SELECT location, title, credits FROM guides"
+                )
+            }
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def statistics(
+        self, guide: Path, entries: Collection[int]
+    ) -> GuideStatistics | None:
+        """Get the statistics for a guide from the index.
+
+        Args:
+            guide: The location of the guide.
+            entries: The offsets of the entries to describe.
+
+        Returns:
+            The statistics for the guide, or [`None`][None] if the guide
+            isn't in the index.
+
+        Raises:
+            SearchIndexError: If there was a problem reading the index.
+        """
+        try:
+            if (guide_id := self._guide_id(guide)) is None:
+                return None
+            counts: list[tuple[int, int, int | None]] = self._db.execute(
+                "SELECT entry, count(*), min(CASE WHEN trim(text) != '' THEN line END) "
+                "FROM lines WHERE guide = ? GROUP BY entry",
+                (guide_id,),
+            ).fetchall()
+            described: dict[int, EntryStatistics] = {}
+            for entry, lines, first_line in counts:
+                if entry in entries:
+                    described[entry] = EntryStatistics(
+                        lines,
+                        ""
+                        if first_line is None
+                        else self._db.execute(
+                            "SELECT text FROM lines "
+                            "WHERE guide = ? AND entry = ? AND line = ?",
+                            (guide_id, entry, first_line),
+                        ).fetchone()[0],
+                    )
+            return GuideStatistics(
+                len(counts), sum(lines for _, lines, _ in counts), described
+            )
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def _search_needle(self, guide: Path, needle: Needle) -> Iterator[SearchHit]:
+        """Search a guide in the index for a single needle.
+
+        Args:
+            guide: The location of the guide to search.
+            needle: What to search for.
+
+        Yields:
+            The hits found in the guide, in the order they appear in the guide.
+
+        Raises:
+            SearchIndexError: If there was a problem searching the index.
+        """
+        # Any line that contains a hit must also contain, for every word
+        # within the literal text of the needle, a token that contains that
+        # word. So we use the posting lists to narrow down the lines that
+        # could hold a hit, and then we check each of those properly.
+        words = WORDS.findall(needle.literal.casefold())
+        try:
+            if (guide_id := self._guide_id(guide)) is None:
+                return
+            if words:
+                hits = self._db.execute(
+                    "SELECT lines.entry, lines.line, lines.source, lines.text "
+                    f"FROM lines JOIN ({self._candidate_lines(words)}) AS candidates "
+                    "USING (entry, line) "
+                    "WHERE lines.guide = :guide ORDER BY lines.entry, lines.line",
+                    {"guide": guide_id},
+                )
+            else:
+                hits = self._db.execute(
+                    "SELECT entry, line, source, text FROM lines "
+                    "WHERE guide = ? ORDER BY entry, line",
+                    (guide_id,),
+                )
+            for entry, line, source, text in hits:
+                if needle.found_in(text):
+                    yield SearchHit(guide, entry, line, source)
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def _search_query(self, guide: Path, query: Query) -> Iterator[SearchHit]:
+        """Search a guide in the index for a boolean query.
+
+        Args:
+            guide: The location of the guide to search.
+            query: The query to search for.
+
+        Yields:
+            The hits found in the guide, in the order they appear in the guide.
+
+        Raises:
+            SearchIndexError: If there was a problem searching the index.
+        """
+        # Look up the hits for each term on its own, then use those to work
+        # out which entries the query matches as a whole.
+        found = {
+            needle: list(self._search_needle(guide, needle)) for needle in query.terms
+        }
+        in_entries = {
+            needle: {hit.entry_offset for hit in hits} for needle, hits in found.items()
+        }
+        hits: dict[tuple[int, int], SearchHit] = {}
+        for needle in query.positive:
+            for hit in found[needle]:
+                hits[hit.entry_offset, hit.entry_line] = hit
+        matched: dict[int, bool] = {}
+        for (entry, _), hit in sorted(hits.items()):
+            if entry not in matched:
+                matched[entry] = query.matches(
+                    [
+                        needle
+                        for needle, entries in in_entries.items()
+                        if entry in entries
+                    ]
+                )
+            if matched[entry]:
+                yield hit
+
+    def _search_needles(self, guide: Path, needles: MultiNeedle) -> Iterator[SearchHit]:
+        """Search a guide in the index for many needles.
+
+        Args:
+            guide: The location of the guide to search.
+            needles: The needles to search for.
+
+        Yields:
+            The hits found in the guide, in the order they appear in the guide.
+
+        Raises:
+            SearchIndexError: If there was a problem searching the index.
+        """
+        # The lines that could hold a hit for each needle are all found in
+        # one go, each tagged with the needle it could hold; so each line
+        # only needs checking for those needles it could hold.
+        try:
+            if (guide_id := self._guide_id(guide)) is None:
+                return
+            hits = self._db.execute(
+                "SELECT lines.entry, lines.line, lines.source, lines.text, "
+                "candidates.needle FROM lines JOIN ("
+                + " UNION ALL ".join(
+                    f"SELECT {order} AS needle, entry, line FROM ("
+                    + (
+                        self._candidate_lines(words)
+                        if (words := WORDS.findall(needle.literal.casefold()))
+                        else "SELECT entry, line FROM lines WHERE guide = :guide"
+                    )
+                    + ")"
+                    for order, needle in enumerate(needles.needles)
+                )
+                + ") AS candidates USING (entry, line) WHERE lines.guide = :guide "
+                "ORDER BY lines.entry, lines.line, candidates.needle",
+                {"guide": guide_id},
+            )
+            for entry, line, source, text, order in hits:
+                if (needle := needles.needles[order]).found_in(text):
+                    yield SearchHit(guide, entry, line, source, needle.text)
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def _tokens_close_to(self, word: str, edits: int) -> list[int]:
+        """Get the tokens that are close to a word.
+
+        Args:
+            word: The word to find the tokens close to.
+            edits: The number of edits allowed.
+
+        Returns:
+            The IDs of the tokens that are within the allowed number of
+            edits of the word.
+
+        Raises:
+            sqlite3.Error: If there was a problem reading the index.
+
+        Note:
+            Each edit can change at most three of the trigrams of the word,
+            so any token close enough to the word must share all but that
+            many of them; only those tokens need their distance from the
+            word working out.
+        """
+        if (close := self._close_tokens.get((word, edits))) is None:
+            wanted = trigrams(word)
+            if (shared := len(wanted) - 3 * edits) > 0:
+                candidates = self._db.execute(
+                    CLOSE_TOKENS.format(trigrams=", ".join("?" * len(wanted))),
+                    (*wanted, shared),
+                )
+            else:
+                candidates = self._db.execute(
+                    "SELECT id, token FROM tokens WHERE length(token) BETWEEN ? AND ?",
+                    (len(word) - edits, len(word) + edits),
+                )
+            close = self._close_tokens[word, edits] = [
+                token_id
+                for token_id, token in candidates
+                if edit_distance(word, token, edits) <= edits
+            ]
+        return close
+
+    def _search_fuzzy(self, guide: Path, needle: FuzzyNeedle) -> Iterator[SearchHit]:
+        """Search a guide in the index for text close to a needle.
+
+        Args:
+            guide: The location of the guide to search.
+            needle: The needle to search for.
+
+        Yields:
+            The hits found in the guide, in the order they appear in the guide.
+
+        Raises:
+            SearchIndexError: If there was a problem searching the index.
+        """
+        # Find the tokens close to each word of the needle, using the
+        # trigrams of the tokens, then use the posting lists to find the
+        # lines that have a close token for every word; those lines are
+        # then checked properly. The tokens are casefolded, but the number
+        # of edits allowed comes from the needle's own word, just as it does
+        # when a guide is scanned, so both find the same hits.
+        try:
+            if (guide_id := self._guide_id(guide)) is None:
+                return
+            close = [
+                self._tokens_close_to(word.casefold(), allowed_edits(word))
+                for word in needle.words
+            ]
+            if not all(close):
+                return
+            hits = self._db.execute(
+                "SELECT lines.entry, lines.line, lines.source, lines.text "
+                "FROM lines JOIN ("
+                + " INTERSECT ".join(
+                    "SELECT DISTINCT entry, line FROM postings "
+                    f"WHERE guide = ? AND token IN ({', '.join(map(str, tokens))})"
+                    for tokens in close
+                )
+                + ") AS candidates USING (entry, line) "
+                "WHERE lines.guide = ? ORDER BY lines.entry, lines.line",
+                (*([guide_id] * len(close)), guide_id),
+            )
+            for entry, line, source, text in hits:
+                if (found := needle.found_in(text)) is not None:
+                    yield SearchHit(guide, entry, line, source, found)
+        except sqlite3.Error as error:
+            raise SearchIndexError(str(error)) from error
+
+    def search(self, guide: Path, needle: Matcher) -> Iterator[SearchHit]:
+        """Search a guide in the index.
+
+        Args:
+            guide: The location of the guide to search.
+            needle: What to search for.
+
+        Yields:
+            The hits found in the guide, in the order they appear in the guide.
+
+        Raises:
+            SearchIndexError: If there was a problem searching the index.
+        """
+        if isinstance(needle, Query):
+            yield from self._search_query(guide, needle)
+        elif isinstance(needle, MultiNeedle):
+            yield from self._search_needles(guide, needle)
+        elif isinstance(needle, FuzzyNeedle):
+            yield from self._search_fuzzy(guide, needle)
+        else:
+            yield from self._search_needle(guide, needle)
+
+
+### index.py ends here
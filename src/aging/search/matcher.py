@@ -0,0 +1,18 @@
+"""Provides the type of the things that can be searched for."""
+
+##############################################################################
+# Python imports.
+from typing import TypeAlias
+
+##############################################################################
+# Local imports.
+from .fuzzy import FuzzyNeedle
+from .multi_needle import MultiNeedle
+from .needle import Needle
+from .query import Query
+
+##############################################################################
+Matcher: TypeAlias = Needle | Query | MultiNeedle | FuzzyNeedle
+"""The type of something that can be searched for."""
+
+### matcher.py ends here
@@ -0,0 +1,206 @@
+"""Provides a class for searching for many needles at once."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections import deque
+from collections.abc import Callable, Sequence
+from re import compile as compile_regexp
+from re import escape
+from typing import Final
+
+##############################################################################
+# Local imports.
+from .needle import InvalidNeedle, Needle
+
+##############################################################################
+SEPARATORS: Final = compile_regexp(r"[,\n]")
+"""Regular expression for splitting the text of a list of needles."""
+
+
+##############################################################################
+class Automaton:
+    """An Aho-Corasick automaton for finding many keywords in one pass."""
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        """Initialise the automaton.
+
+        Args:
+            keywords: The keywords to find.
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        """The transitions out of each state."""
+        self._fail: list[int] = [0]
+        """The state to fall back to when there's no transition."""
+        self._found: list[tuple[int, ...]] = [()]
+        """The indexes of the keywords found on reaching each state."""
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                if (next_state := self._goto[state].get(char)) is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._found.append(())
+                state = next_state
+            self._found[state] += (index,)
+        # Work out the failure transitions, breadth first, so that the
+        # failure state of any state has always been worked out first.
+        states = deque(self._goto[0].values())
+        while states:
+            state = states.popleft()
+            for char, next_state in self._goto[state].items():
+                states.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._found[next_state] += self._found[self._fail[next_state]]
+
+    def find(self, text: str) -> set[int]:
+        """Find the keywords within some text.
+
+        Args:
+            text: The text to look in.
+
+        Returns:
+            The indexes of all of the keywords that are in the text.
+        """
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._found[state])
+        return found
+
+    def pattern(self, state: int = 0) -> str:
+        """Get a regular expression that matches if any keyword is present.
+
+        Args:
+            state: The state to build the expression from.
+
+        Returns:
+            The regular expression.
+
+        Note:
+            The expression follows the shape of the trie of keywords, so
+            the cost of testing each position in some text depends on the
+            length of the keywords rather than how many there are.
+        """
+        if self._found[state] and state:
+            # A keyword ends here, so there's no need to look any further.
+            return ""
+        branches = [
+            escape(char) + self.pattern(next_state)
+            for char, next_state in sorted(self._goto[state].items())
+        ]
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+
+##############################################################################
+class MultiNeedle:
+    """The details of a search for many needles at once.
+
+    The needles are given as a single piece of text, with each needle
+    separated by a comma or a newline. Each line that contains any of the
+    needles is a hit, once for every needle it contains.
+    """
+
+    def __init__(self, text: str, ignore_case: bool, regex: bool = False) -> None:
+        """Initialise the needles.
+
+        Args:
+            text: The text of the needles to search for.
+            ignore_case: Should case be ignored?
+            regex: Are the needles regular expressions?
+
+        Raises:
+            InvalidNeedle: If the needles aren't valid.
+        """
+        if regex:
+            raise InvalidNeedle("A list of needles can't be regular expressions")
+        self.text: Final[str] = text
+        """The text of the needles to search for."""
+        self.ignore_case: Final[bool] = ignore_case
+        """Should case be ignored?"""
+        self.regex: Final[bool] = False
+        """Are the needles regular expressions?"""
+        needles: dict[str, Needle] = {}
+        for needle in SEPARATORS.split(text):
+            if needle := needle.strip():
+                needles.setdefault(
+                    needle.casefold() if ignore_case else needle,
+                    Needle(needle, ignore_case),
+                )
+        if not needles:
+            raise InvalidNeedle("There are no needles to search for")
+        self.needles: Final[tuple[Needle, ...]] = tuple(needles.values())
+        """The needles to search for."""
+        self._automaton = Automaton([needle.literal for needle in self.needles])
+        """The automaton for finding the needles within a line."""
+        self._any = compile_regexp(self._automaton.pattern())
+        """Regular expression for spotting any of the needles."""
+
+    def _haystack(self, text: str) -> str:
+        """Prepare some text for looking for the needles within.
+
+        Args:
+            text: The text to prepare.
+
+        Returns:
+            The prepared text.
+        """
+        return text.casefold() if self.ignore_case else text
+
+    def might_be_in(self, text: str) -> bool:
+        """Might there be a hit in the given text?
+
+        Args:
+            text: The plain text to check, which may be many lines.
+
+        Returns:
+            [`True`][True] if there might be a hit in the text,
+            [`False`][False] if there certainly isn't.
+        """
+        return self._any.search(self._haystack(text)) is not None
+
+    def might_be_found(self, contains: Callable[[str], bool]) -> bool:
+        """Might there be a hit, given a test for text being present?
+
+        Args:
+            contains: Function that reports if some text might be present.
+
+        Returns:
+            [`True`][True] if there might be a hit, [`False`][False] if
+            there certainly isn't.
+        """
+        return any(needle.might_be_found(contains) for needle in self.needles)
+
+    def hits_in(self, lines: list[str]) -> list[tuple[int, str | None]]:
+        """Find the hits within some lines.
+
+        Args:
+            lines: The plain text of the lines to check.
+
+        Returns:
+            The number of each line that is a hit, along with the needle
+            that was found in it if that's worth knowing.
+        """
+        return [
+            (line, self.needles[needle].text)
+            for line, text in enumerate(lines)
+            if self._any.search(haystack := self._haystack(text))
+            for needle in sorted(self._automaton.find(haystack))
+        ]
+
+    def __repr__(self) -> str:
+        """The representation of the needles."""
+        return f"MultiNeedle({self.text!r}, ignore_case={self.ignore_case})"
+
+
+### multi_needle.py ends here
@@ -0,0 +1,208 @@
+"""Provides a class that describes what is being searched for."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from re import IGNORECASE, Pattern
+from re import compile as compile_regexp
+from re import error as RegexpError
+from typing import Final
+
+##############################################################################
+OPTIONAL: Final[tuple[str, ...]] = ("?", "*", "{")
+"""The characters that make whatever comes before them optional."""
+
+##############################################################################
+ESCAPE_LENGTHS: Final[dict[str, int]] = {"x": 2, "u": 4, "U": 8}
+"""The number of characters that follow some escapes."""
+
+##############################################################################
+REPEAT: Final = compile_regexp(r"\{\d*(?:,\d*)?\}")
+"""Regular expression that matches a repeat count within a pattern."""
+
+##############################################################################
+SPECIAL: Final[str] = ".^$*+?{}()[]\\|"
+"""Characters that have a special meaning within a regular expression."""
+
+
+##############################################################################
+class InvalidNeedle(Exception):
+    """Exception raised if the needle isn't valid."""
+
+
+##############################################################################
+def required_literal(pattern: str) -> str:
+    """Find some literal text that any match of a pattern must contain.
+
+    Args:
+        pattern: The regular expression pattern.
+
+    Returns:
+        The longest literal text found, or an empty string if none could
+        be found.
+
+    Note:
+        This is deliberately cautious; it only looks at the top level of
+        the pattern, and gives up on any pattern with alternatives or
+        inline flags. Finding no literal text is always safe, finding text
+        that isn't actually required would cause hits to be missed.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return ""
+    literals: list[str] = []
+    literal = ""
+    depth = 0
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        position += 1
+        if char == "\\":
+            # An escaped letter or number is a class, an anchor or a back
+            # reference; anything else is a literal.
+            escaped = pattern[position : position + 1]
+            char = "" if escaped.isalnum() else escaped
+            position += 1
+            # Some escapes are followed by more characters that are part of
+            # the escape, which we need to be sure to skip.
+            if escaped in ESCAPE_LENGTHS:
+                position += ESCAPE_LENGTHS[escaped]
+            elif escaped == "N":
+                position = pattern.find("}", position) + 1 or len(pattern)
+            elif escaped.isdigit():
+                while pattern[position : position + 1].isdigit():
+                    position += 1
+        elif char == "[":
+            # Skip over the whole of a set of characters.
+            position += pattern[position:].startswith("^")
+            position += pattern[position:].startswith("]")
+            while position < len(pattern) and pattern[position] != "]":
+                position += 2 if pattern[position] == "\\" else 1
+            position += 1
+            char = ""
+        elif char == "{" and (repeat := REPEAT.match(pattern, position - 1)):
+            # Skip over the whole of a repeat count.
+            position = repeat.end()
+            char = ""
+        elif char in SPECIAL:
+            depth += (char == "(") - (char == ")")
+            char = ""
+        if depth or pattern[position : position + 1] in OPTIONAL:
+            char = ""
+        if char:
+            literal += char
+        else:
+            literals.append(literal)
+            literal = ""
+    literals.append(literal)
+    return max(literals, key=len)
+
+
+##############################################################################
+class Needle:
+    """The details of what is being searched for."""
+
+    def __init__(self, text: str, ignore_case: bool, regex: bool = False) -> None:
+        """Initialise the needle.
+
+        Args:
+            text: The text to search for.
+            ignore_case: Should case be ignored?
+            regex: Is the text a regular expression?
+
+        Raises:
+            InvalidNeedle: If the text is not a valid regular expression.
+        """
+        self.text: Final[str] = text
+        """The text to search for."""
+        self.ignore_case: Final[bool] = ignore_case
+        """Should case be ignored?"""
+        self.regex: Final[bool] = regex
+        """Is the text a regular expression?"""
+        self._pattern: Pattern[str] | None = None
+        """The compiled regular expression, if this is a regex search."""
+        if regex:
+            try:
+                self._pattern = compile_regexp(text, IGNORECASE if ignore_case else 0)
+            except RegexpError as error:
+                raise InvalidNeedle(str(error)) from None
+        literal = required_literal(text) if regex else text
+        self.literal: Final[str] = literal.casefold() if ignore_case else literal
+        """Literal text that must be present for there to be a hit.
+
+        Note:
+            If case is being ignored this will have been casefolded.
+        """
+
+    def _haystack(self, text: str) -> str:
+        """Prepare some text for looking for the literal within.
+
+        Args:
+            text: The text to prepare.
+
+        Returns:
+            The prepared text.
+        """
+        return text.casefold() if self.ignore_case else text
+
+    def might_be_in(self, text: str) -> bool:
+        """Might there be a hit in the given text?
+
+        Args:
+            text: The plain text to check, which may be many lines.
+
+        Returns:
+            [`True`][True] if there might be a hit in the text,
+            [`False`][False] if there certainly isn't.
+        """
+        return self.literal in self._haystack(text)
+
+    def might_be_found(self, contains: Callable[[str], bool]) -> bool:
+        """Might there be a hit, given a test for text being present?
+
+        Args:
+            contains: Function that reports if some text might be present.
+
+        Returns:
+            [`True`][True] if there might be a hit, [`False`][False] if
+            there certainly isn't.
+        """
+        return contains(self.literal)
+
+    def found_in(self, line: str) -> bool:
+        """Is there a hit in the given line?
+
+        Args:
+            line: The plain text of the line to check.
+
+        Returns:
+            [`True`][True] if there is a hit in the line, [`False`][False]
+            if not.
+        """
+        if self._pattern is None:
+            return self.literal in self._haystack(line)
+        return self.might_be_in(line) and self._pattern.search(line) is not None
+
+    def hits_in(self, lines: list[str]) -> list[tuple[int, str | None]]:
+        """Find the hits within some lines.
+
+        Args:
+            lines: The plain text of the lines to check.
+
+        Returns:
+            The number of each line that is a hit, along with the needle
+            that was found in it if that's worth knowing.
+        """
+        return [(line, None) for line, text in enumerate(lines) if self.found_in(text)]
+
+    def __repr__(self) -> str:
+        """The representation of the needle."""
+        return (
+            f"Needle({self.text!r}, ignore_case={self.ignore_case}, regex={self.regex})"
+        )
+
+
+### needle.py ends here
@@ -0,0 +1,237 @@
+"""Provides a method of searching guides using a pool of processes."""
+
+##############################################################################
+# Python imports.
+import sys
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing import get_context, resource_tracker
+from multiprocessing.synchronize import Event
+from os import cpu_count
+from pathlib import Path
+from typing import Any, Final
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError
+
+##############################################################################
+# Typing extension imports.
+from typing_extensions import Self
+
+##############################################################################
+# Local imports.
+from .matcher import Matcher
+from .scanner import ScanResult, entry_ranges, search_range
+
+##############################################################################
+POLL_INTERVAL: Final[float] = 0.1
+"""How often to check for cancellation while waiting for results."""
+
+##############################################################################
+RANGES_AHEAD: Final[int] = 2
+"""How many ranges, per process, to have in hand for the guides yet to be collected."""
+
+##############################################################################
+_stopped: Event | None = None
+"""The flag, within a searching process, that says the search has been stopped."""
+
+
+##############################################################################
+def _share_stop(stopped: Event) -> None:
+    """Make the stop flag of a search available within a searching process.
+
+    Args:
+        stopped: The flag that says the search has been stopped.
+    """
+    global _stopped
+    _stopped = stopped
+
+
+##############################################################################
+def _search_range(
+    guide: Path, needle: Matcher, start: int | None, end: int | None
+) -> ScanResult:
+    """Search a range of entries within a guide, within a searching process.
+
+    Args:
+        guide: The location of the guide to search.
+        needle: What to search for.
+        start: The optional offset of the entry to start at.
+        end: The optional offset at which to stop.
+
+    Returns:
+        The result of searching the range.
+    """
+    return search_range(
+        guide,
+        needle,
+        start,
+        end,
+        (lambda: False) if _stopped is None else _stopped.is_set,
+    )
+
+
+##############################################################################
+class ParallelSearch:
+    """Searches guides for some text, spread over a pool of processes.
+
+    Guides are submitted in the order their results will be collected, but
+    are only handed to the pool a few at a time, as results are collected,
+    so that no more of the guides are looked at than is needed to keep the
+    processes busy. Large guides are split into ranges of entries so that
+    they can be searched by more than one process at once.
+
+    Cancelling the search stops the ranges being searched by the processes
+    as well as any that haven't been started yet.
+    """
+
+    def __init__(self, needle: Matcher, jobs: int | None = None) -> None:
+        """Initialise the parallel search.
+
+        Args:
+            needle: What to search for.
+            jobs: The number of processes to use; [`None`][None] for one
+                per CPU.
+        """
+        self._needle = needle
+        """What to search for."""
+        self._ensure_resource_tracker()
+        context = get_context("spawn")
+        self._stopped = context.Event()
+        """Flag to tell the processes that the search has been stopped."""
+        self._pool = ProcessPoolExecutor(
+            jobs,
+            mp_context=context,
+            initializer=_share_stop,
+            initargs=(self._stopped,),
+        )
+        """The pool of processes that do the searching."""
+        self._ahead = (jobs or cpu_count() or 1) * RANGES_AHEAD
+        """The number of ranges to have in hand for the guides yet to be collected."""
+        self._queued: deque[Path] = deque()
+        """The guides that have been submitted but not yet handed to the pool."""
+        self._searches: dict[Path, list[Future[ScanResult]] | Exception] = {}
+        """The pending searches for each guide, or why it couldn't be searched."""
+
+    @staticmethod
+    def _ensure_resource_tracker() -> None:
+        """Ensure that multiprocessing's resource tracker is running.
+
+        Note:
+            The resource tracker hands its process a copy of `stderr`; if
+            we're running within a Textual application `stderr` will have
+            been captured and won't have a usable file descriptor, so here
+            we make sure the tracker gets started with the real `stderr`.
+        """
+        stderr, sys.stderr = sys.stderr, sys.__stderr__
+        try:
+            resource_tracker.ensure_running()
+        finally:
+            sys.stderr = stderr
+
+    def submit(self, guide: Path) -> None:
+        """Submit a guide to be searched.
+
+        Args:
+            guide: The location of the guide to search.
+
+        Note:
+            Guides must be submitted in the order their results will be
+            collected. The guide is only handed to the pool once it's
+            close to having its results collected.
+        """
+        self._queued.append(guide)
+
+    def _in_hand(self) -> int:
+        """Get the number of ranges in hand for guides yet to be collected.
+
+        Returns:
+            The number of ranges.
+        """
+        return sum(
+            len(searches)
+            for searches in self._searches.values()
+            if isinstance(searches, list)
+        )
+
+    def _hand_over(self, wanted: Path | None = None) -> None:
+        """Hand queued guides to the pool.
+
+        Args:
+            wanted: Optional guide that is wanted now, and so must be
+                handed over.
+
+        Note:
+            Guides are handed over until there are enough ranges in hand
+            to keep the processes busy; only the guide that's wanted, and
+            any guides queued before it, are handed over regardless.
+        """
+        while self._queued and (
+            self._in_hand() < self._ahead
+            or (wanted is not None and wanted not in self._searches)
+        ):
+            guide = self._queued.popleft()
+            try:
+                self._searches[guide] = [
+                    self._pool.submit(_search_range, guide, self._needle, start, end)
+                    for start, end in entry_ranges(guide)
+                ]
+            except (OSError, NGDBError) as error:
+                self._searches[guide] = error
+
+    def results(
+        self, guide: Path, cancelled: Callable[[], bool] = lambda: False
+    ) -> Iterator[ScanResult]:
+        """Get the results of searching a guide.
+
+        Args:
+            guide: The location of a guide that was submitted.
+            cancelled: A function that reports if the search was cancelled.
+
+        Yields:
+            The result of searching each range of the guide, in order.
+
+        Raises:
+            OSError: If there was a problem reading the guide.
+            NGDBError: If there was a problem reading the guide.
+            BrokenProcessPool: If the process pool failed.
+        """
+        if guide in self._queued:
+            self._hand_over(guide)
+        if isinstance(searches := self._searches.pop(guide, []), Exception):
+            raise searches
+        for search in searches:
+            while True:
+                if cancelled():
+                    self.cancel()
+                    return
+                try:
+                    result = search.result(POLL_INTERVAL)
+                    break
+                except FutureTimeoutError:
+                    pass
+            # Keep the processes busy with the guides that follow while
+            # the results of this one are being looked at.
+            self._hand_over()
+            yield result
+
+    def cancel(self) -> None:
+        """Cancel any searches that haven't finished yet."""
+        self._stopped.set()
+        self._queued.clear()
+        self._searches.clear()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        """Handle entry to context."""
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Handle exit from context."""
+        self.cancel()
+
+
+### parallel.py ends here
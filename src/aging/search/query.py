@@ -0,0 +1,421 @@
+"""Provides boolean queries made up of many needles."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection, Iterator
+from re import compile as compile_regexp
+from typing import Final, TypeAlias
+
+##############################################################################
+# Local imports.
+from .needle import InvalidNeedle, Needle
+
+##############################################################################
+TOKENS: Final = compile_regexp(r'\s*(?:(\()|(\))|"([^"]*)("?)|([^\s()"]+))')
+"""Regular expression for pulling the tokens out of a query."""
+
+##############################################################################
+Truth: TypeAlias = bool | None
+"""A truth value, where [`None`][None] means that it isn't known."""
+
+
+##############################################################################
+class Node(ABC):
+    """Base class for the nodes of a parsed query."""
+
+    @abstractmethod
+    def evaluate(self, value: Callable[[Needle], Truth]) -> Truth:
+        """Evaluate the node.
+
+        Args:
+            value: Function that gives the truth value for a term.
+
+        Returns:
+            The truth value of the node.
+        """
+
+    @abstractmethod
+    def terms(self, positive: bool = True) -> Iterator[tuple[Needle, bool]]:
+        """The terms within the node.
+
+        Args:
+            positive: Is the node itself positive (not negated)?
+
+        Yields:
+            Each term along with a flag to say if it is positive.
+        """
+
+
+##############################################################################
+class Term(Node):
+    """A term within a query."""
+
+    def __init__(self, needle: Needle) -> None:
+        """Initialise the term.
+
+        Args:
+            needle: The needle for the term.
+        """
+        self.needle = needle
+        """The needle for the term."""
+
+    def evaluate(self, value: Callable[[Needle], Truth]) -> Truth:
+        """Evaluate the term.
+
+        Args:
+            value: Function that gives the truth value for a term.
+
+        Returns:
+            The truth value of the term.
+        """
+        return value(self.needle)
+
+    def terms(self, positive: bool = True) -> Iterator[tuple[Needle, bool]]:
+        """The terms within the node.
+
+        Args:
+            positive: Is the node itself positive (not negated)?
+
+        Yields:
+            Each term along with a flag to say if it is positive.
+        """
+        yield self.needle, positive
+
+
+##############################################################################
+class Not(Node):
+    """The negation of part of a query."""
+
+    def __init__(self, node: Node) -> None:
+        """Initialise the negation.
+
+        Args:
+            node: The node being negated.
+        """
+        self.node = node
+        """The node being negated."""
+
+    def evaluate(self, value: Callable[[Needle], Truth]) -> Truth:
+        """Evaluate the negation.
+
+        Args:
+            value: Function that gives the truth value for a term.
+
+        Returns:
+            The truth value of the negation.
+        """
+        return None if (truth := self.node.evaluate(value)) is None else not truth
+
+    def terms(self, positive: bool = True) -> Iterator[tuple[Needle, bool]]:
+        """The terms within the node.
+
+        Args:
+            positive: Is the node itself positive (not negated)?
+
+        Yields:
+            Each term along with a flag to say if it is positive.
+        """
+        yield from self.node.terms(not positive)
+
+
+##############################################################################
+class And(Node):
+    """Parts of a query that must all be true."""
+
+    def __init__(self, nodes: list[Node]) -> None:
+        """Initialise the conjunction.
+
+        Args:
+            nodes: The nodes that must all be true.
+        """
+        self.nodes = nodes
+        """The nodes that must all be true."""
+
+    def evaluate(self, value: Callable[[Needle], Truth]) -> Truth:
+        """Evaluate the conjunction.
+
+        Args:
+            value: Function that gives the truth value for a term.
+
+        Returns:
+            The truth value of the conjunction.
+        """
+        truths = [node.evaluate(value) for node in self.nodes]
+        return False if False in truths else None if None in truths else True
+
+    def terms(self, positive: bool = True) -> Iterator[tuple[Needle, bool]]:
+        """The terms within the node.
+
+        Args:
+            positive: Is the node itself positive (not negated)?
+
+        Yields:
+            Each term along with a flag to say if it is positive.
+        """
+        for node in self.nodes:
+            yield from node.terms(positive)
+
+
+##############################################################################
+class Or(And):
+    """Parts of a query where at least one must be true."""
+
+    def evaluate(self, value: Callable[[Needle], Truth]) -> Truth:
+        """Evaluate the disjunction.
+
+        Args:
+            value: Function that gives the truth value for a term.
+
+        Returns:
+            The truth value of the disjunction.
+        """
+        truths = [node.evaluate(value) for node in self.nodes]
+        return True if True in truths else None if None in truths else False
+
+
+##############################################################################
+class Query:
+    """A boolean query made up of many needles.
+
+    A query is made up of terms, which can be joined with `AND` (which is
+    also assumed if there's nothing between two terms), `OR`, and `NOT`,
+    and grouped with brackets. A term is either a single word or some text
+    in double quotes. The query is tested against each entry as a whole,
+    with the hits being the lines of matching entries that contain any of
+    the terms that aren't negated.
+    """
+
+    def __init__(self, text: str, ignore_case: bool, regex: bool = False) -> None:
+        """Initialise the query.
+
+        Args:
+            text: The text of the query.
+            ignore_case: Should case be ignored?
+            regex: Are the terms regular expressions?
+
+        Raises:
+            InvalidNeedle: If the query isn't valid.
+        """
+        self.text: Final[str] = text
+        """The text of the query."""
+        self.ignore_case: Final[bool] = ignore_case
+        """Should case be ignored?"""
+        self.regex: Final[bool] = regex
+        """Are the terms regular expressions?"""
+        self._needles: dict[str, Needle] = {}
+        """The needles for the terms, keyed by their text."""
+        self._tokens = self._tokenise(text)
+        """The tokens left to parse."""
+        self._query = self._or()
+        """The parsed query."""
+        if self._tokens:
+            raise InvalidNeedle(f"Unexpected {self._tokens[0][1]!r} in query")
+        terms = list(self._query.terms())
+        self.terms: Final[tuple[Needle, ...]] = tuple(
+            dict.fromkeys(needle for needle, _ in terms)
+        )
+        """All of the terms in the query."""
+        self.positive: Final[tuple[Needle, ...]] = tuple(
+            dict.fromkeys(needle for needle, positive in terms if positive)
+        )
+        """The terms in the query that aren't negated."""
+        if not self.positive:
+            raise InvalidNeedle("A query needs at least one term that isn't negated")
+
+    @staticmethod
+    def _tokenise(text: str) -> list[tuple[str, str]]:
+        """Split the text of a query into tokens.
+
+        Args:
+            text: The text to split.
+
+        Returns:
+            A list of the kind of each token, and its text.
+
+        Raises:
+            InvalidNeedle: If there is an unterminated phrase.
+        """
+        tokens: list[tuple[str, str]] = []
+        for opening, closing, phrase, quote, word in TOKENS.findall(text):
+            if opening or closing:
+                tokens.append(("bracket", opening or closing))
+            elif word:
+                tokens.append(
+                    ("operator", word)
+                    if word in ("AND", "OR", "NOT")
+                    else ("term", word)
+                )
+            elif not quote:
+                raise InvalidNeedle("Unterminated phrase in query")
+            elif phrase:
+                tokens.append(("term", phrase))
+        return tokens
+
+    def _next_is(self, kind: str, text: str | None = None) -> bool:
+        """Is the next token of the given kind?
+
+        Args:
+            kind: The kind of token.
+            text: Optional text the token must have.
+
+        Returns:
+            [`True`][True] if it is, [`False`][False] if not.
+        """
+        return bool(self._tokens) and (
+            self._tokens[0][0] == kind and (text is None or self._tokens[0][1] == text)
+        )
+
+    def _or(self) -> Node:
+        """Parse a disjunction.
+
+        Returns:
+            The parsed node.
+        """
+        nodes = [self._and()]
+        while self._next_is("operator", "OR"):
+            self._tokens.pop(0)
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else Or(nodes)
+
+    def _and(self) -> Node:
+        """Parse a conjunction.
+
+        Returns:
+            The parsed node.
+        """
+        nodes = [self._not()]
+        while self._tokens and not (
+            self._next_is("operator", "OR") or self._next_is("bracket", ")")
+        ):
+            if self._next_is("operator", "AND"):
+                self._tokens.pop(0)
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else And(nodes)
+
+    def _not(self) -> Node:
+        """Parse a negation.
+
+        Returns:
+            The parsed node.
+        """
+        if self._next_is("operator", "NOT"):
+            self._tokens.pop(0)
+            return Not(self._not())
+        return self._term()
+
+    def _term(self) -> Node:
+        """Parse a term.
+
+        Returns:
+            The parsed node.
+
+        Raises:
+            InvalidNeedle: If a term was expected but not found.
+        """
+        if not self._tokens:
+            raise InvalidNeedle("Unexpected end of query")
+        kind, text = self._tokens.pop(0)
+        if kind == "term":
+            if text not in self._needles:
+                self._needles[text] = Needle(text, self.ignore_case, self.regex)
+            return Term(self._needles[text])
+        if (kind, text) == ("bracket", "("):
+            node = self._or()
+            if not self._next_is("bracket", ")"):
+                raise InvalidNeedle("Missing ')' in query")
+            self._tokens.pop(0)
+            return node
+        raise InvalidNeedle(f"Unexpected {text!r} in query")
+
+    def matches(self, present: Collection[Needle]) -> bool:
+        """Does the query match, given the terms that are present?
+
+        Args:
+            present: The terms that are present.
+
+        Returns:
+            [`True`][True] if the query matches, [`False`][False] if not.
+        """
+        return bool(self._query.evaluate(lambda needle: needle in present))
+
+    def might_be_in(self, text: str) -> bool:
+        """Might there be a hit in the given text?
+
+        Args:
+            text: The plain text to check, which may be many lines.
+
+        Returns:
+            [`True`][True] if there might be a hit in the text,
+            [`False`][False] if there certainly isn't.
+        """
+
+        def value(needle: Needle) -> Truth:
+            """Get what we know about a term being in the text.
+
+            Args:
+                needle: The term to check.
+
+            Returns:
+                The truth of the term being in the text.
+            """
+            # We only know for sure that a regular expression term is in
+            # the text by looking at every line, so we don't know yet.
+            if needle.might_be_in(text):
+                return None if needle.regex else True
+            return False
+
+        return self._query.evaluate(value) is not False
+
+    def might_be_found(self, contains: Callable[[str], bool]) -> bool:
+        """Might there be a hit, given a test for text being present?
+
+        Args:
+            contains: Function that reports if some text might be present.
+
+        Returns:
+            [`True`][True] if there might be a hit, [`False`][False] if
+            there certainly isn't.
+        """
+        return (
+            self._query.evaluate(
+                lambda needle: None if needle.might_be_found(contains) else False
+            )
+            is not False
+        )
+
+    def hits_in(self, lines: list[str]) -> list[tuple[int, str | None]]:
+        """Find the hits within some lines.
+
+        Args:
+            lines: The plain text of the lines to check.
+
+        Returns:
+            The number of each line that is a hit, along with the needle
+            that was found in it if that's worth knowing.
+        """
+        found = {
+            needle: [line for line, text in enumerate(lines) if needle.found_in(text)]
+            for needle in self.terms
+        }
+        if not self.matches([needle for needle, hits in found.items() if hits]):
+            return []
+        return [
+            (line, None)
+            for line in sorted(
+                {line for needle in self.positive for line in found[needle]}
+            )
+        ]
+
+    def __repr__(self) -> str:
+        """The representation of the query."""
+        return (
+            f"Query({self.text!r}, ignore_case={self.ignore_case}, regex={self.regex})"
+        )
+
+
+### query.py ends here
@@ -0,0 +1,242 @@
+"""Provides the code for ranking the hits of a search by relevance."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections import Counter
+from collections.abc import Callable, Collection
+from math import log
+from pathlib import Path
+from typing import Final, NamedTuple, TypeAlias
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError, NortonGuide
+
+##############################################################################
+# Local imports.
+from ..data import SearchHits
+from .fuzzy import FuzzyNeedle
+from .matcher import Matcher
+from .scanner import raw_entries
+
+##############################################################################
+K1: Final[float] = 1.2
+"""How quickly repeated hits in an entry stop adding to its score."""
+
+##############################################################################
+B: Final[float] = 0.75
+"""How much the length of an entry counts against its score."""
+
+##############################################################################
+MENU_BOOST: Final[float] = 2.0
+"""How much a hit in a menu that leads to an entry adds to its score."""
+
+##############################################################################
+FIRST_LINE_BOOST: Final[float] = 1.5
+"""How much a hit in the first line of an entry adds to its score."""
+
+
+##############################################################################
+class EntryStatistics(NamedTuple):
+    """The statistics for an entry in a guide, used when ranking hits."""
+
+    lines: int
+    """The number of lines in the entry."""
+    first_line: str
+    """The plain text of the first non-empty line of the entry."""
+
+
+##############################################################################
+class GuideStatistics(NamedTuple):
+    """The statistics for a guide, used when ranking hits."""
+
+    entries: int
+    """The number of entries in the guide."""
+    lines: int
+    """The number of lines in the guide."""
+    described: dict[int, EntryStatistics]
+    """The statistics for the entries that were asked about."""
+
+
+##############################################################################
+StatisticsSource: TypeAlias = Callable[[Path, Collection[int]], GuideStatistics]
+"""The type of a function that gets the statistics for a guide."""
+
+
+##############################################################################
+def scanned_statistics(guide: Path, entries: Collection[int]) -> GuideStatistics:
+    """Get the statistics for a guide by scanning it.
+
+    Args:
+        guide: The location of the guide.
+        entries: The offsets of the entries to describe.
+
+    Returns:
+        The statistics for the guide.
+
+    Raises:
+        OSError: If there was a problem reading the guide.
+        NGDBError: If there was a problem reading the guide.
+    """
+    total_entries = total_lines = 0
+    described: dict[int, EntryStatistics] = {}
+    with NortonGuide(guide) as source:
+        for entry in raw_entries(source):
+            total_entries += 1
+            total_lines += entry.lines
+            if entry.offset in entries:
+                described[entry.offset] = EntryStatistics(
+                    entry.lines,
+                    next((line for line in entry.text.split("\n") if line.strip()), ""),
+                )
+    return GuideStatistics(total_entries, total_lines, described)
+
+
+##############################################################################
+def menu_prompts(guide: Path) -> dict[int, list[str]]:
+    """Get the menu text that leads to each entry in a guide.
+
+    Args:
+        guide: The location of the guide.
+
+    Returns:
+        The title and prompt of every menu option, keyed by the offset of
+        the entry the option leads to.
+    """
+    prompts: dict[int, list[str]] = {}
+    try:
+        with NortonGuide(guide) as source:
+            for menu in source.menus:
+                for prompt, offset in zip(menu.prompts, menu.offsets, strict=True):
+                    prompts.setdefault(offset, []).extend((menu.title, prompt))
+    except (OSError, NGDBError):
+        pass
+    return prompts
+
+
+##############################################################################
+def rank(hits: SearchHits, needle: Matcher, statistics: StatisticsSource) -> SearchHits:
+    """Rank the hits of a search by relevance.
+
+    Args:
+        hits: The hits to rank.
+        needle: What was searched for.
+        statistics: The function to get the statistics for each guide.
+
+    Returns:
+        The hits, with the hits of the most relevant entries first.
+
+    Raises:
+        OSError: If there was a problem reading a guide.
+        NGDBError: If there was a problem reading a guide.
+        SearchIndexError: If there was a problem reading the search index.
+
+    Note:
+        Each entry with hits is given a BM25 score, treating each needle
+        as a term and each line it was found in as an occurrence of that
+        term. The score is boosted for a hit in a menu prompt that leads
+        to the entry, or for a hit in the first line of the entry. The
+        hits of a fuzzy search count for less the further they are from
+        the needle. The hits within each entry are kept in the order they
+        were found.
+    """
+    # Only the positions of the hits in each entry are kept, and what was
+    # found in each entry is counted as we go, so that the hits don't all
+    # have to be held as individual hits while they're ranked.
+    found: dict[tuple[Path, int], list[int]] = {}
+    frequencies: dict[tuple[Path, int], Counter[str]] = {}
+    for position, hit in enumerate(hits):
+        found.setdefault(entry := (hit.guide, hit.entry_offset), []).append(position)
+        frequencies.setdefault(entry, Counter())[hit.needle or needle.text] += 1
+    offsets: dict[Path, set[int]] = {}
+    for guide, offset in found:
+        offsets.setdefault(guide, set()).add(offset)
+    guides = {guide: statistics(guide, entries) for guide, entries in offsets.items()}
+    menus = {guide: menu_prompts(guide) for guide in guides}
+    total_entries = max(sum(guide.entries for guide in guides.values()), 1)
+    average_lines = max(sum(guide.lines for guide in guides.values()), 1) / (
+        total_entries
+    )
+
+    # Count how many entries each term turns up in.
+    entry_counts: Counter[str] = Counter()
+    for frequency in frequencies.values():
+        entry_counts.update(frequency.keys())
+
+    def weight(term: str | None) -> float:
+        """Get the weight of a term, based on how rare it is.
+
+        Args:
+            term: The term to get the weight of.
+
+        Returns:
+            The weight of the term.
+        """
+        entries = entry_counts[term or needle.text]
+        rarity = log((total_entries - entries + 0.5) / (entries + 0.5) + 1)
+        if isinstance(needle, FuzzyNeedle):
+            rarity *= needle.similarity(term)
+        return rarity
+
+    def score(entry: tuple[Path, int]) -> float:
+        """Score an entry for relevance.
+
+        Args:
+            entry: The guide and offset of the entry to score.
+
+        Returns:
+            The score for the entry.
+        """
+        guide, offset = entry
+        described = guides[guide].described.get(offset, EntryStatistics(1, ""))
+        length = 1 - B + B * described.lines / average_lines
+        relevance = sum(
+            weight(term) * (count * (K1 + 1)) / (count + K1 * length)
+            for term, count in frequencies[entry].items()
+        )
+        relevance += MENU_BOOST * sum(
+            weight(term) for _, term in needle.hits_in(menus[guide].get(offset, []))
+        )
+        relevance += FIRST_LINE_BOOST * sum(
+            weight(term) for _, term in needle.hits_in([described.first_line])
+        )
+        return relevance
+
+    return hits.reordered(
+        position
+        for entry in sorted(found, key=score, reverse=True)
+        for position in found[entry]
+    )
+
+
+##############################################################################
+def closest_first(hits: SearchHits, needle: FuzzyNeedle) -> SearchHits:
+    """Order the hits of a fuzzy search so the closest matches come first.
+
+    Args:
+        hits: The hits to order.
+        needle: What was searched for.
+
+    Returns:
+        The hits, with those whose words are closest to the needle first.
+
+    Note:
+        Hits that are as close as each other are kept in the order they
+        were found.
+    """
+    similarities: dict[str | None, float] = {}
+    closeness: list[float] = []
+    for hit in hits:
+        if (similarity := similarities.get(hit.needle)) is None:
+            similarity = similarities[hit.needle] = needle.similarity(hit.needle)
+        closeness.append(similarity)
+    return hits.reordered(
+        sorted(range(len(closeness)), key=lambda position: -closeness[position])
+    )
+
+
+### ranking.py ends here
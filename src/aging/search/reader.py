@@ -0,0 +1,233 @@
+"""Provides a method of reading guides ahead of them being searched."""
+
+##############################################################################
+# Backward compatibility.
+from __future__ import annotations
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Condition, Event, Thread
+from typing import Any, Final, TypeAlias
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError, NortonGuide
+
+##############################################################################
+# Typing extension imports.
+from typing_extensions import Self
+
+##############################################################################
+# Local imports.
+from .scanner import DECRYPT, RANGE_SIZE
+
+##############################################################################
+READERS: Final[int] = 2
+"""The number of threads that read the guides."""
+
+##############################################################################
+POLL_INTERVAL: Final[float] = 0.1
+"""How often to check for the reading being stopped while waiting."""
+
+##############################################################################
+Chunk: TypeAlias = tuple[int, bytes]
+"""The offset within a guide of a chunk of decrypted data, and the data."""
+
+##############################################################################
+Read: TypeAlias = tuple[Path, Chunk | Exception | None]
+"""A chunk read from a guide; an error if it couldn't be read; `None` at the end."""
+
+
+##############################################################################
+class GuideReader:
+    """Reads guides ahead of them being searched.
+
+    The entries of each guide are read, in chunks, by a small number of
+    threads and handed over to be searched through a queue. While one
+    chunk is being searched the next ones are being read, so the time spent
+    waiting on storage overlaps with the time spent searching.
+
+    Each queue only holds so many chunks; once a queue is full its reader
+    waits for the search to catch up, so only so much of the guides is
+    ever held in memory at once. Likewise a guide is only read once it's
+    within one guide per reader of the guide being searched, so if the
+    search stops early, little is read that isn't needed.
+    """
+
+    def __init__(
+        self,
+        guides: Sequence[Path],
+        depth: int,
+        readers: int = READERS,
+        size: int = RANGE_SIZE,
+    ) -> None:
+        """Initialise the reader.
+
+        Args:
+            guides: The locations of the guides to read, in the order they
+                will be searched.
+            depth: The most chunks each reader will read ahead.
+            readers: The number of threads to read the guides with.
+            size: The size in bytes of each chunk.
+        """
+        self._position = {guide: position for position, guide in enumerate(guides)}
+        """The position of each guide in the order they are read."""
+        self._stopped = Event()
+        """Flag to say that reading should stop."""
+        self._searching = -1
+        """The position of the guide being searched."""
+        self._moved_on = Condition()
+        """Condition to signal that the search has moved on to another guide."""
+        self._queues: list[Queue[Read]] = [
+            Queue(max(depth, 1)) for _ in range(max(min(readers, len(guides)), 1))
+        ]
+        """The queues of reads, one for each reader."""
+        self._readers = [
+            Thread(
+                target=self._read,
+                args=(guides[reader :: len(self._queues)], queue, size),
+                name=f"GuideReader-{reader}",
+                daemon=True,
+            )
+            for reader, queue in enumerate(self._queues)
+        ]
+        """The threads that read the guides."""
+        for reader in self._readers:
+            reader.start()
+
+    def _put(self, queue: Queue[Read], read: Read) -> bool:
+        """Put a read on a queue, waiting for room if need be.
+
+        Args:
+            queue: The queue to put the read on.
+            read: The read to put on the queue.
+
+        Returns:
+            [`True`][True] if the read was queued, [`False`][False] if
+            reading was stopped first.
+        """
+        while not self._stopped.is_set():
+            try:
+                queue.put(read, timeout=POLL_INTERVAL)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _read(self, guides: Sequence[Path], queue: Queue[Read], size: int) -> None:
+        """Read guides, in order, putting the chunks on a queue.
+
+        Args:
+            guides: The locations of the guides to read.
+            queue: The queue to put the chunks on.
+            size: The size in bytes of each chunk.
+        """
+        for guide in guides:
+            if not self._wait_for(guide):
+                return
+            try:
+                with NortonGuide(guide) as source:
+                    offset = source.first_entry
+                if offset >= 0:
+                    with guide.open("rb") as data:
+                        data.seek(offset)
+                        while chunk := data.read(size):
+                            if not self._put(
+                                queue, (guide, (offset, chunk.translate(DECRYPT)))
+                            ):
+                                return
+                            offset += len(chunk)
+                if not self._put(queue, (guide, None)):
+                    return
+            except (OSError, NGDBError) as error:
+                if not self._put(queue, (guide, error)):
+                    return
+
+    def _wait_for(self, guide: Path) -> bool:
+        """Wait for the search to get close enough to a guide to read it.
+
+        Args:
+            guide: The location of the guide to wait for.
+
+        Returns:
+            [`True`][True] if the guide should be read, [`False`][False] if
+            reading was stopped first.
+        """
+        with self._moved_on:
+            while not self._stopped.is_set() and self._position[
+                guide
+            ] > self._searching + len(self._queues):
+                self._moved_on.wait(POLL_INTERVAL)
+        return not self._stopped.is_set()
+
+    def __contains__(self, guide: object) -> bool:
+        """Is the given guide one of the guides being read?
+
+        Args:
+            guide: The location of the guide to check.
+
+        Returns:
+            [`True`][True] if the guide is being read, [`False`][False] if
+            not.
+        """
+        return guide in self._position
+
+    def chunks(
+        self, guide: Path, cancelled: Callable[[], bool] = lambda: False
+    ) -> Iterator[Chunk]:
+        """Get the chunks read from a guide.
+
+        Args:
+            guide: The location of the guide to get the chunks of.
+            cancelled: A function that reports if the search was cancelled.
+
+        Yields:
+            The offset and decrypted data of each chunk of the guide's
+            entries, in order.
+
+        Raises:
+            OSError: If there was a problem reading the guide.
+            NGDBError: If there was a problem reading the guide.
+
+        Note:
+            The guides must be asked for in the order they were given; any
+            guides that are passed over are thrown away. If the chunks of a
+            guide aren't all taken, the rest are thrown away once the next
+            guide is asked for.
+        """
+        with self._moved_on:
+            self._searching = max(self._searching, self._position[guide])
+            self._moved_on.notify_all()
+        queue = self._queues[self._position[guide] % len(self._queues)]
+        while not cancelled():
+            try:
+                location, read = queue.get(timeout=POLL_INTERVAL)
+            except Empty:
+                continue
+            if location != guide:
+                continue
+            if read is None:
+                return
+            if isinstance(read, Exception):
+                raise read
+            yield read
+
+    def stop(self) -> None:
+        """Stop reading the guides."""
+        self._stopped.set()
+        for reader in self._readers:
+            reader.join()
+
+    def __enter__(self) -> Self:
+        """Handle entry to context."""
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Handle exit from context."""
+        self.stop()
+
+
+### reader.py ends here
@@ -2,12 +2,13 @@
 
 ##############################################################################
 # Local imports.
+from .counter import PROGRESS_INTERVAL, Counter
 from .entry_viewer import EntryViewer
 from .guide_directory import GuideDirectory
 from .guide_menu import GuideMenu
 
 ##############################################################################
 # Exports.
-__all__ = ["EntryViewer", "GuideDirectory", "GuideMenu"]
+__all__ = ["PROGRESS_INTERVAL", "Counter", "EntryViewer", "GuideDirectory", "GuideMenu"]
 
 ### __init__.py ends here
@@ -0,0 +1,57 @@
+"""Provides a widget for showing a count of progress."""
+
+##############################################################################
+# Python imports.
+from typing import Final
+
+##############################################################################
+# Humanize imports.
+from humanize import intcomma
+
+##############################################################################
+# Textual imports.
+from textual.app import RenderResult
+from textual.reactive import reactive
+from textual.widget import Widget
+
+##############################################################################
+PROGRESS_INTERVAL: Final[float] = 1 / 15
+"""How often, in seconds, progress is shown."""
+
+
+##############################################################################
+class Counter(Widget):
+    """A counter widget."""
+
+    DEFAULT_CSS = """
+    Counter {
+        width: 1fr;
+        height: 1;
+        margin-right: 1;
+        content-align: center middle;
+    }
+    """
+
+    count: reactive[int] = reactive(0)
+    """The count."""
+
+    def __init__(self, id: str) -> None:
+        """Initialise the widget.
+
+        Args:
+            id: The ID for the widget.
+        """
+        super().__init__(id=id)
+        self._title = id.title()
+        """The title to show for the counter."""
+
+    def render(self) -> RenderResult:
+        """Render the content of the counter.
+
+        Returns:
+            A renderable value.
+        """
+        return f"[$accent]{self._title}:[/] [dim]{intcomma(self.count)}[/]"
+
+
+### counter.py ends here
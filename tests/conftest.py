@@ -0,0 +1,178 @@
+"""Shared configuration for the tests."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from struct import pack
+
+##############################################################################
+# Pytest imports.
+from pytest import MonkeyPatch, fixture
+
+##############################################################################
+NO_OFFSET = 0xFFFFFFFF
+"""The offset used in a guide to show there is no entry."""
+
+
+##############################################################################
+@fixture(autouse=True)
+def data_home(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """Keep the data and configuration of every test in a directory of its own.
+
+    Returns:
+        The location of the data directory.
+    """
+    monkeypatch.setenv("XDG_DATA_HOME", str(data := tmp_path / "data"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    return data
+
+
+##############################################################################
+def _encrypted(data: bytes) -> bytes:
+    """Encrypt some data the way the body of a guide is encrypted.
+
+    Args:
+        data: The data to encrypt.
+
+    Returns:
+        The encrypted data.
+    """
+    return bytes(byte ^ 0x1A for byte in data)
+
+
+##############################################################################
+def _word(value: int) -> bytes:
+    """Encode a word as it's held in the body of a guide.
+
+    Args:
+        value: The value of the word.
+
+    Returns:
+        The encoded word.
+    """
+    return _encrypted(pack("<H", value))
+
+
+##############################################################################
+def _long(value: int) -> bytes:
+    """Encode a long as it's held in the body of a guide.
+
+    Args:
+        value: The value of the long.
+
+    Returns:
+        The encoded long.
+    """
+    return _encrypted(pack("<I", value & 0xFFFFFFFF))
+
+
+##############################################################################
+def _string(text: str) -> bytes:
+    """Encode a string as it's held in the body of a guide.
+
+    Args:
+        text: The text of the string.
+
+    Returns:
+        The encoded string, with its terminating nul.
+    """
+    return _encrypted(text.encode("latin-1") + b"\0")
+
+
+##############################################################################
+def make_guide(
+    location: Path,
+    title: str,
+    entries: Sequence[Sequence[str]],
+    prompts: Sequence[str] | None = None,
+    credits: Sequence[str] = (),
+) -> Path:
+    """Make a Norton Guide.
+
+    Args:
+        location: The location to make the guide at.
+        title: The title of the guide.
+        entries: The lines of each long entry of the guide.
+        prompts: The prompts of the guide's one menu, one for each of the
+            first entries; defaults to a prompt for every entry.
+        credits: The lines of the guide's credits.
+
+    Returns:
+        The location of the guide.
+    """
+    header = (
+        b"NG"
+        + b"\0" * 4
+        + pack("<H", 1)
+        + title.encode("latin-1").ljust(40, b"\0")
+        + b"".join(
+            line.encode("latin-1").ljust(66, b"\0")
+            for line in (list(credits) + [""] * 5)[:5]
+        )
+    )
+    prompts = (
+        [f"Prompt {entry}" for entry in range(len(entries))]
+        if prompts is None
+        else prompts
+    )
+
+    def menu(offsets: Sequence[int]) -> bytes:
+        """Make the menu of the guide.
+
+        Args:
+            offsets: The offsets of the entries the prompts lead to.
+
+        Returns:
+            The menu, as it's held in the guide.
+        """
+        body = (
+            _word(len(prompts) + 1)
+            + b"\0" * 20
+            + b"".join(_long(offset) for offset in offsets)
+            + b"\0" * ((len(prompts) + 1) * 8)
+            + _string("Menu")
+            + b"".join(_string(prompt) for prompt in prompts)
+            + b"\0"
+        )
+        return _word(2) + _word(len(body)) + body
+
+    bodies = [b"".join(_string(line) for line in lines) for lines in entries]
+    offsets: list[int] = []
+    position = len(header) + len(menu([0] * len(prompts)))
+    for body in bodies:
+        offsets.append(position)
+        position += 26 + len(body)
+    location.write_bytes(
+        header
+        + menu(offsets[: len(prompts)])
+        + b"".join(
+            _word(1)
+            + _word(len(body))
+            + _word(len(lines))
+            + _word(0)
+            + _word(0xFFFF)
+            + _long(NO_OFFSET)
+            + _word(0)
+            + _word(entry if entry < len(prompts) else 0xFFFF)
+            + _long(offsets[entry - 1] if entry else NO_OFFSET)
+            + _long(offsets[entry + 1] if entry + 1 < len(offsets) else NO_OFFSET)
+            + body
+            for entry, (lines, body) in enumerate(zip(entries, bodies, strict=True))
+        )
+    )
+    return location
+
+
+##############################################################################
+@fixture
+def guide_maker() -> Callable[..., Path]:
+    """Get the function that makes a guide.
+
+    Returns:
+        The function that makes a guide.
+    """
+    return make_guide
+
+
+### conftest.py ends here
@@ -0,0 +1,108 @@
+"""Tests for finding the guides within a directory."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Pytest imports.
+from pytest import MonkeyPatch, fixture, mark
+
+##############################################################################
+# Local imports.
+from aging.data import DiscoveryProgress, Guides, ScanCache, discover_guides
+
+
+##############################################################################
+@fixture
+def library(tmp_path: Path, guide_maker: Callable[..., Path]) -> Path:
+    """A directory of guides, and of files that aren't guides.
+
+    Returns:
+        The location of the directory.
+    """
+    (library := tmp_path / "library").mkdir()
+    (library / "deeper" / "still").mkdir(parents=True)
+    (library / "empty").mkdir()
+    for location, title in (
+        ("top.ng", "Top"),
+        ("deeper/middle.ng", "Middle"),
+        ("deeper/still/bottom.NG", "Bottom"),
+    ):
+        guide_maker(library / location, title, [["An entry"]])
+    (library / "fake.ng").write_bytes(b"This isn't a guide")
+    guide_maker(library / "deeper" / "guide.txt", "Wrong name", [["An entry"]])
+    return library
+
+
+##############################################################################
+def found_in(
+    library: Path,
+    jobs: int = 2,
+    progress: DiscoveryProgress | None = None,
+    cache: ScanCache | None = None,
+) -> dict[str, Path]:
+    """Find the guides in a directory.
+
+    Args:
+        library: The directory to look in.
+        jobs: The number of threads to look at the files with.
+        progress: Optional progress to keep up to date.
+        cache: Optional cache of what was found last time.
+
+    Returns:
+        The locations of the guides found, keyed by title.
+    """
+    guides: Guides = []
+    assert discover_guides(
+        library, guides.extend, progress=progress, jobs=jobs, cache=cache
+    )
+    assert len(guides) == len({guide.location for guide in guides})
+    return {guide.title: guide.location for guide in guides}
+
+
+##############################################################################
+@mark.parametrize("jobs", (1, 4))
+def test_discover_guides(library: Path, jobs: int) -> None:
+    """All of the guides within a directory should be found."""
+    progress = DiscoveryProgress()
+    assert found_in(library, jobs=jobs, progress=progress) == {
+        "Top": library / "top.ng",
+        "Middle": library / "deeper" / "middle.ng",
+        "Bottom": library / "deeper" / "still" / "bottom.NG",
+    }
+    assert (progress.directories, progress.files, progress.guides) == (4, 4, 3)
+
+
+##############################################################################
+def test_cancelled(library: Path) -> None:
+    """Cancelling the discovery should be reported."""
+    guides: Guides = []
+    assert not discover_guides(library, guides.extend, cancelled=lambda: True)
+
+
+##############################################################################
+def test_unchanged_files_are_not_read_again(
+    library: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """With a cache, files that haven't changed shouldn't be read again."""
+    expected = found_in(library, cache=(cache := ScanCache()))
+    monkeypatch.setattr("aging.data.discovery.probe_guide", lambda _: None)
+    assert found_in(library, cache=cache) == expected
+
+
+##############################################################################
+def test_changes_are_noticed(library: Path, guide_maker: Callable[..., Path]) -> None:
+    """With a cache, guides that come and go should still be noticed."""
+    found_in(library, cache=(cache := ScanCache()))
+    (library / "top.ng").unlink()
+    guide_maker(library / "empty" / "new.ng", "New", [["An entry"]])
+    assert found_in(library, cache=cache) == {
+        "New": library / "empty" / "new.ng",
+        "Middle": library / "deeper" / "middle.ng",
+        "Bottom": library / "deeper" / "still" / "bottom.NG",
+    }
+
+
+### test_discovery.py ends here
@@ -0,0 +1,158 @@
+"""Tests for the filters that rule out guides that can't hold a hit."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from os import utime
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide
+
+##############################################################################
+# Pytest imports.
+from pytest import fixture, mark
+
+##############################################################################
+# Local imports.
+from aging.data import Guide
+from aging.search import (
+    GuideFilters,
+    Matcher,
+    MultiNeedle,
+    Needle,
+    raw_entries,
+    search_range,
+)
+from aging.search.filters import TrigramFilter
+
+##############################################################################
+WORDS = ("DBSEEK", "dbSkip", "^BAlias^B", "the", "Function", "returns", "ÀÉÎ")
+"""The words to make the lines of the guides from."""
+
+
+##############################################################################
+@fixture
+def guides(tmp_path: Path, guide_maker: Callable[..., Path]) -> list[Path]:
+    """Some guides full of random lines.
+
+    Returns:
+        The locations of the guides.
+    """
+    random = Random(14)
+    return [
+        guide_maker(
+            tmp_path / f"guide{guide}.ng",
+            f"Guide {guide}",
+            [
+                [
+                    " ".join(random.sample(WORDS, k=random.randint(0, 3)))
+                    for _ in range(random.randint(1, 5))
+                ]
+                for _ in range(20)
+            ],
+        )
+        for guide in range(4)
+    ]
+
+
+##############################################################################
+def test_no_false_negatives(guides: list[Path]) -> None:
+    """Any text in a guide should always be reported as possibly present."""
+    for guide in guides:
+        built = TrigramFilter.of(guide)
+        with NortonGuide(guide) as source:
+            for entry in raw_entries(source):
+                for line in entry.text.split("\n"):
+                    for start in range(len(line)):
+                        for end in range(start + 1, len(line) + 1):
+                            text = line[start:end]
+                            assert built.might_contain(text)
+                            assert built.might_contain(text.upper())
+                            assert built.might_contain(text.lower())
+
+
+##############################################################################
+@mark.parametrize(
+    "needle",
+    (
+        Needle("dbseek", True),
+        Needle("dbSkip", False),
+        Needle("alias", True),
+        Needle("ÀÉÎ", False),
+        Needle(r"db(seek|skip)", True, True),
+        Needle(r"the\s+function", True, True),
+        MultiNeedle("returns, nowhere", True),
+    ),
+)
+def test_guides_with_hits_are_never_ruled_out(
+    guides: list[Path], needle: Matcher
+) -> None:
+    """A guide with a hit should never be ruled out by its filter.
+
+    Args:
+        needle: What to search for.
+    """
+    filters = GuideFilters()
+    for guide in guides:
+        filters.build(guide)
+        guide_filter = filters.get(guide)
+        assert guide_filter is not None
+        if search_range(guide, needle).hits:
+            assert needle.might_be_found(guide_filter.might_contain)
+
+
+##############################################################################
+def test_missing_text_is_ruled_out(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Text that isn't in a guide should be ruled out."""
+    built = TrigramFilter.of(
+        guide_maker(tmp_path / "guide.ng", "Guide", [["DBSEEK()"]])
+    )
+    assert built.might_contain("dbseek")
+    assert not built.might_contain("dbskip")
+
+
+##############################################################################
+def test_stale_filters_are_ignored(guides: list[Path]) -> None:
+    """A filter should only be used while its guide is unchanged."""
+    filters = GuideFilters()
+    filters.build(guide := guides[0])
+    assert filters.get(guide) is not None
+    modified = guide.stat().st_mtime_ns
+    utime(guide, ns=(modified, modified + 1_000_000_000))
+    assert filters.get(guide) is None
+    filters.build(guide)
+    assert filters.get(guide) is not None
+
+
+##############################################################################
+def test_damaged_filters_are_ignored(guides: list[Path], tmp_path: Path) -> None:
+    """A filter that can't be read should be treated as missing."""
+    filters = GuideFilters(location := tmp_path / "filters")
+    location.mkdir()
+    filters.build(guides[0])
+    (saved,) = location.glob("*.bin")
+    saved.write_bytes(saved.read_bytes()[:-1])
+    assert filters.get(guides[0]) is None
+    saved.write_bytes(b"")
+    assert filters.get(guides[0]) is None
+
+
+##############################################################################
+def test_update(guides: list[Path], tmp_path: Path) -> None:
+    """Updating should build what's missing and remove what isn't needed."""
+    filters = GuideFilters(location := tmp_path / "filters")
+    location.mkdir()
+    filters.update([Guide(guide.stem, guide) for guide in guides])
+    assert all(filters.get(guide) is not None for guide in guides)
+    filters.update([Guide(guides[0].stem, guides[0])])
+    assert len(list(location.glob("*.bin"))) == 1
+    assert filters.get(guides[0]) is not None
+    assert filters.get(guides[1]) is None
+
+
+### test_filters.py ends here
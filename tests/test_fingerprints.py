@@ -0,0 +1,63 @@
+"""Tests for spotting when a guide has changed."""
+
+##############################################################################
+# Python imports.
+from os import utime
+from pathlib import Path
+
+##############################################################################
+# Local imports.
+from aging.data import Fingerprints
+from aging.data.fingerprints import fingerprints_file
+
+
+##############################################################################
+def test_unchanged_guide(tmp_path: Path) -> None:
+    """A guide that hasn't changed should keep its fingerprint."""
+    (guide := tmp_path / "guide.ng").write_bytes(b"NG")
+    fingerprints = Fingerprints()
+    assert (first := fingerprints.current(guide)) is not None
+    fingerprints.save()
+    assert Fingerprints().current(guide) == first
+
+
+##############################################################################
+def test_changed_guide(tmp_path: Path) -> None:
+    """A guide that has changed should get a new fingerprint."""
+    (guide := tmp_path / "guide.ng").write_bytes(b"NG")
+    utime(guide, ns=(1_000, 1_000))
+    first = Fingerprints().current(guide)
+    guide.write_bytes(b"NGNG")
+    utime(guide, ns=(1_000, 1_000))
+    assert Fingerprints().current(guide) != first
+
+
+##############################################################################
+def test_missing_guide(tmp_path: Path) -> None:
+    """A guide that can't be read should have no fingerprint."""
+    assert Fingerprints().current(tmp_path / "missing.ng") is None
+
+
+##############################################################################
+def test_saves_are_merged(tmp_path: Path) -> None:
+    """Saving one set of fingerprints shouldn't lose those another has saved."""
+    (first_guide := tmp_path / "first.ng").write_bytes(b"NG")
+    (second_guide := tmp_path / "second.ng").write_bytes(b"NG")
+    first, second = Fingerprints(), Fingerprints()
+    first.current(first_guide)
+    first.save()
+    second.current(second_guide)
+    second.save()
+    saved = fingerprints_file().read_text(encoding="utf-8")
+    assert str(first_guide) in saved
+    assert str(second_guide) in saved
+
+
+##############################################################################
+def test_only_saved_when_changed() -> None:
+    """The fingerprints should only be written when something has changed."""
+    Fingerprints().save()
+    assert not fingerprints_file().exists()
+
+
+### test_fingerprints.py ends here
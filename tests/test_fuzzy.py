@@ -0,0 +1,198 @@
+"""Tests for fuzzy searching."""
+
+##############################################################################
+# Python imports.
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# Pytest imports.
+from pytest import mark, raises
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHit, SearchHits
+from aging.search import FuzzyNeedle, InvalidNeedle, closest_first
+from aging.search.fuzzy import allowed_edits, edit_distance, fragments, pieces
+
+##############################################################################
+LETTERS = "abcdefgh"
+"""The letters to make random words from."""
+
+
+##############################################################################
+def levenshtein(first: str, second: str) -> int:
+    """Get the edit distance between two pieces of text, the obvious way.
+
+    Args:
+        first: The first piece of text.
+        second: The second piece of text.
+
+    Returns:
+        The number of insertions, deletions and substitutions needed.
+    """
+    if not first or not second:
+        return len(first) + len(second)
+    return min(
+        levenshtein(first[1:], second) + 1,
+        levenshtein(first, second[1:]) + 1,
+        levenshtein(first[1:], second[1:]) + (first[0] != second[0]),
+    )
+
+
+##############################################################################
+def mutate(random: Random, word: str, edits: int) -> str:
+    """Make a random number of edits to a word.
+
+    Args:
+        random: The source of randomness.
+        word: The word to edit.
+        edits: The most edits to make.
+
+    Returns:
+        The edited word.
+    """
+    for _ in range(random.randint(0, edits)):
+        position = random.randint(0, len(word))
+        match random.choice(("insert", "delete", "substitute")):
+            case "insert":
+                word = word[:position] + random.choice(LETTERS) + word[position:]
+            case "delete":
+                word = word[:position] + word[position + 1 :]
+            case _:
+                word = word[:position] + random.choice(LETTERS) + word[position + 1 :]
+    return word
+
+
+##############################################################################
+@mark.parametrize(
+    "first, second, distance",
+    (
+        ("", "", 0),
+        ("seek", "seek", 0),
+        ("seek", "seak", 1),
+        ("seek", "sek", 1),
+        ("seek", "sleek", 1),
+        ("kitten", "sitting", 3),
+    ),
+)
+def test_edit_distance(first: str, second: str, distance: int) -> None:
+    """The edit distance between known pieces of text should be correct."""
+    assert edit_distance(first, second, 5) == distance
+    assert edit_distance(second, first, 5) == distance
+
+
+##############################################################################
+@mark.parametrize("seed", range(10))
+def test_edit_distance_is_limited(seed: int) -> None:
+    """The edit distance should agree with the obvious way, up to the limit."""
+    random = Random(seed)
+    for _ in range(50):
+        first = "".join(random.choices(LETTERS[:3], k=random.randint(0, 6)))
+        second = "".join(random.choices(LETTERS[:3], k=random.randint(0, 6)))
+        limit = random.randint(0, 3)
+        assert edit_distance(first, second, limit) == min(
+            levenshtein(first, second), limit + 1
+        )
+
+
+##############################################################################
+@mark.parametrize(
+    "word, edits", (("ab", 0), ("abc", 1), ("abcdef", 2), ("abcdefghijklmnop", 3))
+)
+def test_allowed_edits(word: str, edits: int) -> None:
+    """Longer words should be allowed more edits, up to a point."""
+    assert allowed_edits(word) == edits
+
+
+##############################################################################
+@mark.parametrize(
+    "word, count, split",
+    (
+        ("abcdef", 1, ("abcdef",)),
+        ("abcdef", 2, ("abc", "def")),
+        ("abcdefg", 3, ("abc", "de", "fg")),
+        ("ab", 3, ("a", "b", "")),
+    ),
+)
+def test_pieces(word: str, count: int, split: tuple[str, ...]) -> None:
+    """A word should be split into pieces of much the same length."""
+    assert pieces(word, count) == split
+    assert "".join(split) == word
+
+
+##############################################################################
+def test_fragments() -> None:
+    """The fragments of some text should be every run of three characters."""
+    assert fragments("abcd") == {"abc", "bcd"}
+    assert fragments("ab") == set()
+
+
+##############################################################################
+def test_needs_a_word() -> None:
+    """A fuzzy needle needs at least one word to look for."""
+    with raises(InvalidNeedle):
+        FuzzyNeedle(" ,. ", True)
+
+
+##############################################################################
+def test_regex_is_not_allowed() -> None:
+    """A fuzzy needle can't be a regular expression."""
+    with raises(InvalidNeedle):
+        FuzzyNeedle("dbseek", True, regex=True)
+
+
+##############################################################################
+def test_found_in() -> None:
+    """A line should be a hit if every word of the needle is close to a word in it."""
+    needle = FuzzyNeedle("clipper functon", True)
+    assert needle.found_in("A Clipper function") == "Clipper function"
+    assert needle.found_in("A Clipper procedure") is None
+    assert needle.hits_in(["x", "clippr function", "clipper"]) == [
+        (1, "clippr function")
+    ]
+
+
+##############################################################################
+@mark.parametrize("seed", range(20))
+def test_prefilters_never_rule_out_a_hit(seed: int) -> None:
+    """Text with a hit in it should never be ruled out."""
+    random = Random(seed)
+    words = [
+        "".join(random.choices(LETTERS, k=random.randint(3, 12)))
+        for _ in range(random.randint(1, 3))
+    ]
+    needle = FuzzyNeedle(" ".join(words), False)
+    for _ in range(50):
+        line = " ".join(
+            [mutate(random, word, allowed_edits(word)) for word in words]
+            + ["".join(random.choices(LETTERS, k=5))]
+        )
+        if needle.found_in(line) is not None:
+            assert needle.might_be_in(line)
+            assert needle.might_be_found(line.__contains__)
+
+
+##############################################################################
+def test_prefilters_rule_out_text() -> None:
+    """Text that can't hold a hit should be ruled out."""
+    needle = FuzzyNeedle("underlined", True)
+    assert not needle.might_be_found("a quick test of the code".__contains__)
+    assert not needle.might_be_in("a quick test of the code")
+    assert needle.might_be_in("UNDRLINED")
+    assert needle.might_be_found("undrlined".__contains__)
+
+
+##############################################################################
+def test_closest_first() -> None:
+    """The hits of a fuzzy search should be ordered closest first."""
+    needle = FuzzyNeedle("function", True)
+    found = ("funktshun", "function", "funcion", "fnuction", "function")
+    hits = SearchHits(
+        SearchHit(Path(f"guide{line % 2}.ng"), 0, line, word, word)
+        for line, word in enumerate(found)
+    )
+    assert [hit.entry_line for hit in closest_first(hits, needle)] == [1, 4, 2, 3, 0]
+
+
+### test_fuzzy.py ends here
@@ -0,0 +1,66 @@
+"""Tests for checking guides by reading only their header."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide
+
+##############################################################################
+# Pytest imports.
+from pytest import mark
+
+##############################################################################
+# Local imports.
+from aging.data import GuideHeader, is_guide, probe_guide
+
+
+##############################################################################
+def test_probe_matches_the_guide(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Probing a guide should find the same details as opening it."""
+    guide = guide_maker(
+        tmp_path / "guide.ng",
+        "A Test Guide",
+        [["First entry"], ["Second entry"]],
+        credits=["Line one", "Line two", "", "Line four"],
+    )
+    assert (header := probe_guide(guide)) is not None
+    with NortonGuide(guide) as opened:
+        assert header == GuideHeader(
+            opened.magic, opened.menu_count, opened.title, opened.credits
+        )
+    assert is_guide(guide)
+
+
+##############################################################################
+@mark.parametrize("content", (b"", b"NG", b"XX" + b"\0" * 400, b"junk" * 100))
+def test_not_a_guide(tmp_path: Path, content: bytes) -> None:
+    """A file that only has the name of a guide shouldn't be taken as one."""
+    (candidate := tmp_path / "guide.ng").write_bytes(content)
+    assert probe_guide(candidate) is None
+    assert not is_guide(candidate)
+
+
+##############################################################################
+def test_missing_guide(tmp_path: Path) -> None:
+    """A guide that doesn't exist shouldn't be taken as a guide."""
+    assert probe_guide(tmp_path / "missing.ng") is None
+    assert not is_guide(tmp_path / "missing.ng")
+
+
+##############################################################################
+def test_only_guide_names_are_read(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """A file without the name of a guide shouldn't be taken as one."""
+    guide = guide_maker(tmp_path / "guide.txt", "A Test Guide", [["Entry"]])
+    assert probe_guide(guide) is not None
+    assert not is_guide(guide)
+
+
+### test_header.py ends here
@@ -0,0 +1,207 @@
+"""Tests for the full-text index of the guides."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterator
+from os import utime
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# Pytest imports.
+from pytest import fixture, mark, raises
+
+##############################################################################
+# Local imports.
+from aging.data import Fingerprint, Fingerprints, Guide
+from aging.search import (
+    FuzzyNeedle,
+    Matcher,
+    MultiNeedle,
+    Needle,
+    Query,
+    SearchIndex,
+    SearchIndexError,
+    search_range,
+)
+
+##############################################################################
+WORDS = (
+    "DBSEEK",
+    "DBSKIP",
+    "dbSeek",
+    "INDEX",
+    "SEEK",
+    "the",
+    "a",
+    "function",
+    "returns",
+    "value",
+    "record",
+    "area",
+    "alias",
+    "field",
+    "underlined",
+    "data",
+    "base",
+    "clipper",
+    "DBEDIT",
+    "seeking",
+    "^BUSE^B",
+    "^Ubold^U",
+    "DBSEAK",
+    "dbskp",
+)
+"""The words to make the lines of the guides from."""
+
+
+##############################################################################
+@fixture
+def guides(tmp_path: Path, guide_maker: Callable[..., Path]) -> list[Path]:
+    """Some guides full of random lines.
+
+    Returns:
+        The locations of the guides.
+    """
+    random = Random(42)
+    return [
+        guide_maker(
+            tmp_path / f"guide{guide}.ng",
+            f"Guide {guide}",
+            [
+                [
+                    " ".join(random.choices(WORDS, k=random.randint(0, 8)))
+                    for _ in range(random.randint(1, 12))
+                ]
+                for _ in range(40)
+            ],
+        )
+        for guide in range(2)
+    ]
+
+
+##############################################################################
+@fixture
+def index(tmp_path: Path, guides: list[Path]) -> Iterator[SearchIndex]:
+    """An index of the guides.
+
+    Yields:
+        The index.
+    """
+    with SearchIndex(tmp_path / "index.db") as index:
+        fingerprints = Fingerprints()
+        for fingerprint in index.out_of_date(
+            [Guide(guide.stem, guide) for guide in guides], fingerprints
+        ):
+            index.add(fingerprint)
+        yield index
+
+
+##############################################################################
+@mark.parametrize(
+    "needle",
+    (
+        Needle("dbseek", True),
+        Needle("dbSeek", False),
+        Needle("DBSEEK ", False),
+        Needle("eek", True),
+        Needle("use", True),
+        Needle("not there", True),
+        Needle(r"db(seek|skip)", True, regex=True),
+        Needle(r"^\w+ function", False, regex=True),
+        MultiNeedle("dbseek, dbskip, alias", True),
+        MultiNeedle("SEEK,index", False),
+        Query("dbseek NOT alias", True),
+        Query('"the function" OR (record AND field)', True),
+        Query("db.eek NOT value", True, regex=True),
+        FuzzyNeedle("dbseek", True),
+        FuzzyNeedle("underlind funtion", True),
+        FuzzyNeedle("DBSEEK", False),
+    ),
+    ids=repr,
+)
+def test_index_finds_what_a_scan_finds(
+    index: SearchIndex, guides: list[Path], needle: Matcher
+) -> None:
+    """Searching the index should find the same hits as scanning the guides."""
+    for guide in guides:
+        assert list(index.search(guide, needle)) == list(
+            search_range(guide, needle).hits
+        )
+
+
+##############################################################################
+def test_changed_guides_are_out_of_date(
+    index: SearchIndex, guides: list[Path], guide_maker: Callable[..., Path]
+) -> None:
+    """Only guides that have changed should need indexing again."""
+    listed = [Guide(guide.stem, guide) for guide in guides]
+    assert not list(index.out_of_date(listed, Fingerprints()))
+    guide_maker(guides[0], "Changed", [["A new first line", "dbseek"]])
+    assert [
+        fingerprint.location
+        for fingerprint in index.out_of_date(listed, Fingerprints())
+    ] == [guides[0]]
+    index.add(Fingerprint.of(guides[0]))
+    assert list(index.search(guides[0], Needle("dbseek", True))) == list(
+        search_range(guides[0], Needle("dbseek", True)).hits
+    )
+
+
+##############################################################################
+def test_freshness_survives_a_restart(index: SearchIndex, guides: list[Path]) -> None:
+    """Guides should still be up to date with fingerprints loaded from storage."""
+    fingerprints = Fingerprints()
+    for guide in guides:
+        fingerprints.current(guide)
+    fingerprints.save()
+    listed = [Guide(guide.stem, guide) for guide in guides]
+    assert not list(index.out_of_date(listed, Fingerprints()))
+
+
+##############################################################################
+def test_touched_guide_is_out_of_date(index: SearchIndex, guides: list[Path]) -> None:
+    """A guide whose modification time has changed should be indexed again."""
+    modified = guides[1].stat().st_mtime_ns + 1_000_000_000
+    utime(guides[1], ns=(modified, modified))
+    assert [
+        fingerprint.location
+        for fingerprint in index.out_of_date(
+            [Guide(guide.stem, guide) for guide in guides], Fingerprints()
+        )
+    ] == [guides[1]]
+
+
+##############################################################################
+def test_pruned_guides_are_forgotten(index: SearchIndex, guides: list[Path]) -> None:
+    """Guides that are no longer wanted should be removed from the index."""
+    fingerprints = Fingerprints()
+    index.prune([Guide(guides[0].stem, guides[0])])
+    assert (fingerprint := fingerprints.current(guides[1])) is not None
+    assert not index.is_current(fingerprint)
+    assert not list(index.search(guides[1], Needle("dbseek", True)))
+    assert (fingerprint := fingerprints.current(guides[0])) is not None
+    assert index.is_current(fingerprint)
+
+
+##############################################################################
+def test_read_only_index_finds_what_was_added(
+    index: SearchIndex, guides: list[Path], tmp_path: Path
+) -> None:
+    """An index opened for reading should find what was added to it."""
+    with SearchIndex(tmp_path / "index.db", read_only=True) as reading:
+        for guide in guides:
+            assert list(reading.search(guide, Needle("dbseek", True))) == list(
+                index.search(guide, Needle("dbseek", True))
+            )
+
+
+##############################################################################
+def test_read_only_index_is_never_created(tmp_path: Path) -> None:
+    """Opening a missing index for reading should fail, not create it."""
+    with raises(SearchIndexError):
+        SearchIndex(tmp_path / "missing.db", read_only=True)
+    assert not (tmp_path / "missing.db").exists()
+
+
+### test_index.py ends here
@@ -0,0 +1,143 @@
+"""Tests for keeping the results of the last search between sessions."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHit, SearchHits
+from aging.data.last_search import (
+    HEADER,
+    MAGIC,
+    VERSION,
+    LastSearch,
+    last_search_file,
+    load_last_search,
+    save_last_search,
+)
+
+
+##############################################################################
+def hits_in(guides: list[Path]) -> SearchHits:
+    """Make some hits in some guides.
+
+    Args:
+        guides: The guides to make the hits in.
+
+    Returns:
+        The hits.
+    """
+    return SearchHits(
+        SearchHit(guide, 100, line, f"Line {line} of {guide.name}")
+        for guide in guides
+        for line in range(3)
+    )
+
+
+##############################################################################
+def test_save_and_load(tmp_path: Path, guide_maker: Callable[..., Path]) -> None:
+    """The last search should be the same after being saved and loaded."""
+    guides = [
+        guide_maker(tmp_path / f"guide{guide}.ng", f"Guide {guide}", [["x"]])
+        for guide in range(2)
+    ]
+    hits = hits_in(guides)
+    save_last_search(LastSearch(hits, hits[4], 4))
+    assert load_last_search() == LastSearch(hits, hits[4], 4)
+
+
+##############################################################################
+def test_changed_guides_are_dropped(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Hits in guides that have changed should be dropped when loaded."""
+    guides = [
+        guide_maker(tmp_path / f"guide{guide}.ng", f"Guide {guide}", [["x"]])
+        for guide in range(2)
+    ]
+    hits = hits_in(guides)
+    save_last_search(LastSearch(hits, hits[4], 4))
+    guide_maker(guides[0], "Changed", [["x", "y"]])
+    loaded = load_last_search()
+    assert list(loaded.hits) == list(hits)[3:]
+    assert loaded.visited == hits[4]
+    assert loaded.visited_at == 1
+
+
+##############################################################################
+def test_visited_in_changed_guide(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """A visited hit in a guide that has changed should be forgotten."""
+    guide = guide_maker(tmp_path / "guide.ng", "Guide", [["x"]])
+    save_last_search(LastSearch(hits := hits_in([guide]), hits[1], 1))
+    guide_maker(guide, "Changed", [["x", "y"]])
+    assert load_last_search() == LastSearch(SearchHits())
+
+
+##############################################################################
+def test_save_and_load_spilled(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Spilled hits should be saved and loaded like any others."""
+    guides = [
+        guide_maker(tmp_path / f"guide{guide}.ng", f"Guide {guide}", [["x"]])
+        for guide in range(3)
+    ]
+    expected = list(hits := hits_in(guides * 1_000))
+    hits.spill(tmp_path)
+    save_last_search(LastSearch(hits, expected[-1], len(expected) - 1))
+    loaded = load_last_search()
+    assert not loaded.hits.spilled
+    assert list(loaded.hits) == expected
+    assert loaded.visited == expected[-1]
+    assert loaded.visited_at == len(expected) - 1
+
+
+##############################################################################
+def test_removed_guides_are_dropped(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Hits in guides that have gone should be dropped when loaded."""
+    guides = [
+        guide_maker(tmp_path / f"guide{guide}.ng", f"Guide {guide}", [["x"]])
+        for guide in range(2)
+    ]
+    hits = hits_in(guides)
+    save_last_search(LastSearch(hits, hits[0], 0))
+    guides[1].unlink()
+    assert load_last_search() == LastSearch(SearchHits(list(hits)[:3]), hits[0], 0)
+
+
+##############################################################################
+def test_other_versions_are_ignored(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Results saved in a different layout should mean there are no results."""
+    guide = guide_maker(tmp_path / "guide.ng", "Guide", [["x"]])
+    save_last_search(LastSearch(hits_in([guide])))
+    data = last_search_file().read_bytes()
+    last_search_file().write_bytes(
+        HEADER.pack(MAGIC, VERSION + 1, HEADER.unpack_from(data)[2])
+        + data[HEADER.size :]
+    )
+    assert load_last_search() == LastSearch(SearchHits())
+
+
+##############################################################################
+def test_no_file() -> None:
+    """If there are no saved results there should be no results."""
+    assert not last_search_file().exists()
+    assert load_last_search() == LastSearch(SearchHits())
+
+
+##############################################################################
+def test_bad_file_is_ignored() -> None:
+    """A file that can't be read should mean there are no results."""
+    last_search_file().write_bytes(b"not the results of a search")
+    assert load_last_search() == LastSearch(SearchHits())
+
+
+### test_last_search.py ends here
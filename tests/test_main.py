@@ -0,0 +1,108 @@
+"""Tests for searching the guides from the command line."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Pytest imports.
+from pytest import CaptureFixture, fixture
+
+##############################################################################
+# Local imports.
+from aging.__main__ import get_search_args, guides_to_search, search
+from aging.data import Guide, save_guides
+
+
+##############################################################################
+@fixture
+def directory(tmp_path: Path, guide_maker: Callable[..., Path]) -> Path:
+    """A directory of guides, with a directory of guides within it.
+
+    Returns:
+        The location of the directory.
+    """
+    (directory := tmp_path / "guides").mkdir()
+    (directory / "within").mkdir()
+    guide_maker(directory / "first.ng", "First", [["DBSEEK()"]])
+    guide_maker(directory / "SECOND.NG", "Second", [["DBSKIP()"]])
+    guide_maker(directory / "within" / "third.ng", "Third", [["DBSEEK()"]])
+    (directory / "broken.ng").write_bytes(b"Not a guide")
+    (directory / "notes.txt").write_text("DBSEEK()", encoding="utf-8")
+    return directory
+
+
+##############################################################################
+def test_guides_in_a_directory(directory: Path) -> None:
+    """Only the guides directly within a directory should be searched."""
+    assert guides_to_search([directory]) == [
+        directory / "SECOND.NG",
+        directory / "first.ng",
+    ]
+
+
+##############################################################################
+def test_guides_in_a_directory_recursively(directory: Path) -> None:
+    """The guides within directories within a directory should be found."""
+    assert guides_to_search([directory], recursive=True) == [
+        directory / "SECOND.NG",
+        directory / "first.ng",
+        directory / "within" / "third.ng",
+    ]
+
+
+##############################################################################
+def test_guides_given_directly(directory: Path) -> None:
+    """Guides given directly should always be searched."""
+    assert guides_to_search([directory / "broken.ng", directory / "first.ng"]) == [
+        directory / "broken.ng",
+        directory / "first.ng",
+    ]
+
+
+##############################################################################
+def test_guide_directory(directory: Path) -> None:
+    """With no guides given, the guides in the guide directory are searched."""
+    save_guides(
+        [
+            Guide("Second", directory / "SECOND.NG"),
+            Guide("First", directory / "first.ng"),
+        ]
+    )
+    assert guides_to_search([]) == [directory / "first.ng", directory / "SECOND.NG"]
+
+
+##############################################################################
+def test_exit_code_with_hits(directory: Path, capsys: CaptureFixture[str]) -> None:
+    """A search that finds hits should succeed and show them."""
+    assert search(get_search_args(["-i", "-R", "dbseek", str(directory)])) == 0
+    assert [
+        (guide, text)
+        for guide, _, _, text in (
+            line.rsplit(":", 3) for line in capsys.readouterr().out.splitlines()
+        )
+    ] == [
+        (str(directory / "first.ng"), "DBSEEK()"),
+        (str(directory / "within" / "third.ng"), "DBSEEK()"),
+    ]
+
+
+##############################################################################
+def test_exit_code_without_hits(directory: Path, capsys: CaptureFixture[str]) -> None:
+    """A search that finds no hits should fail."""
+    assert search(get_search_args(["dbseek", str(directory)])) == 1
+    assert capsys.readouterr().out == ""
+
+
+##############################################################################
+def test_unreadable_guide_is_reported(
+    directory: Path, capsys: CaptureFixture[str]
+) -> None:
+    """A guide that can't be searched should be reported, not stop the search."""
+    missing = directory / "missing.ng"
+    assert search(get_search_args(["-i", "dbseek", str(missing), str(directory)])) == 0
+    assert capsys.readouterr().err.startswith(f"aging: {missing}: ")
+
+
+### test_main.py ends here
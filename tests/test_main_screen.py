@@ -0,0 +1,142 @@
+"""Tests for the workings of the main screen."""
+
+##############################################################################
+# Python imports.
+from argparse import Namespace
+from asyncio import run
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Pytest imports.
+from pytest import mark
+
+##############################################################################
+# Local imports.
+from aging.aging import AgiNG
+from aging.data import (
+    LastSearch,
+    SearchHit,
+    SearchHits,
+    load_configuration,
+    load_last_search,
+    save_configuration,
+    save_last_search,
+)
+from aging.screens import Main
+
+
+##############################################################################
+def hits(count: int, guide: Path = Path("guide.ng")) -> SearchHits:
+    """Make some search hits.
+
+    Args:
+        count: The number of hits to make.
+        guide: The guide to make the hits in.
+
+    Returns:
+        The hits.
+    """
+    return SearchHits(SearchHit(guide, hit, 0, f"Hit {hit}") for hit in range(count))
+
+
+##############################################################################
+def spill_after(threshold: int) -> None:
+    """Set the number of hits beyond which remembered results are spilled.
+
+    Args:
+        threshold: The number of hits.
+    """
+    configuration = load_configuration()
+    configuration.global_search_spill_threshold = threshold
+    save_configuration(configuration)
+
+
+##############################################################################
+@mark.parametrize("threshold, spilled", ((10, True), (100, False), (0, False)))
+def test_remembered_results_are_spilled(threshold: int, spilled: bool) -> None:
+    """Remembered results should only be spilled if there are too many.
+
+    Args:
+        threshold: The number of hits beyond which results are spilled.
+        spilled: Should the results be spilled?
+    """
+    spill_after(threshold)
+
+    async def check() -> None:
+        """Check the spilling of remembered results."""
+        app = AgiNG(Namespace(guide=None, theme=None))
+        async with app.run_test() as pilot:
+            assert isinstance(main := app.screen, Main)
+            main._remember_search(LastSearch(results := hits(100)))
+            # The spilling happens in the background, so straight away
+            # the results should be just as they were.
+            assert main._search_hits is results
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert main._search_hits.spilled is spilled
+            assert not results.spilled
+            assert list(main._search_hits) == list(results)
+
+    run(check())
+
+
+##############################################################################
+def test_replaced_results_are_not_swapped_in() -> None:
+    """Results replaced while being spilled should stay replaced."""
+    spill_after(10)
+
+    async def check() -> None:
+        """Check the replacing of remembered results."""
+        app = AgiNG(Namespace(guide=None, theme=None))
+        async with app.run_test() as pilot:
+            assert isinstance(main := app.screen, Main)
+            main._remember_search(LastSearch(hits(100)))
+            main._remember_search(LastSearch(results := hits(5)))
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert main._search_hits is results
+
+    run(check())
+
+
+##############################################################################
+def test_unknown_results_are_kept(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Results that were never loaded shouldn't be thrown away on exit."""
+    guide = guide_maker(tmp_path / "guide.ng", "Guide", [["x"]])
+    save_last_search(saved := LastSearch(hits(10, guide)))
+
+    async def check() -> None:
+        """Check the results are left alone."""
+        app = AgiNG(Namespace(guide=None, theme=None))
+        async with app.run_test():
+            assert isinstance(main := app.screen, Main)
+            assert not main._search_hits
+
+    run(check())
+    assert load_last_search() == saved
+
+
+##############################################################################
+def test_remembered_results_are_saved(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """Results that have been remembered should be saved on exit."""
+    guide = guide_maker(tmp_path / "guide.ng", "Guide", [["x"]])
+    save_last_search(LastSearch(hits(10, guide)))
+    remembered = LastSearch(results := hits(5, guide), results[2], 2)
+
+    async def check() -> None:
+        """Check the results are saved."""
+        app = AgiNG(Namespace(guide=None, theme=None))
+        async with app.run_test():
+            assert isinstance(main := app.screen, Main)
+            main._remember_search(remembered)
+
+    run(check())
+    assert load_last_search() == remembered
+
+
+### test_main_screen.py ends here
@@ -0,0 +1,111 @@
+"""Tests for searching for many needles at once."""
+
+##############################################################################
+# Python imports.
+from random import Random
+from re import compile as compile_regexp
+
+##############################################################################
+# Pytest imports.
+from pytest import mark, raises
+
+##############################################################################
+# Local imports.
+from aging.search import InvalidNeedle, MultiNeedle
+from aging.search.multi_needle import Automaton
+
+
+##############################################################################
+def naive_find(keywords: list[str], text: str) -> set[int]:
+    """Find the keywords in some text, the slow and obvious way.
+
+    Args:
+        keywords: The keywords to find.
+        text: The text to look in.
+
+    Returns:
+        The indexes of all of the keywords that are in the text.
+    """
+    return {index for index, keyword in enumerate(keywords) if keyword in text}
+
+
+##############################################################################
+@mark.parametrize(
+    "keywords, text",
+    (
+        (["he", "she", "his", "hers"], "ushers"),
+        (["a", "ab", "abc", "bc", "c"], "xabcx"),
+        (["dbseek", "seek", "db"], "DBSEEK dbseek"),
+        (["aaa", "aa"], "aaaa"),
+        (["abcd", "bc"], "abce"),
+        (["x"], ""),
+    ),
+)
+def test_automaton(keywords: list[str], text: str) -> None:
+    """The automaton should find the same keywords as a naive search."""
+    assert Automaton(keywords).find(text) == naive_find(keywords, text)
+
+
+##############################################################################
+@mark.parametrize("seed", range(20))
+def test_automaton_matches_naive_search(seed: int) -> None:
+    """The automaton should agree with a naive search of random text."""
+    random = Random(seed)
+    keywords = [
+        "".join(random.choices("abc", k=random.randint(1, 5)))
+        for _ in range(random.randint(1, 12))
+    ]
+    automaton = Automaton(keywords)
+    pattern = compile_regexp(automaton.pattern())
+    for _ in range(50):
+        text = "".join(random.choices("abcd", k=random.randint(0, 30)))
+        found = naive_find(keywords, text)
+        assert automaton.find(text) == found
+        assert (pattern.search(text) is not None) is bool(found)
+
+
+##############################################################################
+def test_needles_are_split_and_deduplicated() -> None:
+    """The needles should be split on commas and newlines, ignoring repeats."""
+    needles = MultiNeedle("dbseek, DBSKIP\n dbseek,,\nindex", True)
+    assert [needle.text for needle in needles.needles] == ["dbseek", "DBSKIP", "index"]
+    assert len(MultiNeedle("dbseek,DBSEEK", False).needles) == 2
+
+
+##############################################################################
+@mark.parametrize("text", ("", " , \n ,"))
+def test_no_needles(text: str) -> None:
+    """Needles that are all empty shouldn't be allowed."""
+    with raises(InvalidNeedle):
+        MultiNeedle(text, True)
+
+
+##############################################################################
+def test_regex_needles_are_not_allowed() -> None:
+    """A list of needles can't be regular expressions."""
+    with raises(InvalidNeedle):
+        MultiNeedle("a,b", True, regex=True)
+
+
+##############################################################################
+def test_hits_in() -> None:
+    """Each line should be a hit once for each needle it contains."""
+    needles = MultiNeedle("seek,skip,dbseek", True)
+    assert needles.hits_in(["DBSEEK()", "nothing", "skip seek"]) == [
+        (0, "seek"),
+        (0, "dbseek"),
+        (2, "seek"),
+        (2, "skip"),
+    ]
+    assert MultiNeedle("seek", False).hits_in(["SEEK"]) == []
+
+
+##############################################################################
+def test_might_be_in() -> None:
+    """Text should only be ruled out if it contains none of the needles."""
+    needles = MultiNeedle("dbseek,dbskip", True)
+    assert needles.might_be_in("use DBSKIP()")
+    assert not needles.might_be_in("use DBGOTO()")
+
+
+### test_multi_needle.py ends here
@@ -0,0 +1,88 @@
+"""Tests for searching guides with a pool of processes."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# NGDB imports.
+from ngdb import NGDBError
+
+##############################################################################
+# Pytest imports.
+from pytest import fixture, raises
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHits
+from aging.search import MultiNeedle, Needle, ParallelSearch, search_range
+
+##############################################################################
+WORDS = ("DBSEEK", "dbSeek", "DBSKIP", "the", "function", "returns", "alias")
+"""The words to make the lines of the guides from."""
+
+
+##############################################################################
+@fixture
+def guides(tmp_path: Path, guide_maker: Callable[..., Path]) -> list[Path]:
+    """Some guides full of random lines.
+
+    Returns:
+        The locations of the guides.
+    """
+    random = Random(3)
+    return [
+        guide_maker(
+            tmp_path / f"guide{guide}.ng",
+            f"Guide {guide}",
+            [
+                [
+                    " ".join(random.choices(WORDS, k=random.randint(0, 6)))
+                    for _ in range(random.randint(1, 10))
+                ]
+                for _ in range(30)
+            ],
+        )
+        for guide in range(5)
+    ]
+
+
+##############################################################################
+def test_same_as_a_serial_scan(guides: list[Path]) -> None:
+    """Searching in parallel should find what searching one at a time finds."""
+    for needle in (Needle("dbseek", True), MultiNeedle("dbskip, alias", False)):
+        with ParallelSearch(needle, 2) as search:
+            for guide in guides:
+                search.submit(guide)
+            for guide in guides:
+                found = SearchHits()
+                for result in search.results(guide):
+                    found.extend(result.hits)
+                assert list(found) == list(search_range(guide, needle).hits)
+
+
+##############################################################################
+def test_unreadable_guide(guides: list[Path], tmp_path: Path) -> None:
+    """A guide that can't be read should only fail when its results are wanted."""
+    (broken := tmp_path / "broken.ng").write_bytes(b"NG")
+    with ParallelSearch(Needle("dbseek", True), 2) as search:
+        for guide in (broken, guides[0]):
+            search.submit(guide)
+        with raises((OSError, NGDBError)):
+            list(search.results(broken))
+        assert list(search.results(guides[0]))
+
+
+##############################################################################
+def test_cancelled(guides: list[Path]) -> None:
+    """Cancelling a search should stop the results coming."""
+    with ParallelSearch(Needle("dbseek", True), 2) as search:
+        for guide in guides:
+            search.submit(guide)
+        assert not list(search.results(guides[0], lambda: True))
+        assert not list(search.results(guides[1]))
+
+
+### test_parallel.py ends here
@@ -0,0 +1,145 @@
+"""Tests for boolean queries."""
+
+##############################################################################
+# Pytest imports.
+from pytest import mark, raises
+
+##############################################################################
+# Local imports.
+from aging.search import InvalidNeedle, Needle, Query
+from aging.search.query import And, Node, Not, Or, Term, Truth
+
+##############################################################################
+FIRST = Needle("first", True)
+"""A needle to use when testing the nodes of a query."""
+SECOND = Needle("second", True)
+"""Another needle to use when testing the nodes of a query."""
+
+
+##############################################################################
+def test_node_is_abstract() -> None:
+    """The base node of a query shouldn't be usable on its own."""
+    with raises(TypeError):
+        Node()  # type: ignore[abstract]
+
+
+##############################################################################
+@mark.parametrize(
+    "first, second, conjunction, disjunction",
+    (
+        (True, True, True, True),
+        (True, False, False, True),
+        (False, False, False, False),
+        (True, None, None, True),
+        (False, None, False, None),
+        (None, None, None, None),
+    ),
+)
+def test_tri_state_evaluation(
+    first: Truth, second: Truth, conjunction: Truth, disjunction: Truth
+) -> None:
+    """Not knowing the truth of a term should only matter where it has to."""
+    truths = {FIRST: first, SECOND: second}
+    terms: list[Node] = [Term(FIRST), Term(SECOND)]
+    assert And(terms).evaluate(truths.__getitem__) is conjunction
+    assert Or(terms).evaluate(truths.__getitem__) is disjunction
+    assert Not(Term(FIRST)).evaluate(truths.__getitem__) is (
+        None if first is None else not first
+    )
+
+
+##############################################################################
+@mark.parametrize(
+    "text, terms, positive",
+    (
+        ("a", ["a"], ["a"]),
+        ("a b", ["a", "b"], ["a", "b"]),
+        ("a AND b", ["a", "b"], ["a", "b"]),
+        ("a OR b", ["a", "b"], ["a", "b"]),
+        ("a NOT b", ["a", "b"], ["a"]),
+        ("NOT a b", ["a", "b"], ["b"]),
+        ("a AND (b OR NOT c)", ["a", "b", "c"], ["a", "b"]),
+        ('"two words" x', ["two words", "x"], ["two words", "x"]),
+        ("a a OR a", ["a"], ["a"]),
+    ),
+)
+def test_parse(text: str, terms: list[str], positive: list[str]) -> None:
+    """A query should be parsed into its terms."""
+    query = Query(text, True)
+    assert [needle.text for needle in query.terms] == terms
+    assert [needle.text for needle in query.positive] == positive
+
+
+##############################################################################
+@mark.parametrize("text", ("", "NOT a", "(a", "a)", "a AND", "OR a", '"unterminated'))
+def test_invalid_query(text: str) -> None:
+    """A query that isn't valid should be reported as such."""
+    with raises(InvalidNeedle):
+        Query(text, True)
+
+
+##############################################################################
+@mark.parametrize(
+    "text, present, matches",
+    (
+        ("a b", "ab", True),
+        ("a b", "a", False),
+        ("a OR b", "b", True),
+        ("a OR b", "", False),
+        ("a NOT b", "a", True),
+        ("a NOT b", "ab", False),
+        ("a AND (b OR c)", "ac", True),
+        ("a AND (b OR c)", "bc", False),
+    ),
+)
+def test_matches(text: str, present: str, matches: bool) -> None:
+    """A query should match depending on which terms are present."""
+    query = Query(text, True)
+    assert (
+        query.matches([needle for needle in query.terms if needle.text in present])
+        is matches
+    )
+
+
+##############################################################################
+@mark.parametrize(
+    "text, haystack, might_be_in",
+    (
+        ("dbseek NOT skip", "DBSEEK here", True),
+        ("dbseek NOT skip", "dbseek then skip", False),
+        ("dbseek NOT skip", "nothing", False),
+        ("dbseek OR dbskip", "dbskip", True),
+    ),
+)
+def test_might_be_in(text: str, haystack: str, might_be_in: bool) -> None:
+    """A query should only rule out text that certainly can't match."""
+    assert Query(text, True).might_be_in(haystack) is might_be_in
+
+
+##############################################################################
+def test_regex_terms_are_not_known_from_the_text() -> None:
+    """A regular expression term can't be known to be present from its literal."""
+    query = Query("NOT db.eek dbseek", True, regex=True)
+    # "dbseek" also matches the negated term, but that can't be known until
+    # the lines are looked at, so the text mustn't be ruled out.
+    assert query.might_be_in("dbseek") is True
+    assert query.hits_in(["dbseek"]) == []
+
+
+##############################################################################
+def test_might_be_found() -> None:
+    """A query should only be ruled out when a required term can't be found."""
+    query = Query("dbseek NOT skip", True)
+    assert query.might_be_found(lambda text: "dbseek" in text) is True
+    assert query.might_be_found(lambda text: False) is False
+
+
+##############################################################################
+def test_hits_in() -> None:
+    """The hits of a query should be the lines with its positive terms."""
+    query = Query("(dbseek OR dbskip) NOT index", True)
+    assert query.hits_in(["x", "DBSEEK", "y", "dbskip"]) == [(1, None), (3, None)]
+    assert query.hits_in(["dbseek", "index"]) == []
+
+
+### test_query.py ends here
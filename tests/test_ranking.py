@@ -0,0 +1,165 @@
+"""Tests for ranking the hits of a search by relevance."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHits
+from aging.search import (
+    FuzzyNeedle,
+    Matcher,
+    MultiNeedle,
+    Needle,
+    rank,
+    scanned_statistics,
+    search_range,
+)
+
+
+##############################################################################
+def ranked(guide: Path, needle: Matcher) -> tuple[list[int], SearchHits, SearchHits]:
+    """Rank the hits of a search of a guide.
+
+    Args:
+        guide: The location of the guide to search.
+        needle: What to search for.
+
+    Returns:
+        The number of each entry in the guide in the order they were
+        ranked, along with the hits as found and as ranked.
+    """
+    found = search_range(guide, needle).hits
+    hits = rank(found, needle, scanned_statistics)
+    offsets = sorted({hit.entry_offset for hit in found})
+    order: list[int] = []
+    for hit in hits:
+        if (entry := offsets.index(hit.entry_offset)) not in order:
+            order.append(entry)
+    return order, found, hits
+
+
+##############################################################################
+def test_more_hits_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry with more hits should rank above one with fewer."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [
+                ["Intro", "DBSEEK()", "Other", "Other"],
+                ["Intro", "DBSEEK()", "DBSEEK()", "DBSEEK()"],
+            ],
+        ),
+        Needle("dbseek", True),
+    )
+    assert order == [1, 0]
+
+
+##############################################################################
+def test_shorter_entries_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry should rank above a longer one with the same hits."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [["Intro", "DBSEEK()"] + ["Other"] * 20, ["Intro", "DBSEEK()"]],
+        ),
+        Needle("dbseek", True),
+    )
+    assert order == [1, 0]
+
+
+##############################################################################
+def test_menu_prompts_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry that a menu prompt with a hit leads to should rank higher."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [["Intro", "DBSEEK()"], ["Intro", "DBSEEK()"]],
+            ["Other", "DBSEEK()"],
+        ),
+        Needle("dbseek", True),
+    )
+    assert order == [1, 0]
+
+
+##############################################################################
+def test_first_lines_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry with a hit in its first line should rank higher."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [["Intro", "DBSEEK()"], ["", "DBSEEK()", "Intro"]],
+        ),
+        Needle("dbseek", True),
+    )
+    assert order == [1, 0]
+
+
+##############################################################################
+def test_rare_terms_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry with a rare term should rank above those with a common one."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [["Intro", "DBSEEK()"]] * 6 + [["Intro", "DBSKIP()"], ["Intro"] * 2],
+        ),
+        MultiNeedle("dbseek, dbskip", True),
+    )
+    assert order[0] == 6
+
+
+##############################################################################
+def test_every_hit_is_kept(tmp_path: Path, guide_maker: Callable[..., Path]) -> None:
+    """Ranking should keep every hit, and keep the order of hits in an entry."""
+    _, found, hits = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [
+                [f"{'DBSEEK() ' * entry}line {line}" for line in range(entry)]
+                for entry in range(8)
+            ],
+        ),
+        Needle("dbseek", True),
+    )
+    assert sorted(hits, key=str) == sorted(found, key=str)
+    for entry in {hit.entry_offset for hit in found}:
+        assert [hit for hit in hits if hit.entry_offset == entry] == [
+            hit for hit in found if hit.entry_offset == entry
+        ]
+
+
+##############################################################################
+def test_closer_fuzzy_hits_rank_higher(
+    tmp_path: Path, guide_maker: Callable[..., Path]
+) -> None:
+    """An entry with a closer fuzzy hit should rank above a further one."""
+    order, *_ = ranked(
+        guide_maker(
+            tmp_path / "guide.ng",
+            "Guide",
+            [["Intro", "DBSEEX()"], ["Intro", "DBSEEK()"]],
+        ),
+        FuzzyNeedle("dbseek", True),
+    )
+    assert order == [1, 0]
+
+
+### test_ranking.py ends here
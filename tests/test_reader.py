@@ -0,0 +1,195 @@
+"""Tests for reading guides ahead of them being searched."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from itertools import pairwise
+from pathlib import Path
+from threading import Event
+from time import monotonic, sleep
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide
+
+##############################################################################
+# Pytest imports.
+from pytest import MonkeyPatch, fixture, raises
+
+##############################################################################
+# Local imports.
+from aging.search import GuideReader, reader
+from aging.search.scanner import DECRYPT
+
+
+##############################################################################
+@fixture
+def guides(tmp_path: Path, guide_maker: Callable[..., Path]) -> list[Path]:
+    """Some guides of differing sizes.
+
+    Returns:
+        The locations of the guides.
+    """
+    return [
+        guide_maker(
+            tmp_path / f"guide{guide}.ng",
+            f"Guide {guide}",
+            [[f"Line {line}" for line in range(guide + 1)]] * (guide * 3 + 1),
+        )
+        for guide in range(6)
+    ]
+
+
+##############################################################################
+def entries_of(guide: Path) -> tuple[int, bytes]:
+    """Get the decrypted entries of a guide.
+
+    Args:
+        guide: The location of the guide.
+
+    Returns:
+        The offset of the first entry, and the decrypted data of all of the
+        entries.
+    """
+    with NortonGuide(guide) as source:
+        first_entry = source.first_entry
+    return first_entry, guide.read_bytes()[first_entry:].translate(DECRYPT)
+
+
+##############################################################################
+def read(reading: GuideReader, guide: Path) -> tuple[int, bytes]:
+    """Read all of the chunks of a guide.
+
+    Args:
+        reading: The reader of the guides.
+        guide: The location of the guide to read.
+
+    Returns:
+        The offset of the first chunk, and the data of all of the chunks.
+    """
+    chunks = list(reading.chunks(guide))
+    for (offset, data), (following, _) in pairwise(chunks):
+        assert following == offset + len(data)
+    return chunks[0][0], b"".join(data for _, data in chunks)
+
+
+##############################################################################
+def test_only_reads_close_to_the_search(
+    tmp_path: Path, guide_maker: Callable[..., Path], monkeypatch: MonkeyPatch
+) -> None:
+    """Guides should only be read once the search gets close to them."""
+    guides = [
+        guide_maker(tmp_path / f"guide{guide}.ng", f"Guide {guide}", [["x"]])
+        for guide in range(6)
+    ]
+    opened: list[Path] = []
+
+    def recording(guide: Path) -> NortonGuide:
+        """Record that a guide was opened.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The opened guide.
+        """
+        opened.append(guide)
+        return NortonGuide(guide)
+
+    monkeypatch.setattr(reader, "NortonGuide", recording)
+    with GuideReader(guides, 1, readers=2) as reading:
+        sleep(0.3)
+        assert sorted(opened) == guides[:2]
+        list(reading.chunks(guides[2]))
+        sleep(0.3)
+        assert guides[4] in opened
+        assert guides[5] not in opened
+
+
+##############################################################################
+def test_chunks_come_in_order(guides: list[Path]) -> None:
+    """The chunks of every guide should cover all of its entries, in order."""
+    with GuideReader(guides, 2, readers=3, size=64) as reading:
+        for guide in guides:
+            assert read(reading, guide) == entries_of(guide)
+
+
+##############################################################################
+def test_passed_over_guides(guides: list[Path]) -> None:
+    """Guides that are passed over shouldn't get in the way of the next."""
+    with GuideReader(guides, 1, readers=2, size=64) as reading:
+        assert next(reading.chunks(guides[0]))[0] == entries_of(guides[0])[0]
+        for guide in guides[3::2]:
+            assert read(reading, guide) == entries_of(guide)
+
+
+##############################################################################
+def test_unreadable_guide(guides: list[Path], tmp_path: Path) -> None:
+    """A guide that can't be read should only fail when its chunks are wanted."""
+    missing = tmp_path / "missing.ng"
+    with GuideReader([missing, *guides[:2]], 1, readers=2) as reading:
+        assert missing in reading
+        with raises(OSError):
+            list(reading.chunks(missing))
+        for guide in guides[:2]:
+            assert read(reading, guide) == entries_of(guide)
+
+
+##############################################################################
+def test_contains(guides: list[Path], tmp_path: Path) -> None:
+    """Only the guides given should be being read."""
+    with GuideReader(guides[:2], 1) as reading:
+        assert all(guide in reading for guide in guides[:2])
+        assert guides[2] not in reading
+        assert tmp_path not in reading
+
+
+##############################################################################
+def test_cancelled(guides: list[Path]) -> None:
+    """Cancelling should stop the chunks of a guide coming."""
+    cancelled = False
+    with GuideReader(guides, 1, size=64) as reading:
+        assert not list(reading.chunks(guides[0], lambda: True))
+        chunks = reading.chunks(guides[1], lambda: cancelled)
+        assert next(chunks)
+        cancelled = True
+        assert not list(chunks)
+
+
+##############################################################################
+def test_cancelled_while_waiting(guides: list[Path], monkeypatch: MonkeyPatch) -> None:
+    """Cancelling should stop the wait for the chunks of a guide."""
+    release = Event()
+
+    def stuck(guide: Path) -> NortonGuide:
+        """Open a guide, once released.
+
+        Args:
+            guide: The location of the guide.
+
+        Returns:
+            The opened guide.
+        """
+        release.wait()
+        return NortonGuide(guide)
+
+    monkeypatch.setattr(reader, "NortonGuide", stuck)
+    with GuideReader(guides, 1) as reading:
+        start = monotonic()
+        assert not list(reading.chunks(guides[0], lambda: monotonic() - start > 0.2))
+        release.set()
+
+
+##############################################################################
+def test_stop_while_reading(guides: list[Path]) -> None:
+    """Stopping should end the reading, even if the readers are waiting."""
+    reading = GuideReader(guides, 1, readers=2, size=16)
+    assert next(reading.chunks(guides[0]))
+    sleep(0.1)
+    start = monotonic()
+    reading.stop()
+    assert monotonic() - start < 1
+    assert not any(thread.is_alive() for thread in reading._readers)
+
+
+### test_reader.py ends here
@@ -0,0 +1,70 @@
+"""Tests for finding the literal text a regular expression requires."""
+
+##############################################################################
+# Python imports.
+from re import search
+
+##############################################################################
+# Pytest imports.
+from pytest import mark
+
+##############################################################################
+# Local imports.
+from aging.search.needle import required_literal
+
+
+##############################################################################
+@mark.parametrize(
+    "pattern, literal",
+    (
+        ("hello", "hello"),
+        ("^start", "start"),
+        ("end$", "end"),
+        (r"\.prg", ".prg"),
+        ("colou?r", "colo"),
+        ("fo*bar", "bar"),
+        ("ab.cd", "ab"),
+        ("DB[A-Z]+SEEK", "SEEK"),
+        ("DB[]a]SEEK", "SEEK"),
+        (r"DB[\]]SEEK", "SEEK"),
+        ("foo(bar)baz", "foo"),
+        (r"\d+seek", "seek"),
+        (r"\x41BC", "BC"),
+        (r"\N{LATIN SMALL LETTER A}xyz", "xyz"),
+        (r"(a)\1abc", "abc"),
+        ("ab{2,3}cd", "cd"),
+        ("a{,3}bcd", "bcd"),
+    ),
+)
+def test_required_literal(pattern: str, literal: str) -> None:
+    """The literal text a pattern requires should be found."""
+    assert required_literal(pattern) == literal
+
+
+##############################################################################
+@mark.parametrize("pattern", ("a|b", "DBSEEK|DBSKIP", "(?i)dbseek", "", ".*"))
+def test_no_required_literal(pattern: str) -> None:
+    """A pattern that requires no literal text should give none."""
+    assert required_literal(pattern) == ""
+
+
+##############################################################################
+@mark.parametrize(
+    "pattern, text",
+    (
+        ("colou?r", "The color of it"),
+        ("fo*bar", "fbar"),
+        ("ab{2,3}cd", "abbbcd"),
+        ("DB[A-Z]+SEEK", "DBXSEEK()"),
+        (r"\d+seek", "2seek"),
+        ("foo(bar)?baz", "foobaz"),
+        (r"x\*?y", "xy"),
+    ),
+)
+def test_required_literal_is_in_match(pattern: str, text: str) -> None:
+    """The literal text a pattern requires should be in any match."""
+    assert (found := search(pattern, text)) is not None
+    assert required_literal(pattern) in found.group()
+
+
+### test_required_literal.py ends here
@@ -0,0 +1,125 @@
+"""Tests for the cache of the results of global searches."""
+
+##############################################################################
+# Python imports.
+from os import utime
+from pathlib import Path
+
+##############################################################################
+# Local imports.
+from aging.data import Fingerprint, SearchHit, SearchHits
+from aging.search import FuzzyNeedle, MultiNeedle, Needle, Query, ResultCache
+
+##############################################################################
+GUIDE = Fingerprint(Path("/guides/guide.ng"), 100, 200, "abc")
+"""The fingerprint of a guide to use in the tests."""
+CHANGED = Fingerprint(Path("/guides/guide.ng"), 100, 300, "abc")
+"""The fingerprint of that guide once it has changed."""
+HITS = SearchHits([SearchHit(GUIDE.location, 10, 2, "DBSEEK()", None)])
+"""Some hits to use in the tests."""
+
+
+##############################################################################
+def test_get_and_put() -> None:
+    """A result should be found again when nothing has changed."""
+    cache = ResultCache(5)
+    assert cache.get(Needle("dbseek", True), [GUIDE]) is None
+    cache.put(Needle("dbseek", True), [GUIDE], HITS)
+    assert cache.get(Needle("DBSEEK", True), [GUIDE]) == HITS
+    assert cache.get(Needle("DBSEEK", False), [GUIDE]) is None
+    assert cache.get(Needle("dbseek", True, regex=True), [GUIDE]) is None
+    assert cache.get(FuzzyNeedle("dbseek", True), [GUIDE]) is None
+
+
+##############################################################################
+def test_needles_shown_in_hits_keep_their_case() -> None:
+    """Searches whose hits show the needle shouldn't share results across case."""
+    cache = ResultCache(5)
+    needles = SearchHits([SearchHit(GUIDE.location, 10, 2, "DBSEEK()", "dbseek")])
+    cache.put(MultiNeedle("dbseek, dbskip", True), [GUIDE], needles)
+    assert cache.get(MultiNeedle("dbseek, dbskip", True), [GUIDE]) == needles
+    assert cache.get(MultiNeedle("DBSEEK, DBSKIP", True), [GUIDE]) is None
+    cache.put(FuzzyNeedle("dbseek", True), [GUIDE], needles)
+    assert cache.get(FuzzyNeedle("DBSEEK", True), [GUIDE]) is None
+
+
+##############################################################################
+def test_changed_guide() -> None:
+    """A result should be thrown away when a guide has changed."""
+    cache = ResultCache(5)
+    cache.put(Needle("dbseek", True), [GUIDE], HITS)
+    assert cache.get(Needle("dbseek", True), [CHANGED]) is None
+    assert cache.get(Needle("dbseek", True), [GUIDE]) is None
+
+
+##############################################################################
+def test_least_recently_used() -> None:
+    """The least recently used result should be dropped when the cache is full."""
+    cache = ResultCache(2)
+    for needle in ("a", "b"):
+        cache.put(Needle(needle, True), [GUIDE], HITS)
+    assert cache.get(Needle("a", True), [GUIDE]) is not None
+    cache.put(Needle("c", True), [GUIDE], HITS)
+    assert cache.get(Needle("b", True), [GUIDE]) is None
+    assert cache.get(Needle("a", True), [GUIDE]) is not None
+    assert cache.get(Needle("c", True), [GUIDE]) is not None
+
+
+##############################################################################
+def test_no_cache() -> None:
+    """A cache with no room should hold nothing."""
+    cache = ResultCache(0)
+    cache.put(Needle("dbseek", True), [GUIDE], HITS)
+    assert cache.get(Needle("dbseek", True), [GUIDE]) is None
+
+
+##############################################################################
+def test_persisted(tmp_path: Path) -> None:
+    """A persisted cache should be the same when loaded again."""
+    cache = ResultCache(5, tmp_path)
+    for needle in (
+        Needle("dbseek", True),
+        MultiNeedle("dbseek,dbskip", True),
+        Query("dbseek NOT dbskip", False),
+        FuzzyNeedle("dbseak", True),
+    ):
+        cache.put(needle, [GUIDE], HITS)
+        assert ResultCache(5, tmp_path).get(needle, [GUIDE]) == HITS
+    assert len(list(tmp_path.glob("*.bin"))) == 4
+
+
+##############################################################################
+def test_persisted_changed_guide(tmp_path: Path) -> None:
+    """A persisted result should be removed when a guide has changed."""
+    ResultCache(5, tmp_path).put(Needle("dbseek", True), [GUIDE], HITS)
+    assert ResultCache(5, tmp_path).get(Needle("dbseek", True), [CHANGED]) is None
+    assert not list(tmp_path.glob("*.bin"))
+
+
+##############################################################################
+def test_persisted_least_recently_used(tmp_path: Path) -> None:
+    """Loading a persisted cache should keep only the most recently used."""
+    cache = ResultCache(3, tmp_path)
+    for when, needle in enumerate(("a", "b", "c")):
+        cache.put(Needle(needle, True), [GUIDE], HITS)
+        # Make it clear which result was used when, rather than relying on
+        # the resolution of the file system's clock.
+        for result in tmp_path.glob("*.bin"):
+            if result.stat().st_mtime_ns > 10:
+                utime(result, ns=(when, when))
+    cache = ResultCache(2, tmp_path)
+    assert cache.get(Needle("a", True), [GUIDE]) is None
+    assert cache.get(Needle("b", True), [GUIDE]) is not None
+    assert cache.get(Needle("c", True), [GUIDE]) is not None
+    assert len(list(tmp_path.glob("*.bin"))) == 2
+
+
+##############################################################################
+def test_bad_file_is_removed(tmp_path: Path) -> None:
+    """A persisted result that can't be read should be removed."""
+    (tmp_path / "junk.bin").write_bytes(b"\x05\x00\x00\x00junk")
+    ResultCache(5, tmp_path)
+    assert not list(tmp_path.glob("*.bin"))
+
+
+### test_result_cache.py ends here
@@ -0,0 +1,147 @@
+"""Tests for the cache of what was found when looking for guides."""
+
+##############################################################################
+# Python imports.
+from os import utime
+from pathlib import Path
+
+##############################################################################
+# Pytest imports.
+from pytest import fixture
+
+##############################################################################
+# Local imports.
+from aging.data import ScanCache
+from aging.data.scan_cache import ScannedDirectory, ScannedFile, scan_cache_file
+
+
+##############################################################################
+@fixture
+def directory(tmp_path: Path) -> Path:
+    """A directory to look for guides in.
+
+    Returns:
+        The location of the directory.
+    """
+    (directory := tmp_path / "guides").mkdir()
+    return directory
+
+
+##############################################################################
+def touch(location: Path, modified: int) -> None:
+    """Set the modification time of a file or directory.
+
+    Args:
+        location: The location to set the time of.
+        modified: The modification time, in nanoseconds.
+    """
+    utime(location, ns=(modified, modified))
+
+
+##############################################################################
+def test_unchanged_directory(directory: Path) -> None:
+    """What was found in a directory should be kept while it's unchanged."""
+    touch(directory, 1_000)
+    cache = ScanCache()
+    cache.put(directory, scanned := ScannedDirectory(1_000, ("sub",), {}))
+    assert cache.get(directory, directory.stat()) == scanned
+
+
+##############################################################################
+def test_changed_directory(directory: Path) -> None:
+    """What was found in a directory should be ignored once it changes."""
+    touch(directory, 1_000)
+    cache = ScanCache()
+    cache.put(directory, scanned := ScannedDirectory(1_000))
+    touch(directory, 2_000)
+    assert cache.get(directory, directory.stat()) is None
+    assert cache.known(directory) == scanned
+
+
+##############################################################################
+def test_changed_file(directory: Path) -> None:
+    """A file that has changed should no longer match what was found."""
+    (guide := directory / "guide.ng").write_bytes(b"NG")
+    touch(guide, 1_000)
+    found = ScannedFile(2, 1_000, "Guide")
+    assert found.matches(guide.stat())
+    guide.write_bytes(b"NGNG")
+    touch(guide, 1_000)
+    assert not found.matches(guide.stat())
+    guide.write_bytes(b"NG")
+    touch(guide, 2_000)
+    assert not found.matches(guide.stat())
+
+
+##############################################################################
+def test_save_and_load(directory: Path) -> None:
+    """The cache should be the same after being saved and loaded again."""
+    touch(directory, 1_000)
+    cache = ScanCache()
+    cache.put(
+        directory,
+        ScannedDirectory(
+            1_000,
+            ("sub",),
+            {"guide.ng": ScannedFile(10, 20, "Guide"), "x.ng": ScannedFile(1, 2, None)},
+        ),
+    )
+    cache.save()
+    assert ScanCache().get(directory, directory.stat()) == cache.get(
+        directory, directory.stat()
+    )
+
+
+##############################################################################
+def test_only_saved_when_changed() -> None:
+    """The cache should only be written when something has changed."""
+    ScanCache().save()
+    assert not scan_cache_file().exists()
+
+
+##############################################################################
+def test_bad_cache_is_ignored() -> None:
+    """A cache that can't be read should be treated as empty."""
+    scan_cache_file().write_text("[1, 2, 3", encoding="utf-8")
+    assert ScanCache().directories_within(Path("/")) == []
+
+
+##############################################################################
+def test_prune(directory: Path) -> None:
+    """Directories that weren't found again should be forgotten."""
+    cache = ScanCache()
+    for within in ("a", "a/b", "c"):
+        cache.put(directory / within, ScannedDirectory(0))
+    cache.put(directory.parent, ScannedDirectory(0))
+    cache.prune(directory, {directory / "a"})
+    assert cache.directories_within(directory) == [directory / "a"]
+    assert cache.known(directory.parent) is not None
+
+
+##############################################################################
+def test_saves_are_merged(directory: Path) -> None:
+    """Saving one cache shouldn't lose what another cache has saved."""
+    first, second = ScanCache(), ScanCache()
+    first.put(directory / "a", ScannedDirectory(1))
+    first.save()
+    second.put(directory / "b", ScannedDirectory(2))
+    second.save()
+    assert ScanCache().directories_within(directory) == [
+        directory / "a",
+        directory / "b",
+    ]
+
+
+##############################################################################
+def test_forgotten_directories_are_saved(directory: Path) -> None:
+    """A directory forgotten by one cache should stay forgotten once saved."""
+    cache = ScanCache()
+    cache.put(directory / "a", ScannedDirectory(1))
+    cache.put(directory / "b", ScannedDirectory(2))
+    cache.save()
+    (pruned := ScanCache()).prune(directory, {directory / "b"})
+    pruned.save()
+    assert ScanCache().directories_within(directory) == [directory / "b"]
+
+
+### test_scan_cache.py ends here
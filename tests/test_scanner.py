@@ -0,0 +1,117 @@
+"""Tests for scanning the entries of a guide."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# NGDB imports.
+from ngdb import NortonGuide, PlainText
+
+##############################################################################
+# Pytest imports.
+from pytest import fixture, mark
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHits
+from aging.search import (
+    Matcher,
+    MultiNeedle,
+    Needle,
+    entries,
+    might_match,
+    raw_entries,
+    search_entry,
+    search_range,
+)
+from aging.search.scanner import plain_text
+
+##############################################################################
+WORDS = (
+    "DBSEEK",
+    "dbSeek",
+    "DB^BSEEK^B",
+    "^C44BSKIP",
+    "db\xff\x03skip",
+    "^^B",
+    "^Uthe^U",
+    "function",
+    "alias",
+)
+"""The words to make the lines of the guide from, control codes and all."""
+
+
+##############################################################################
+@fixture
+def guide(tmp_path: Path, guide_maker: Callable[..., Path]) -> Path:
+    """A guide full of random lines.
+
+    Returns:
+        The location of the guide.
+    """
+    random = Random(6)
+    return guide_maker(
+        tmp_path / "guide.ng",
+        "Guide",
+        [
+            [
+                " ".join(random.choices(WORDS, k=random.randint(0, 6)))
+                for _ in range(random.randint(1, 10))
+            ]
+            for _ in range(100)
+        ],
+    )
+
+
+##############################################################################
+def test_plain_text(guide: Path) -> None:
+    """The raw text of an entry should be the same as its plain text."""
+    with NortonGuide(guide) as source:
+        for raw, entry in zip(raw_entries(source), entries(source), strict=True):
+            assert raw.offset == entry.offset
+            assert raw.lines == len(entry.lines)
+            assert raw.text == "\n".join(str(PlainText(line)) for line in entry)
+
+
+##############################################################################
+def test_plain_text_of_control_codes() -> None:
+    """Control codes and run-length encoding should be removed from the text."""
+    assert plain_text(["^BDB^BSEEK", "^^A", "a\xff\x03b", "^C41^U"]) == (
+        "DBSEEK\n^A\na   b\nA"
+    )
+
+
+##############################################################################
+@mark.parametrize(
+    "needle",
+    (
+        Needle("dbseek", True),
+        Needle("DBSEEK", False),
+        Needle("dbskip", True),
+        Needle("^b", True),
+        Needle(r"db\s*s(eek|kip)", True, True),
+        Needle(r"^alias", False, True),
+        MultiNeedle("dbskip, the", True),
+        MultiNeedle("alias function", False),
+    ),
+)
+def test_prefilter_never_drops_a_hit(guide: Path, needle: Matcher) -> None:
+    """Only entries that can't hold a hit should be skipped.
+
+    Args:
+        needle: What to search for.
+    """
+    found = SearchHits()
+    with NortonGuide(guide) as source:
+        for raw, entry in zip(raw_entries(source), entries(source), strict=True):
+            hits = search_entry(guide, entry, needle)
+            assert might_match(raw, needle) or not hits
+            found.extend(hits)
+    assert found
+    assert list(search_range(guide, needle).hits) == list(found)
+
+
+### test_scanner.py ends here
@@ -0,0 +1,153 @@
+"""Tests for the compact holder of search hits."""
+
+##############################################################################
+# Python imports.
+from pathlib import Path
+from random import Random
+
+##############################################################################
+# Pytest imports.
+from pytest import mark, raises
+
+##############################################################################
+# Local imports.
+from aging.data import SearchHit, SearchHits
+
+
+##############################################################################
+def random_hits(random: Random, count: int) -> list[SearchHit]:
+    """Make some random search hits.
+
+    Args:
+        random: The source of randomness.
+        count: The number of hits to make.
+
+    Returns:
+        The hits.
+    """
+    return [
+        SearchHit(
+            Path(f"/guides/guide{random.randint(0, 3)}.ng"),
+            random.randint(0, 50),
+            random.randint(0, 5),
+            random.choice(("DBSEEK()", "Ünïcödé", "\udcff bad bytes", "", "^BDBSKIP")),
+            random.choice((None, "dbseek", "dbskip")),
+        )
+        for _ in range(count)
+    ]
+
+
+##############################################################################
+@mark.parametrize("count", (0, 1, 100))
+def test_bytes_round_trip(count: int) -> None:
+    """Hits packed into bytes should unpack to the same hits."""
+    hits = SearchHits(random_hits(Random(count), count))
+    assert list(SearchHits.from_bytes(hits.to_bytes())) == list(hits)
+
+
+##############################################################################
+@mark.parametrize("data", (b"", b"junk", b"\xff" * 64))
+def test_bad_bytes(data: bytes) -> None:
+    """Bytes that don't hold packed hits should be reported as such."""
+    with raises(ValueError):
+        SearchHits.from_bytes(data)
+
+
+##############################################################################
+def test_spill_round_trip(tmp_path: Path) -> None:
+    """Hits that are spilled out of memory should read back the same."""
+    expected = random_hits(Random(0), 1_000)
+    hits = SearchHits(expected)
+    hits.spill(tmp_path)
+    assert hits.spilled
+    assert len(hits) == len(expected)
+    assert list(hits) == expected
+    assert [hits[index] for index in (0, 500, -1)] == [
+        expected[index] for index in (0, 500, -1)
+    ]
+    assert list(SearchHits.from_bytes(hits.to_bytes())) == expected
+    assert hits.index(expected[500]) == expected.index(expected[500])
+
+
+##############################################################################
+def test_changing_spilled_hits(tmp_path: Path) -> None:
+    """Changing spilled hits should bring them back into memory."""
+    expected = random_hits(Random(1), 100)
+    hits = SearchHits(expected)
+    hits.spill(tmp_path)
+    hits.append(expected[0])
+    expected.append(expected[0])
+    assert not hits.spilled
+    assert list(hits) == expected
+
+
+##############################################################################
+@mark.parametrize("seed", range(20))
+def test_behaves_like_a_list(seed: int) -> None:
+    """Changing the hits should have the same effect as changing a list."""
+    random = Random(seed)
+    expected = random_hits(random, 30)
+    hits = SearchHits(expected)
+    replacement = random_hits(random, 10)
+    start, stop = sorted(random.randint(-35, 35) for _ in range(2))
+    expected[start:stop] = replacement
+    hits[start:stop] = SearchHits(replacement)
+    assert list(hits) == expected
+    every_third = random_hits(random, len(expected[::3]))
+    expected[::3] = every_third
+    hits[::3] = every_third
+    assert list(hits) == expected
+    del expected[2:8]
+    del hits[2:8]
+    assert list(hits) == expected
+    hits[:] = replacement
+    assert list(hits) == replacement
+
+
+##############################################################################
+@mark.parametrize("reverse", (False, True))
+def test_sort(reverse: bool) -> None:
+    """Hits should sort the same as a list of hits."""
+    expected = [
+        hit._replace(needle=hit.needle or "")
+        for hit in random_hits(Random(reverse), 200)
+    ]
+    hits = SearchHits(expected)
+    hits.sort(reverse=reverse)
+    assert list(hits) == sorted(expected, reverse=reverse)
+    hits.sort(key=lambda hit: hit.line_source, reverse=reverse)
+    assert list(hits) == sorted(
+        sorted(expected, reverse=reverse),
+        key=lambda hit: hit.line_source,
+        reverse=reverse,
+    )
+
+
+##############################################################################
+def test_reordered() -> None:
+    """Hits should be able to be put in any order."""
+    expected = random_hits(Random(2), 50)
+    order = list(range(50))
+    Random(3).shuffle(order)
+    assert list(SearchHits(expected).reordered(order)) == [
+        expected[position] for position in order
+    ]
+
+
+##############################################################################
+def test_index() -> None:
+    """The position of a hit should be the same as in a list of hits."""
+    expected = random_hits(Random(4), 500)
+    hits = SearchHits(expected)
+    for hit in expected[::7]:
+        assert hits.index(hit) == expected.index(hit)
+    missing = SearchHit(Path("/guides/missing.ng"), 0, 0, "", None)
+    with raises(ValueError):
+        hits.index(missing)
+    hits.append(missing)
+    hits.append(missing)
+    assert hits.index(missing) == len(expected)
+    assert hits.index(missing, len(expected) + 1) == len(expected) + 1
+
+
+### test_search_hits.py ends here
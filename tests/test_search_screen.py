@@ -0,0 +1,368 @@
+"""Tests for the workings of the global search screen."""
+
+##############################################################################
+# Python imports.
+from asyncio import run
+from collections.abc import Callable
+from pathlib import Path
+
+##############################################################################
+# Pytest imports.
+from pytest import MonkeyPatch, fixture, mark
+
+##############################################################################
+# Textual imports.
+from textual import on
+from textual.app import App, ComposeResult
+
+##############################################################################
+# Local imports.
+from aging.data import Fingerprints, Guide, Guides, SearchHit, SearchHits
+from aging.screens import search
+from aging.screens.search import (
+    REPORT_HITS,
+    REPORT_INTERVAL,
+    Search,
+    SearchedFor,
+    SearchProgress,
+    SearchReporter,
+    SearchResults,
+)
+from aging.search import Matcher, MultiNeedle, Needle, SearchIndex
+from aging.widgets import PROGRESS_INTERVAL, Counter
+
+
+##############################################################################
+def hits(count: int) -> SearchHits:
+    """Make some search hits.
+
+    Args:
+        count: The number of hits to make.
+
+    Returns:
+        The hits.
+    """
+    return SearchHits(SearchHit(Path("guide.ng"), 0, line, "") for line in range(count))
+
+
+##############################################################################
+class Clock:
+    """A clock that only moves when it's told to."""
+
+    def __init__(self) -> None:
+        """Initialise the clock."""
+        self.now = 0.0
+        """The time on the clock."""
+
+    def __call__(self) -> float:
+        """Get the time on the clock.
+
+        Returns:
+            The time.
+        """
+        return self.now
+
+
+##############################################################################
+@fixture
+def clock(monkeypatch: MonkeyPatch) -> Clock:
+    """A clock for the search to use in place of the real one.
+
+    Returns:
+        The clock.
+    """
+    monkeypatch.setattr(search, "monotonic", clock := Clock())
+    return clock
+
+
+##############################################################################
+def test_hits_are_batched(clock: Clock) -> None:
+    """Hits should be held back until there are enough to report."""
+    batches: list[int] = []
+    reporter = SearchReporter(
+        lambda hits: batches.append(len(hits)), progress := SearchProgress(1)
+    )
+    for _ in range(REPORT_HITS - 1):
+        reporter.searched(hits(1), 1, 1)
+    assert batches == []
+    assert (progress.entries, progress.lines, progress.hits) == (
+        REPORT_HITS - 1,
+        REPORT_HITS - 1,
+        0,
+    )
+    reporter.searched(hits(1))
+    assert batches == [REPORT_HITS]
+    assert progress.hits == REPORT_HITS
+
+
+##############################################################################
+def test_hits_are_reported_in_time(clock: Clock) -> None:
+    """Hits shouldn't be held back for longer than the report interval."""
+    batches: list[int] = []
+    reporter = SearchReporter(lambda hits: batches.append(len(hits)), SearchProgress(1))
+    reporter.searched(hits(2))
+    clock.now += REPORT_INTERVAL / 2
+    reporter.searched(hits(1))
+    assert batches == []
+    clock.now += REPORT_INTERVAL
+    reporter.searched(SearchHits(), 1, 1)
+    assert batches == [3]
+    reporter.searched(hits(1))
+    reporter.flush()
+    assert batches == [3, 1]
+
+
+##############################################################################
+def test_limit_stops_the_hits() -> None:
+    """No more hits than the limit should ever be reported."""
+    reported = SearchHits()
+    reporter = SearchReporter(reported.extend, SearchProgress(1), limit=5)
+    reporter.searched(hits(3))
+    assert not reporter.full
+    reporter.searched(hits(3))
+    assert reporter.full
+    reporter.searched(hits(3))
+    reporter.flush()
+    assert len(reported) == 5
+
+
+##############################################################################
+def test_no_limit() -> None:
+    """Without a limit every hit should be reported."""
+    reported = SearchHits()
+    reporter = SearchReporter(reported.extend, SearchProgress(1))
+    reporter.searched(hits(1_000))
+    reporter.flush()
+    assert not reporter.full
+    assert len(reported) == 1_000
+
+
+##############################################################################
+def test_likely_first(tmp_path: Path, guide_maker: Callable[..., Path]) -> None:
+    """The guides most likely to hold hits should be searched first."""
+    plain = Guide("Plain", guide_maker(tmp_path / "plain.ng", "Plain", [["x"]]))
+    credited = Guide(
+        "Credited",
+        guide_maker(
+            tmp_path / "credited.ng", "Credited", [["x"]], credits=["All about DBSEEK"]
+        ),
+    )
+    titled = Guide("DBSEEK", guide_maker(tmp_path / "titled.ng", "Titled", [["x"]]))
+    indexed_title = Guide(
+        "Something", guide_maker(tmp_path / "indexed.ng", "DBSEEK and more", [["x"]])
+    )
+    excluded = Guide("DBSEEK too", tmp_path / "excluded.ng")
+    guides: Guides = [plain, excluded, credited, indexed_title, titled]
+    with SearchIndex() as index:
+        fingerprints = Fingerprints()
+        for fingerprint in index.out_of_date([credited, indexed_title], fingerprints):
+            index.add(fingerprint)
+    assert Search._likely_first(
+        guides, Needle("dbseek", True), {excluded.location}
+    ) == [titled, indexed_title, credited, plain, excluded]
+
+
+##############################################################################
+def test_likely_first_without_an_index() -> None:
+    """Without an index only the titles of the guides should be used."""
+    first, second = Guide("Alpha", Path("alpha.ng")), Guide("DBSEEK", Path("b.ng"))
+    assert Search._likely_first([first, second], Needle("dbseek", True), set()) == [
+        second,
+        first,
+    ]
+
+
+##############################################################################
+class ResultsApp(App[None]):
+    """An application for testing the display of search results."""
+
+    def __init__(self, results: SearchHits) -> None:
+        """Initialise the application.
+
+        Args:
+            results: The results to show.
+        """
+        super().__init__()
+        self.results = results
+        """The results to show."""
+        self.jumped_to: list[tuple[SearchHit, int]] = []
+        """The results that were jumped to, and where they were."""
+
+    def compose(self) -> ComposeResult:
+        """Compose the application."""
+        yield SearchResults(self.results)
+
+    @on(SearchResults.JumpToResult)
+    def _jump_to(self, message: SearchResults.JumpToResult) -> None:
+        """Record a jump to a result.
+
+        Args:
+            message: The message requesting the jump.
+        """
+        self.jumped_to.append((message.hit, message.index))
+
+
+##############################################################################
+def test_only_visible_results_are_rendered() -> None:
+    """Only the results that are in view should ever be rendered."""
+
+    async def check() -> None:
+        """Check the display of the results."""
+        app = ResultsApp(results := hits(100_000))
+        async with app.run_test(size=(80, 24)) as pilot:
+            display = app.query_one(SearchResults)
+            await pilot.pause()
+            assert display.virtual_size.height == len(results)
+            assert 0 < len(display._rendered) <= display.size.height
+            display.action_last()
+            await pilot.pause()
+            assert display.highlighted == len(results) - 1
+            assert display.scroll_offset.y > 0
+            assert len(display._rendered) <= 2 * display.size.height
+            display.add_results(hits(10))
+            assert display.virtual_size.height == len(results)
+            display.action_select()
+            await pilot.pause()
+            assert app.jumped_to == [(results[-11], len(results) - 11)]
+
+    run(check())
+
+
+##############################################################################
+def test_result_at() -> None:
+    """Results should only be found where they are."""
+    display = SearchResults(results := hits(3))
+    assert display.result_at(2) == results[2]
+    assert display.result_at(3) is None
+    assert display.result_at(-1) is None
+
+
+##############################################################################
+GUIDES = (Path("one.ng"), Path("two.ng"))
+"""The guides that the searches are made over."""
+
+
+##############################################################################
+@mark.parametrize(
+    "first, then, narrowed",
+    (
+        (Needle("seek", True), Needle("dbseek", True), True),
+        (Needle("seek", True), Needle("DBSEEK", True), True),
+        (Needle("seek", False), Needle("dbseek", False), True),
+        (Needle("seek", False), Needle("DBSEEK", False), False),
+        (Needle("seek", True), Needle("seek", True), True),
+        (Needle("dbseek", True), Needle("seek", True), False),
+        (Needle("seek", True), Needle("dbseek", False), False),
+        (Needle("seek", True), Needle("db.*seek", True, True), False),
+        (Needle("s.*k", True, True), Needle("seek", True), False),
+        (Needle("seek", True), MultiNeedle("dbseek, alias", True), False),
+        (MultiNeedle("dbseek alias", True), Needle("dbseek", True), False),
+    ),
+)
+def test_narrowed_by(first: Matcher, then: Matcher, narrowed: bool) -> None:
+    """Only plain searches for more of the same text should be narrowings.
+
+    Args:
+        first: The first search.
+        then: The search that follows it.
+        narrowed: Should the search that follows narrow the first?
+    """
+    assert SearchedFor(first, GUIDES).narrowed_by(SearchedFor(then, GUIDES)) is (
+        narrowed
+    )
+
+
+##############################################################################
+def test_narrowed_by_other_guides() -> None:
+    """A search of other guides should never be a narrowing."""
+    assert not SearchedFor(Needle("seek", True), GUIDES).narrowed_by(
+        SearchedFor(Needle("dbseek", True), GUIDES[:1])
+    )
+
+
+##############################################################################
+def test_narrowing_keeps_every_hit() -> None:
+    """Every hit of a narrowing should have been a hit of the first search."""
+    lines = ["DBSEEK()", "dbSeek()", "dbseek", "DBSKIP()", "seek", "SEEK", ""]
+    needles = [
+        Needle(text, ignore_case)
+        for text in ("seek", "dbseek", "dbs", "SEEK", "DbSeek(", "k")
+        for ignore_case in (True, False)
+    ]
+    narrowings = 0
+    for first in needles:
+        for then in needles:
+            if SearchedFor(first, GUIDES).narrowed_by(SearchedFor(then, GUIDES)):
+                narrowings += 1
+                assert {line for line, _ in then.hits_in(lines)} <= {
+                    line for line, _ in first.hits_in(lines)
+                }
+    assert narrowings > len(needles)
+
+
+##############################################################################
+def test_progress_of_a_guide(tmp_path: Path, guide_maker: Callable[..., Path]) -> None:
+    """The progress should follow the guides as they're searched."""
+    progress = SearchProgress(2)
+    guide = guide_maker(tmp_path / "guide.ng", "Guide", [["x"]])
+    progress.new_guide(Guide("Guide", guide))
+    assert (progress.guides, progress.guide_size) == (1, guide.stat().st_size)
+    assert (progress.position, progress.finished) == (0, False)
+    progress.finished_guide()
+    assert (progress.position, progress.finished) == (guide.stat().st_size, True)
+    progress.new_guide(Guide("Missing", tmp_path / "missing.ng"))
+    assert (progress.guides, progress.guide_size) == (2, None)
+    assert (progress.position, progress.finished) == (0, False)
+    progress.finished_guide()
+    assert (progress.position, progress.finished) == (0, True)
+
+
+##############################################################################
+def test_reporter_records_progress(clock: Clock) -> None:
+    """The reporter should record the progress as it goes."""
+    progress = SearchProgress(1)
+    reporter = SearchReporter(lambda _: None, progress)
+    reporter.searched(hits(3), 10, 100)
+    reporter.searched(hits(2), 5, 50)
+    assert (progress.entries, progress.lines, progress.hits) == (15, 150, 0)
+    reporter.flush()
+    assert progress.hits == 5
+
+
+##############################################################################
+class SearchApp(App[None]):
+    """An application for testing the search screen."""
+
+    def on_mount(self) -> None:
+        """Show the search screen."""
+        self.push_screen(Search([], None))
+
+
+##############################################################################
+def test_progress_is_sampled() -> None:
+    """The progress should only be shown while a search is running."""
+
+    async def check() -> None:
+        """Check the showing of the progress."""
+        app = SearchApp()
+        async with app.run_test() as pilot:
+            assert isinstance(screen := app.screen, Search)
+            screen._progress = progress = SearchProgress(3)
+            progress.entries = 10
+            await pilot.pause(PROGRESS_INTERVAL * 3)
+            assert screen.query_one("#entries", Counter).count == 0
+            screen._search_running = True
+            progress.entries = 20
+            await pilot.pause(PROGRESS_INTERVAL * 3)
+            assert screen.query_one("#entries", Counter).count == 20
+            progress.entries = 30
+            screen._search_running = False
+            assert screen.query_one("#entries", Counter).count == 30
+            progress.entries = 40
+            await pilot.pause(PROGRESS_INTERVAL * 3)
+            assert screen.query_one("#entries", Counter).count == 30
+
+    run(check())
+
+
+### test_search_screen.py ends here
@@ -0,0 +1,187 @@
+"""Tests for keeping watch on directories for guides coming and going."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic, sleep
+
+##############################################################################
+# Pytest imports.
+from pytest import MonkeyPatch, fixture, skip
+
+##############################################################################
+# Local imports.
+from aging.data import Guides, watch_guides
+from aging.data import watcher as watcher_module
+
+##############################################################################
+INTERVAL = 0.1
+"""The time, in seconds, between checks of the watched directories."""
+
+
+##############################################################################
+class Watcher:
+    """Keeps watch on some directories for the length of a test."""
+
+    def __init__(self, directories: list[Path], interval: float) -> None:
+        """Initialise the watcher.
+
+        Args:
+            directories: The directories to watch.
+            interval: The time, in seconds, between checks of the directories.
+        """
+        self.reports: list[tuple[Path, set[Path]]] = []
+        """The directories reported as changed, and the guides within them."""
+        self._reported = Event()
+        """Flag to say that there has been a report."""
+        self._cancelled = Event()
+        """Flag to say that the watch should stop."""
+        self._thread = Thread(
+            target=watch_guides,
+            args=(directories, self._changed, self._cancelled.is_set, interval),
+            daemon=True,
+        )
+        """The thread that does the watching."""
+        self._thread.start()
+
+    def _changed(self, directory: Path, guides: Guides) -> None:
+        """Record a report of a directory changing.
+
+        Args:
+            directory: The directory that changed.
+            guides: The guides now within the directory.
+        """
+        self.reports.append((directory, {guide.location for guide in guides}))
+        self._reported.set()
+
+    def next_report(self, timeout: float = 5.0) -> tuple[Path, set[Path]] | None:
+        """Wait for the next report.
+
+        Args:
+            timeout: The longest time, in seconds, to wait.
+
+        Returns:
+            The next report, or [`None`][None] if there wasn't one in time.
+        """
+        reports = len(self.reports)
+        deadline = monotonic() + timeout
+        while len(self.reports) == reports and monotonic() < deadline:
+            self._reported.wait(deadline - monotonic())
+            self._reported.clear()
+        return self.reports[reports] if len(self.reports) > reports else None
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._cancelled.set()
+        self._thread.join()
+
+
+##############################################################################
+@fixture
+def polling(monkeypatch: MonkeyPatch) -> None:
+    """Make the watcher poll the directories, rather than use inotify."""
+    monkeypatch.setattr(watcher_module._Notifier, "create", lambda: None)
+
+
+##############################################################################
+@fixture
+def watching() -> Iterator[Callable[..., Watcher]]:
+    """Get the function that starts a watch.
+
+    Yields:
+        The function that starts a watch.
+    """
+    watchers: list[Watcher] = []
+
+    def watch(*directories: Path, interval: float = INTERVAL) -> Watcher:
+        """Start a watch.
+
+        Args:
+            directories: The directories to watch.
+            interval: The time, in seconds, between checks of the directories.
+
+        Returns:
+            The watcher.
+        """
+        watchers.append(watcher := Watcher(list(directories), interval))
+        return watcher
+
+    yield watch
+    for watcher in watchers:
+        watcher.stop()
+
+
+##############################################################################
+def test_changes_are_noticed_by_polling(
+    tmp_path: Path,
+    guide_maker: Callable[..., Path],
+    watching: Callable[..., Watcher],
+    polling: None,
+) -> None:
+    """Guides coming and going should be noticed by looking every so often."""
+    (library := tmp_path / "library").mkdir()
+    first = guide_maker(library / "first.ng", "First", [["x"]])
+    watcher = watching(library)
+    assert watcher.next_report() == (library, {first})
+    second = guide_maker(library / "second.ng", "Second", [["x"]])
+    assert watcher.next_report() == (library, {first, second})
+    first.unlink()
+    assert watcher.next_report() == (library, {second})
+
+
+##############################################################################
+def test_no_changes_no_reports(
+    tmp_path: Path,
+    guide_maker: Callable[..., Path],
+    watching: Callable[..., Watcher],
+    polling: None,
+) -> None:
+    """If nothing changes there should be nothing reported after the first look."""
+    (library := tmp_path / "library").mkdir()
+    guide_maker(library / "guide.ng", "Guide", [["x"]])
+    (library / "notes.txt").write_text("Not a guide")
+    watcher = watching(library)
+    assert watcher.next_report() is not None
+    (library / "more-notes.txt").write_text("Still not a guide")
+    assert watcher.next_report(INTERVAL * 5) is None
+
+
+##############################################################################
+def test_missing_directories_are_left_alone(
+    tmp_path: Path,
+    guide_maker: Callable[..., Path],
+    watching: Callable[..., Watcher],
+    polling: None,
+) -> None:
+    """A directory that can't be found shouldn't be reported until it's back."""
+    library = tmp_path / "library"
+    watcher = watching(library)
+    assert watcher.next_report(INTERVAL * 5) is None
+    library.mkdir()
+    guide = guide_maker(library / "guide.ng", "Guide", [["x"]])
+    assert watcher.next_report() == (library, {guide})
+
+
+##############################################################################
+def test_changes_are_noticed_before_the_next_check(
+    tmp_path: Path,
+    guide_maker: Callable[..., Path],
+    watching: Callable[..., Watcher],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Where inotify is available a change should be noticed straight away."""
+    if (notifier := watcher_module._Notifier.create()) is None:
+        skip("inotify isn't available")
+    notifier.close()
+    monkeypatch.setattr(watcher_module, "SETTLE_TIME", INTERVAL)
+    (library := tmp_path / "library").mkdir()
+    watcher = watching(library, interval=60)
+    assert watcher.next_report() == (library, set())
+    sleep(INTERVAL)
+    guide = guide_maker(library / "guide.ng", "Guide", [["x"]])
+    assert watcher.next_report() == (library, {guide})
+
+
+### test_watcher.py ends here